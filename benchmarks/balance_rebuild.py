@@ -0,0 +1,81 @@
+"""
+Measure keeping factoid balances as blocks arrive, and rebuilding them all from genesis with worker processes
+
+Writes `--blocks` factoid blocks of `--transactions` transactions each (moving factoids between `--addresses` random
+addresses) to a throwaway LevelDB, applying balances as each block head is stored, then times a rebuild for each
+worker count and checks it reaches the same balances. Mainnet has ~250k factoid blocks, mostly light; scale the
+per-block time to estimate a full rebuild there.
+
+Usage (from the repository root):
+
+    $ python -m benchmarks.balance_rebuild --blocks 2000 --transactions 20 --workers 1 --workers 4
+"""
+import click
+import os
+import random
+import tempfile
+import time
+
+import factom_core.block_elements as block_elements
+import factom_core.blocks as blocks
+from factom_core.db import FactomdLevelDB
+from fixtures import vectors
+
+MAINNET_FACTOID_BLOCKS = 250000
+
+
+def make_block(height: int, prev_keymr: bytes, template, addresses: list, transactions: int) -> blocks.FactoidBlock:
+    txs = {minute: [] for minute in range(1, 11)}
+    for _ in range(transactions):
+        source, destination = random.sample(addresses, 2)
+        value = random.randrange(1, 10 ** 8)
+        tx = block_elements.FactoidTransaction(
+            timestamp=random.randrange(2 ** 40),
+            inputs=[block_elements.TransactionIO(value + 1000, source)],
+            outputs=[block_elements.TransactionIO(value, destination)],
+            ec_purchases=[],
+            rcds=template.rcds[:1],
+        )
+        txs[random.randrange(1, 11)].append(tx)
+    body = blocks.FactoidBlockBody(transactions=txs)
+    header = body.construct_header(prev_keymr, bytes(32), ec_exchange_rate=1000, height=height)
+    return blocks.FactoidBlock(header, body)
+
+
+@click.command()
+@click.option("--blocks", "count", default=2000, help="Factoid blocks to replay")
+@click.option("--transactions", default=20, help="Transactions per block")
+@click.option("--addresses", "address_count", default=10000, help="Addresses the factoids move between")
+@click.option("--workers", "-w", multiple=True, type=int, help="Rebuild worker counts to measure (repeatable)")
+def main(count: int, transactions: int, address_count: int, workers: tuple):
+    template = block_elements.FactoidTransaction.unmarshal(
+        bytes.fromhex(vectors.FACTOID_TRANSACTION)
+    )
+    addresses = [os.urandom(32) for _ in range(address_count)]
+    with tempfile.TemporaryDirectory() as path:
+        db = FactomdLevelDB(path=path, create_if_missing=True)
+        applying = 0
+        prev_keymr = bytes(32)
+        for height in range(count):
+            block = make_block(height, prev_keymr, template, addresses, transactions)
+            prev_keymr = block.keymr
+            start = time.perf_counter()
+            db.put_factoid_block_head(block)
+            applying += time.perf_counter() - start
+        expected = {address: db.get_factoid_balance(address) for address in addresses}
+        print(f"{count} blocks x {transactions} transactions, stored incrementally: {applying:.2f}s")
+
+        for worker_count in workers or (1, os.cpu_count()):
+            start = time.perf_counter()
+            assert db.rebuild_factoid_balances(workers=worker_count) == count
+            elapsed = time.perf_counter() - start
+            assert all(db.get_factoid_balance(address) == balance for address, balance in expected.items())
+            print(
+                f"rebuild, {worker_count} workers: {elapsed:.2f}s "
+                f"(~{elapsed / count * MAINNET_FACTOID_BLOCKS / 60:.1f} min at mainnet's block count)"
+            )
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
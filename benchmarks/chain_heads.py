@@ -0,0 +1,58 @@
+"""
+Measure loading every chain head into memory at startup, the memory it takes, and reads from memory versus LevelDB
+
+Writes `--chains` random chain heads to a throwaway LevelDB, reopens it, and times the startup prefix scan.
+
+Usage (from the repository root):
+
+    $ python -m benchmarks.chain_heads --chains 100000 --chains 250000
+"""
+import click
+import os
+import random
+import tempfile
+import time
+
+from factom_core.db import FactomdLevelDB
+from factom_core.db.leveldb import CHAIN_HEAD
+
+
+@click.command()
+@click.option("--chains", "-c", multiple=True, type=int, help="Chain counts to measure (repeatable)")
+@click.option("--reads", default=100000, help="Random head reads to time")
+def main(chains: tuple, reads: int):
+    for count in chains or (100000, 250000):
+        with tempfile.TemporaryDirectory() as path:
+            db = FactomdLevelDB(path=path, create_if_missing=True)
+            chain_ids = [os.urandom(32) for _ in range(count)]
+            with db._db.prefixed_db(CHAIN_HEAD).write_batch() as batch:
+                for chain_id in chain_ids:
+                    batch.put(chain_id, os.urandom(32))
+            db.close()
+
+            db = FactomdLevelDB(path=path)
+            sample = random.choices(chain_ids, k=reads)
+            start = time.perf_counter()
+            for chain_id in sample:
+                db.get_chain_head(chain_id)
+            from_disk = time.perf_counter() - start
+
+            start = time.perf_counter()
+            table = db.load_chain_heads()
+            load = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for chain_id in sample:
+                db.get_chain_head(chain_id)
+            from_memory = time.perf_counter() - start
+            db.close()
+
+        print(
+            f"{count:>7,} chains: startup scan {load:.2f}s, {table.memory_usage() / 2 ** 20:.1f} MiB "
+            f"({table.memory_usage() / count:.0f} bytes/chain); reads {from_disk / reads * 1e6:.2f} usec from "
+            f"LevelDB, {from_memory / reads * 1e6:.2f} usec from memory"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Measure the directory block Bloom filters: their size, false positive rate, and the speedup scanning for one chain
+
+Writes `--blocks` directory blocks listing `--entry-blocks` random chains each (plus one tracked chain in every
+`--every`th block) to a throwaway LevelDB, then scans for the tracked chain with and without the filters, and probes
+every filter with chains that were never written to count false positives.
+
+Usage (from the repository root):
+
+    $ python -m benchmarks.dblock_bloom --blocks 2000 --entry-blocks 300 --every 50
+"""
+import click
+import os
+import tempfile
+import time
+
+import factom_core.blocks as blocks
+from factom_core.db import FactomdLevelDB
+from factom_core.db.leveldb import DIRECTORY_BLOCK_BLOOM
+
+
+@click.command()
+@click.option("--blocks", "count", default=2000, help="Directory blocks to write")
+@click.option("--entry-blocks", default=300, help="Entry blocks listed per directory block")
+@click.option("--every", default=50, help="The tracked chain gets an entry block every this many directory blocks")
+@click.option("--probes", default=100, help="Absent chain ids to test against every filter")
+def main(count: int, entry_blocks: int, every: int, probes: int):
+    chain_id = os.urandom(32)
+    with tempfile.TemporaryDirectory() as path:
+        db = FactomdLevelDB(path=path, create_if_missing=True)
+        for height in range(count):
+            chain_ids = [os.urandom(32) for _ in range(entry_blocks)] + ([chain_id] if height % every == 0 else [])
+            body = blocks.DirectoryBlockBody(
+                admin_block_lookup_hash=bytes(32),
+                entry_credit_block_header_hash=bytes(32),
+                factoid_block_keymr=bytes(32),
+                entry_blocks=[blocks.EntryBlockReference(c, os.urandom(32)) for c in chain_ids],
+            )
+            header = body.construct_header(b"\xfa\x92\xe5\xa4", bytes(32), bytes(32), timestamp=0, height=height)
+            db.put_directory_block(blocks.DirectoryBlock(header, body))
+
+        filter_size = sum(len(v) for _, v in db._db.iterator(prefix=DIRECTORY_BLOCK_BLOOM))
+        blooms = [db.get_directory_block_bloom(height) for height in range(count)]
+        absent = [os.urandom(32) for _ in range(probes)]
+        false_positives = sum(c in bloom for bloom in blooms for c in absent)
+
+        for _ in db.iter_directory_blocks():
+            pass  # warm the block cache, so both scans read from memory
+        start = time.perf_counter()
+        found = [b.header.height for b in db.iter_directory_blocks(chain_id=chain_id)]
+        filtered = time.perf_counter() - start
+
+        with db._db.write_batch() as batch:
+            for key in db._db.iterator(prefix=DIRECTORY_BLOCK_BLOOM, include_value=False):
+                batch.delete(key)
+        start = time.perf_counter()
+        assert [b.header.height for b in db.iter_directory_blocks(chain_id=chain_id)] == found
+        unfiltered = time.perf_counter() - start
+        db.close()
+
+    print(f"{count} directory blocks x {entry_blocks} entry blocks, tracked chain in {len(found)}")
+    print(f"filters: {filter_size / count:.0f} bytes/block, false positive rate {false_positives / (count * probes):.4f}")
+    print(f"scan for one chain: {unfiltered:.2f}s decoding every block, {filtered:.3f}s with the filters")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Measure what it costs to move messages across a process boundary, and decode pool throughput by worker count
+
+For each message type in the sample mix, compares:
+    - pickling + unpickling the decoded message (what forwarding decoded objects through a Queue costs)
+    - decoding the message again from its raw bytes
+    - pickling + unpickling a MessageHandle (what the decode pool forwards instead)
+
+Then pushes the whole mix through a DecodePool for each worker count given.
+
+Usage (from the repository root):
+
+    $ python -m benchmarks.decode_pool --messages 50000 --workers 1 --workers 2 --workers 4
+"""
+import click
+import multiprocessing
+import os
+import pickle
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "hydra"))
+
+import factom_core.messages  # noqa: E402
+from decode_pool import DecodePool, MessageHandle  # noqa: E402
+from benchmarks import samples  # noqa: E402
+
+
+def per_call_micros(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e6
+
+
+def compare_costs(number: int):
+    print(f"{'message':<28}{'bytes':>8}{'pickle obj':>14}{'decode raw':>14}{'pickle handle':>16}   (usec)")
+    for factory in samples.FACTORIES.values():
+        raw = factory()
+        msg = factom_core.messages.unmarshal_message(raw)
+        handle = MessageHandle(msg.TYPE, raw)
+        pickle_obj = per_call_micros(lambda: pickle.loads(pickle.dumps(msg)), number)
+        decode_raw = per_call_micros(lambda: factom_core.messages.unmarshal_message(raw), number)
+        pickle_handle = per_call_micros(lambda: pickle.loads(pickle.dumps(handle)), number)
+        print(f"{type(msg).__name__:<28}{len(raw):>8}{pickle_obj:>14.2f}{decode_raw:>14.2f}{pickle_handle:>16.2f}")
+
+
+def pool_throughput(payloads: list, workers: int, batch_size: int = 64) -> float:
+    inbox = multiprocessing.Queue()
+    pool = DecodePool(inbox, workers=workers)
+    pool.start()
+    start = time.perf_counter()
+    for i in range(0, len(payloads), batch_size):
+        pool.raw_inbox.put(payloads[i : i + batch_size])
+    received = 0
+    while received < len(payloads):
+        received += len(inbox.get())
+    elapsed = time.perf_counter() - start
+    pool.stop()
+    return received / elapsed
+
+
+@click.command()
+@click.option("--messages", "-n", default=20000, help="Number of messages to push through the pool")
+@click.option("--workers", "-w", multiple=True, type=int, help="Worker counts to measure (repeatable)")
+@click.option("--number", default=2000, help="Iterations per per-message measurement")
+def main(messages: int, workers: tuple, number: int):
+    compare_costs(number)
+    print()
+    payloads = samples.message_mix(messages)
+    for count in workers or (1, 2, 4):
+        print(f"{count} decode workers: {pool_throughput(payloads, count):,.0f} msgs/sec")
+
+
+if __name__ == "__main__":
+    main()
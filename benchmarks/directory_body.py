@@ -0,0 +1,71 @@
+"""
+Measure decoding, chain id lookups and marshalling of a large directory block, list body versus columnar body
+
+Builds a directory block listing `--entry-blocks` entry blocks, then times each body type decoding it, looking up
+`--lookups` chain ids (a linear scan over the list, the sorted index for the columnar table) and marshalling it back.
+
+Usage (from the repository root):
+
+    $ python -m benchmarks.directory_body --entry-blocks 50000 --lookups 1000
+"""
+import click
+import os
+import random
+import time
+
+import factom_core.blocks as blocks
+
+
+def timed(f) -> float:
+    start = time.perf_counter()
+    f()
+    return time.perf_counter() - start
+
+
+def scan(block: blocks.DirectoryBlock, chain_id: bytes):
+    for entry_block in block.body.entry_blocks:
+        if entry_block.chain_id == chain_id:
+            return entry_block.keymr
+    return None
+
+
+@click.command()
+@click.option("--entry-blocks", "-n", default=50000, help="Entry blocks listed in the directory block")
+@click.option("--lookups", default=1000, help="Chain ids to look up")
+def main(entry_blocks: int, lookups: int):
+    body = blocks.DirectoryBlockBody(
+        admin_block_lookup_hash=os.urandom(32),
+        entry_credit_block_header_hash=os.urandom(32),
+        factoid_block_keymr=os.urandom(32),
+        entry_blocks=[blocks.EntryBlockReference(os.urandom(32), os.urandom(32)) for _ in range(entry_blocks)],
+    )
+    header = body.construct_header(b"\xfa\x92\xe5\xa4", bytes(32), bytes(32), timestamp=0, height=0)
+    raw = blocks.DirectoryBlock(header, body).marshal()
+    wanted = [e.chain_id for e in random.sample(body.entry_blocks, min(lookups, entry_blocks))]
+
+    results = {}
+    for name, columnar in [("list", False), ("columnar", True)]:
+        block = None
+
+        def decode():
+            nonlocal block
+            block = blocks.DirectoryBlock.unmarshal(raw, columnar=columnar)
+
+        def lookup():
+            find = block.body.keymr_for if columnar else lambda chain_id: scan(block, chain_id)
+            for chain_id in wanted:
+                assert find(chain_id) is not None
+
+        def marshal():
+            assert block.body.marshal() == body.marshal()
+
+        results[name] = [timed(decode), timed(lookup), timed(marshal)]
+
+    print(f"{entry_blocks} entry blocks, {len(raw) / 2 ** 20:.1f} MiB, {len(wanted)} lookups")
+    print(f"{'body':<10} {'decode':>10} {'lookup':>10} {'marshal':>10}")
+    for name, times in results.items():
+        print(f"{name:<10} " + " ".join(f"{t * 1000:>8.1f}ms" for t in times))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Measure the P2P duplicate filter at a sustained message rate
+
+Feeds the filter a stream of ~250 byte messages, each one arriving `--copies` times as if re-gossiped by several
+peers, on a simulated clock running at `--rate` messages per second. The copies of a message are spread evenly over
+`--spread` seconds, so they have to be remembered across buckets (and through any eviction) to be dropped. Reports
+the real time spent per check (which must stay well under 1/rate for the filter to keep up), the fraction dropped
+against the fraction that could be, and the memory held.
+
+Usage (from the repository root):
+
+    $ python -m benchmarks.duplicate_filter --rate 50000 --seconds 120 --copies 4 --spread 30
+"""
+import click
+import time
+import tracemalloc
+
+from p2p import P2PConfiguration
+from p2p.duplicate_filter import DuplicateFilter
+
+PADDING = bytes(240)
+
+
+class SimulatedClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def bytes_per_entry(count: int, **kwargs) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    f = DuplicateFilter(**kwargs)
+    for i in range(count):
+        f.is_duplicate(i.to_bytes(8, "big") + PADDING)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used / len(f)
+
+
+@click.command()
+@click.option("--rate", default=50000, help="Simulated messages per second")
+@click.option("--seconds", default=120, help="Simulated seconds to run for")
+@click.option("--copies", default=4, help="Times each message arrives")
+@click.option("--spread", default=30.0, help="Seconds between the first and last copy of a message")
+@click.option("--duration", type=int, help="Seconds hashes are remembered (defaults to the p2p config)")
+@click.option("--cleanup", type=int, help="Bucket width in seconds (defaults to the p2p config)")
+@click.option("--max-entries", default=1_000_000)
+def main(rate: int, seconds: int, copies: int, spread: float, duration: int, cleanup: int, max_entries: int):
+    config = P2PConfiguration()
+    duration = config.duplicate_filter if duration is None else duration
+    cleanup = config.duplicate_filter_cleanup if cleanup is None else cleanup
+    clock = SimulatedClock()
+    f = DuplicateFilter(duration=duration, cleanup=cleanup, max_entries=max_entries, clock=clock)
+
+    # Every `copies` consecutive messages are one copy each of `copies` different messages: copy j of message m is
+    # sent in slot m + j * gap, so its last copy arrives `spread` seconds after the first
+    total = rate * seconds
+    gap = int(spread * rate / copies / max(copies - 1, 1))
+    repeats = 0
+    start = time.perf_counter()
+    for n in range(total):
+        clock.now = n / rate
+        m = n // copies - (n % copies) * gap
+        if m < 0:
+            continue  # a later copy of a message from before the run
+        repeats += n % copies != 0
+        f.is_duplicate(m.to_bytes(8, "big") + PADDING)
+    elapsed = time.perf_counter() - start
+
+    print(f"{f.checked:,} messages over {seconds}s simulated at {rate:,}/sec (window {duration}s, buckets {cleanup}s)")
+    print(f"real time: {elapsed:.2f}s, {elapsed / f.checked * 1e6:.2f} usec/check ({f.checked / elapsed:,.0f} checks/sec)")
+    print(f"dropped {f.duplicates:,} of {repeats:,} repeated copies ({f.duplicates / max(repeats, 1):.1%})")
+    per_entry = bytes_per_entry(min(len(f), 100000), max_entries=max_entries)
+    print(f"holding {len(f):,} hashes, ~{len(f) * per_entry / 2 ** 20:,.0f} MiB ({per_entry:.0f} bytes/hash)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Measure the memory held by decoded blocks, against their raw size, with tracemalloc
+
+First reports bytes per instance for each slotted type next to a plain dataclass with the same fields (and for each
+record next to the dict it replaced), then decodes a day of mainnet-sized blocks (144 by default) and holds them.
+
+Usage (from the repository root):
+
+    $ python -m benchmarks.memory --blocks 144 --entry-blocks 300 --transactions 100 --commits 1000
+"""
+import click
+import dataclasses
+import os
+import random
+import tracemalloc
+
+import factom_core.block_elements as block_elements
+import factom_core.blocks as blocks
+import factom_core.primitives as primitives
+from fixtures import vectors
+
+COUNT = 10000
+
+
+def traced(build) -> int:
+    """Bytes still allocated by the objects `build` returns"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del kept
+    return used
+
+
+def plain_clone(cls):
+    """A regular (dict backed) dataclass with the same fields as `cls`"""
+    return dataclasses.make_dataclass(cls.__name__, [(f.name, f.type) for f in dataclasses.fields(cls)])
+
+
+def compare_instances():
+    tx = block_elements.FactoidTransaction.unmarshal(bytes.fromhex(vectors.FACTOID_TRANSACTION))
+    h = os.urandom(32)
+    samples = [
+        tx,
+        block_elements.Entry(chain_id=h, external_ids=[], content=b""),
+        block_elements.EntryCommit(timestamp=0, entry_hash=h, ec_spent=1, ec_public_key=h, signature=h + h),
+        block_elements.ChainCommit(0, h, h, h, 11, h, h + h),
+        block_elements.BalanceIncrease(ec_public_key=h, tx_id=h, index=0, quantity=1),
+        primitives.FullSignature(h, h + h),
+        blocks.DirectoryBlockHeader(b"\x00" * 4, h, h, h, 0, 0, 0),
+        blocks.EntryBlockHeader(h, h, h, h, 0, 0, 0),
+    ]
+    print(f"{'type':<24} {'plain':>8} {'slotted':>8}  bytes/instance")
+    for sample in samples:
+        cls = type(sample)
+        values = [getattr(sample, f.name) for f in dataclasses.fields(cls)]
+        plain = plain_clone(cls)
+        before = traced(lambda: [plain(*values) for _ in range(COUNT)]) / COUNT
+        after = traced(lambda: [cls(*values) for _ in range(COUNT)]) / COUNT
+        print(f"{cls.__name__:<24} {before:>8.0f} {after:>8.0f}")
+
+    for record, dict_form in [
+        (block_elements.TransactionIO(1000, h), {"value": 1000, "fct_address": h}),
+        (blocks.EntryBlockReference(h, h), {"chain_id": h, "keymr": h}),
+    ]:
+        before = traced(lambda: [dict(dict_form) for _ in range(COUNT)]) / COUNT
+        after = traced(lambda: [type(record)(*record) for _ in range(COUNT)]) / COUNT
+        print(f"{type(record).__name__:<24} {before:>8.0f} {after:>8.0f}  (vs dict)")
+
+
+def make_day(count: int, entry_blocks: int, transactions: int, commits: int) -> list:
+    """Raw directory, factoid and entry credit blocks, shaped like a busy mainnet day"""
+    tx_data = bytes.fromhex(vectors.FACTOID_TRANSACTION)
+    raws = []
+    for height in range(count):
+        body = blocks.DirectoryBlockBody(
+            admin_block_lookup_hash=os.urandom(32),
+            entry_credit_block_header_hash=os.urandom(32),
+            factoid_block_keymr=os.urandom(32),
+            entry_blocks=[blocks.EntryBlockReference(os.urandom(32), os.urandom(32)) for _ in range(entry_blocks)],
+        )
+        header = body.construct_header(b"\xfa\x92\xe5\xa4", bytes(32), bytes(32), timestamp=0, height=height)
+        raws.append((blocks.DirectoryBlock, blocks.DirectoryBlock(header, body).marshal()))
+
+        txs = {minute: [] for minute in range(1, 11)}
+        for _ in range(transactions):
+            tx = block_elements.FactoidTransaction.unmarshal(tx_data)
+            tx.timestamp = random.randrange(2 ** 40)
+            txs[random.randrange(1, 11)].append(tx)
+        body = blocks.FactoidBlockBody(transactions=txs)
+        header = body.construct_header(bytes(32), bytes(32), ec_exchange_rate=1000, height=height)
+        raws.append((blocks.FactoidBlock, blocks.FactoidBlock(header, body).marshal()))
+
+        objects = {minute: [] for minute in range(1, 11)}
+        for _ in range(commits):
+            entry_hash = os.urandom(32)
+            commit = block_elements.EntryCommit(0, entry_hash, 1, os.urandom(32), os.urandom(64))
+            objects[random.randrange(1, 11)].append(commit)
+        body = blocks.EntryCreditBlockBody(objects=objects)
+        header = body.construct_header(bytes(32), bytes(32), height=height)
+        raws.append((blocks.EntryCreditBlock, blocks.EntryCreditBlock(header, body).marshal()))
+    return raws
+
+
+@click.command()
+@click.option("--blocks", "count", default=144, help="Directory blocks to hold (144 is a day)")
+@click.option("--entry-blocks", default=300, help="Entry blocks listed per directory block")
+@click.option("--transactions", default=100, help="Factoid transactions per block")
+@click.option("--commits", default=1000, help="Entry commits per block")
+def main(count: int, entry_blocks: int, transactions: int, commits: int):
+    compare_instances()
+
+    raws = make_day(count, entry_blocks, transactions, commits)
+    raw_size = sum(len(raw) for _, raw in raws)
+    used = traced(lambda: [cls.unmarshal(raw) for cls, raw in raws])
+    print(f"\n{count} blocks: {raw_size / 2 ** 20:.1f} MiB raw, {used / 2 ** 20:.1f} MiB decoded ({used / raw_size:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Measure the merkle hashing left for seal time, with the roots accumulated during the block versus built from scratch
+
+Fills a PendingBlock with `--entries` entries spread over `--chains` chains and 10 minutes (plus a factoid
+transaction per 100 entries), then times finishing the accumulated roots against computing every body's merkle root
+from nothing, which is what sealing did before.
+
+Usage (from the repository root):
+
+    $ python -m benchmarks.merkle_seal --entries 100000 --chains 1000
+"""
+import click
+import copy
+import os
+import random
+import time
+
+import factom_core.block_elements as block_elements
+import factom_core.blocks as blocks
+from factom_core.blockchains import PendingBlock
+from fixtures import vectors
+
+
+def make_commit(entry_hash: bytes) -> block_elements.EntryCommit:
+    return block_elements.EntryCommit(
+        timestamp=0, entry_hash=entry_hash, ec_spent=1, ec_public_key=bytes(32), signature=bytes(64)
+    )
+
+
+@click.command()
+@click.option("--entries", "-n", default=100000, help="Entries in the block")
+@click.option("--chains", default=1000, help="Chains the entries are spread over")
+def main(entries: int, chains: int):
+    rng = random.Random(0)
+    chain_ids = [os.urandom(32) for _ in range(chains)]
+    tx_data = bytes.fromhex(vectors.FACTOID_TRANSACTION)
+    block = PendingBlock(previous=object())
+
+    start = time.perf_counter()
+    for minute in range(10):
+        block.current_minute = minute
+        for i in range(entries // 10):
+            entry_hash = os.urandom(32)
+            block.add_commit(make_commit(entry_hash))
+            block.add_entry_hash(rng.choice(chain_ids), entry_hash)
+            if i % 100 == 0:
+                tx = block_elements.FactoidTransaction.unmarshal(tx_data)
+                tx.timestamp = rng.randrange(2 ** 40)
+                block.add_factoid_transaction(tx)
+    elapsed = time.perf_counter() - start
+    print(f"{entries:,} entries over {len(block.entry_blocks)} chains, {len(block.transaction_ids)} transactions")
+    print(f"adding during the block: {elapsed:.2f}s ({elapsed / entries * 1e6:.1f} usec/entry)")
+
+    # Copies without cached roots, for the from-scratch measurement
+    entry_bodies = [blocks.EntryBlockBody(copy.deepcopy(b.entry_hashes)) for b in block.entry_blocks.values()]
+    factoid_body = blocks.FactoidBlockBody(copy.deepcopy(block.factoid_block.transactions))
+
+    start = time.perf_counter()
+    for body in entry_bodies:
+        body.merkle_root
+    factoid_body.merkle_root
+    scratch = time.perf_counter() - start
+
+    start = time.perf_counter()
+    block.finish_merkle_roots()
+    incremental = time.perf_counter() - start
+
+    assert [b.merkle_root for b in block.entry_blocks.values()] == [b.merkle_root for b in entry_bodies]
+    assert block.factoid_block.merkle_root == factoid_body.merkle_root
+    print(f"seal, from scratch: {scratch * 1e3:>8.1f} ms")
+    print(f"seal, incremental:  {incremental * 1e3:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
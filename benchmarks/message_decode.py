@@ -0,0 +1,86 @@
+"""
+Measure message decoding through the type registry over a mainnet-like message mix
+
+Compares, per message:
+    - the old linear if/elif lookup on the type byte (emulated by a scan over the classes in the same order)
+    - the registry lookup alone
+    - unmarshal_message (registry lookup + unmarshal)
+    - unmarshal_messages over the whole batch
+
+Usage (from the repository root):
+
+    $ python -m benchmarks.message_decode --messages 50000
+    $ python -m benchmarks.message_decode --replay-file recorded.frames
+"""
+import click
+import time
+
+import factom_core.messages as messages
+from factom_core.messages import MESSAGE_TYPES, unmarshal_message, unmarshal_messages
+from benchmarks import samples
+
+# The order the old if/elif chain in unmarshal_message tested types in
+LEGACY_ORDER = [
+    messages.Ack,
+    messages.ChainCommit,
+    messages.EntryCommit,
+    messages.EntryReveal,
+    messages.FactoidTransaction,
+    messages.EndOfMinute,
+    messages.DirectoryBlockSignature,
+    messages.DirectoryBlockStateRequest,
+    messages.DirectoryBlockState,
+    messages.MissingDataRequest,
+    messages.MissingDataResponse,
+    messages.Heartbeat,
+    messages.AddServer,
+    messages.ChangeServerKey,
+    messages.RemoveServer,
+    messages.BlockRequest,
+    messages.MissingMessageRequest,
+    messages.MissingMessageResponse,
+]
+
+
+def legacy_lookup(raw: bytes):
+    msg_type = raw[0]
+    for cls in LEGACY_ORDER:
+        if msg_type == cls.TYPE:
+            return cls
+    raise ValueError("Bad message type")
+
+
+def registry_lookup(raw: bytes):
+    return MESSAGE_TYPES[raw[0]]
+
+
+def timed(func, payloads: list) -> float:
+    # Results are kept alive, as they would be in the node, so garbage collection costs show up fairly
+    start = time.perf_counter()
+    results = [func(raw) for raw in payloads]  # noqa: F841
+    return time.perf_counter() - start
+
+
+@click.command()
+@click.option("--messages", "-n", "count", default=50000, help="Number of messages to generate")
+@click.option("--replay-file", "-f", type=click.Path(exists=True), help="Decode length-prefixed frames from a file")
+def main(count: int, replay_file: str):
+    payloads = samples.read_frames(replay_file) if replay_file else samples.message_mix(count)
+    n = len(payloads)
+    print(f"Decoding {n} messages")
+
+    results = [
+        ("legacy type lookup", timed(legacy_lookup, payloads)),
+        ("registry type lookup", timed(registry_lookup, payloads)),
+        ("unmarshal_message", timed(unmarshal_message, payloads)),
+    ]
+    start = time.perf_counter()
+    unmarshal_messages(payloads)
+    results.append(("unmarshal_messages (batch)", time.perf_counter() - start))
+
+    for name, elapsed in results:
+        print(f"{name:<28}{elapsed / n * 1e9:>10,.0f} ns/msg{n / elapsed:>14,.0f} msgs/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Replay a stream of messages into the hydra P2P server and measure ingest throughput
+
+Starts a P2PServer in a child process, feeding a DecodePool, opens a set of long-lived connections to it, writes every
+message as a length-prefixed frame, and counts messages as they come out of the node inbox on the other side.
+
+Usage (from the repository root):
+
+    $ python -m benchmarks.p2p_ingest --messages 50000 --connections 4 --decode-workers 4
+    $ python -m benchmarks.p2p_ingest --replay-file recorded.frames
+"""
+import click
+import multiprocessing
+import os
+import queue
+import socket
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "hydra"))
+
+import p2p_server  # noqa: E402
+from decode_pool import DecodePool  # noqa: E402
+from benchmarks import samples  # noqa: E402
+
+
+def send_all(host: str, port: int, payloads: list):
+    with socket.create_connection((host, port)) as conn:
+        conn.sendall(b"".join(p2p_server.encode_frame(payload) for payload in payloads))
+
+
+@click.command()
+@click.option("--messages", "-n", default=20000, help="Number of messages to generate")
+@click.option("--connections", "-c", default=4, help="Number of concurrent sender connections")
+@click.option("--replay-file", "-f", type=click.Path(exists=True), help="Replay length-prefixed frames from a file")
+@click.option("--decode-workers", "-w", type=int, help="Number of decode processes (defaults to the cpu count)")
+@click.option("--port", default=18001)
+def main(messages: int, connections: int, replay_file: str, decode_workers: int, port: int):
+    host = "127.0.0.1"
+    payloads = samples.read_frames(replay_file) if replay_file else samples.message_mix(messages)
+    print(f"Replaying {len(payloads)} messages over {connections} connections")
+
+    inbox = multiprocessing.Queue(maxsize=10000)
+    decoders = DecodePool(inbox, workers=decode_workers)
+    decoders.start()
+    server = multiprocessing.Process(target=p2p_server.run, args=(decoders.raw_inbox, host, port), daemon=True)
+    server.start()
+    time.sleep(1)
+
+    start = time.perf_counter()
+    senders = [
+        threading.Thread(target=send_all, args=(host, port, payloads[i::connections])) for i in range(connections)
+    ]
+    for sender in senders:
+        sender.start()
+
+    # Messages that fail pre-validation never come out the other side, so stop once the stream goes quiet
+    received = 0
+    while received < len(payloads):
+        try:
+            received += len(inbox.get(timeout=5))
+        except queue.Empty:
+            break
+    elapsed = time.perf_counter() - start
+
+    for sender in senders:
+        sender.join()
+    server.terminate()
+    decoders.stop()
+    print(f"Decode workers: {decoders.workers}")
+    print(f"Ingested {received} messages in {elapsed:.2f}s ({received / elapsed:,.0f} msgs/sec)")
+
+
+if __name__ == "__main__":
+    main()
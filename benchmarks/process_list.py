@@ -0,0 +1,91 @@
+"""
+Replay acks and messages into a ProcessList and measure throughput on one core
+
+Builds a valid stream (serial hash chains and all) for each VM, then interleaves the VMs, lets each ack and message
+arrive in either order, and displaces a fraction of them by up to `--disorder` positions to exercise the
+out-of-order buffering.
+
+Usage (from the repository root):
+
+    $ python -m benchmarks.process_list --vms 5 --messages 20000 --disorder 50
+"""
+import click
+import hashlib
+import random
+import time
+
+import factom_core.primitives as primitives
+from factom_core.messages import Ack, unmarshal_message
+from factom_core.vm import ProcessList
+from benchmarks import samples
+
+HEIGHT = 1000
+
+
+def make_stream(vm_index: int, count: int) -> list:
+    """Build (ack, message) pairs for one VM, with messages decoded from the wire like the node sees them"""
+    pairs = []
+    serial_hash = None
+    for i in range(count):
+        msg = unmarshal_message(samples.make_entry_commit())
+        serial_hash = msg.hash if serial_hash is None else hashlib.sha256(serial_hash + msg.hash).digest()
+        ack = Ack(
+            vm_index=vm_index,
+            timestamp=bytes(6),
+            salt=bytes(8),
+            salt_number=0,
+            message_hash=msg.hash,
+            full_message_hash=msg.full_hash,
+            leader_chain_id=bytes(32),
+            height=HEIGHT,
+            process_list_height=i,
+            minute=i * 10 // count,
+            serial_hash=serial_hash,
+            data_area=b"",
+            signature=primitives.FullSignature(bytes(32), bytes(64)),
+        )
+        # Re-decode so the timed run computes message hashes from scratch, as it would for fresh messages
+        pairs.append((ack, unmarshal_message(msg.raw)))
+    return pairs
+
+
+def arrival_order(streams: list, disorder: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    events = []
+    for i in range(max(len(s) for s in streams)):
+        for stream in streams:
+            if i < len(stream):
+                ack, msg = stream[i]
+                events.extend([ack, msg] if rng.random() < 0.5 else [msg, ack])
+    # Displace a tenth of the events by up to `disorder` positions
+    for i in rng.sample(range(len(events)), len(events) // 10):
+        j = min(len(events) - 1, max(0, i + rng.randint(-disorder, disorder)))
+        events[i], events[j] = events[j], events[i]
+    return events
+
+
+@click.command()
+@click.option("--vms", default=5, help="Number of VMs")
+@click.option("--messages", "-n", default=20000, help="Messages per VM")
+@click.option("--disorder", default=50, help="Maximum displacement of out of order arrivals")
+def main(vms: int, messages: int, disorder: int):
+    streams = [make_stream(i, messages) for i in range(vms)]
+    events = arrival_order(streams, disorder)
+    print(f"Replaying {vms * messages} acks and messages across {vms} VMs")
+
+    process_list = ProcessList(height=HEIGHT, vm_count=vms)
+    start = time.perf_counter()
+    appended = 0
+    for event in events:
+        if type(event) is Ack:
+            appended += len(process_list.add_ack(event))
+        else:
+            appended += len(process_list.add_message(event))
+    elapsed = time.perf_counter() - start
+
+    assert appended == vms * messages, f"only {appended} of {vms * messages} appended"
+    print(f"{elapsed:.2f}s, {vms * messages / elapsed:,.0f} acks/sec")
+
+
+if __name__ == "__main__":
+    main()
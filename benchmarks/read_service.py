@@ -0,0 +1,145 @@
+"""
+Measure API style reads through the node's read server against opening the database for every request
+
+Stores `--entries` entries of `--size` bytes in a throwaway LevelDB, then has `--clients` processes each look up
+`--requests` random entries (`--open-requests` when opening the database for each, which is far slower):
+
+- open per request: what each hydra API request did, open the database, read, close. Only one process can have it
+  open at a time, so with more than one client (or a running node) requests fail on the lock, these are counted
+- read server: one process owns the database and serves reads over a Unix socket, clients keep a connection open
+- read server, pipelined: the same, but clients write `--pipeline` lookups before reading any of the responses
+
+Usage (from the repository root):
+
+    $ python -m benchmarks.read_service --entries 20000 --requests 2000 --open-requests 50 --clients 1 --clients 4
+"""
+import click
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+
+import plyvel
+
+from factom_core.block_elements import Entry
+from factom_core.db import FactomdLevelDB, ReadServer, connect
+from factom_core.db.leveldb import ENTRY
+
+
+def populate(path: str, entries: int, size: int, hashes: multiprocessing.Queue):
+    db = FactomdLevelDB(path=path, create_if_missing=True)
+    entry_hashes = []
+    for _ in range(entries):
+        entry = Entry(os.urandom(32), [], os.urandom(size))
+        db.put_entry(entry)
+        entry_hashes.append(entry.entry_hash)
+    db._db.compact_range()
+    db.close()
+    hashes.put(entry_hashes)
+
+
+def open_per_request(path: str, socket_path: str, entry_hashes: list, pipeline: int) -> int:
+    errors = 0
+    for entry_hash in entry_hashes:
+        try:
+            db = FactomdLevelDB(path=path)
+        except plyvel.IOError:
+            errors += 1
+            continue
+        assert db.get_entry(entry_hash) is not None
+        db.close()
+    return errors
+
+
+def read_server(path: str, socket_path: str, entry_hashes: list, pipeline: int) -> int:
+    db = connect(socket_path)
+    for entry_hash in entry_hashes:
+        assert db.get_entry(entry_hash) is not None
+    db.close()
+    return 0
+
+
+def read_server_pipelined(path: str, socket_path: str, entry_hashes: list, pipeline: int) -> int:
+    db = connect(socket_path)
+    for i in range(0, len(entry_hashes), pipeline):
+        window = entry_hashes[i : i + pipeline]
+        chain_ids = db._db.multi_get([ENTRY + entry_hash for entry_hash in window])
+        raw_entries = db._db.multi_get([chain_id + b";" + h for chain_id, h in zip(chain_ids, window)])
+        assert all(Entry.unmarshal(raw) is not None for raw in raw_entries)
+    db.close()
+    return 0
+
+
+def client(model, path: str, socket_path: str, entry_hashes: list, pipeline: int, results: multiprocessing.Queue):
+    results.put(model(path, socket_path, entry_hashes, pipeline))
+
+
+def owner(path: str, socket_path: str, ready, stop):
+    db = FactomdLevelDB(path=path)
+    db._db.compact_range()  # finish the compaction LevelDB starts on opening, rather than during a measurement
+    server = ReadServer(db, socket_path)
+    server.start()
+    ready.set()
+    stop.wait()
+    server.stop()
+    db.close()
+
+
+def measure(model, clients: int, path: str, socket_path: str, entry_hashes: list, requests: int, pipeline: int):
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(
+            target=client, args=(model, path, socket_path, random.sample(entry_hashes, requests), pipeline, results)
+        )
+        for _ in range(clients)
+    ]
+    start = time.perf_counter()
+    for p in processes:
+        p.start()
+    errors = sum(results.get() for _ in processes)
+    for p in processes:
+        p.join()
+    elapsed = time.perf_counter() - start
+    total = clients * requests
+    print(
+        f"  {model.__name__}, {clients} clients: {total / elapsed:,.0f} reads/s "
+        f"({elapsed / total * 1e6 * clients:,.0f} us each), {errors} failed on the lock"
+    )
+
+
+@click.command()
+@click.option("--entries", default=20000, help="Entries stored in the database")
+@click.option("--size", default=1000, help="Entry content size in bytes")
+@click.option("--requests", default=2000, help="Lookups per client")
+@click.option("--open-requests", default=50, help="Lookups per client when opening the database for each")
+@click.option("--clients", "-c", multiple=True, type=int, help="Client process counts to measure (repeatable)")
+@click.option("--pipeline", default=50, help="Lookups written before reading responses, when pipelining")
+def main(entries: int, size: int, requests: int, open_requests: int, clients: tuple, pipeline: int):
+    with tempfile.TemporaryDirectory() as path:
+        # Written from a child process: a process forked after LevelDB's compaction thread has started can deadlock
+        hashes = multiprocessing.Queue()
+        writer = multiprocessing.Process(target=populate, args=(path, entries, size, hashes))
+        writer.start()
+        entry_hashes = hashes.get()
+        writer.join()
+        socket_path = os.path.join(path, "db.sock")
+        print(f"{entries} entries of {size} bytes")
+
+        for client_count in clients or (1, 4):
+            measure(open_per_request, client_count, path, socket_path, entry_hashes, open_requests, pipeline)
+
+        ready, stop = multiprocessing.Event(), multiprocessing.Event()
+        server = multiprocessing.Process(target=owner, args=(path, socket_path, ready, stop))
+        server.start()
+        ready.wait()
+        read_server(path, socket_path, entry_hashes, pipeline)  # warm up: read every entry once, unmeasured
+        for client_count in clients or (1, 4):
+            measure(read_server, client_count, path, socket_path, entry_hashes, requests, pipeline)
+            measure(read_server_pipelined, client_count, path, socket_path, entry_hashes, requests, pipeline)
+        stop.set()
+        server.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Measure routing a batch of hashes to VMs: the per-message loop, the scalar byte sum, and the vectorized batch
+
+Usage (from the repository root):
+
+    $ python -m benchmarks.routing --hashes 10000 --vms 5
+"""
+import click
+import os
+import time
+
+from factom_core.utils import routing
+
+
+def loop_vm_for_hash(h: bytes, vm_count: int) -> int:
+    """The original Blockchain.vm_for_hash, for comparison"""
+    v = 0
+    for b in h:
+        v += b
+    return v % vm_count
+
+
+def timed(label: str, count: int, repeat: int, f):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        f()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<24} {elapsed * 1e3:>8.3f} ms/batch  {count / elapsed:>14,.0f} hashes/sec")
+
+
+@click.command()
+@click.option("--hashes", "-n", default=10000, help="Hashes per batch")
+@click.option("--vms", default=5, help="Number of VMs")
+@click.option("--repeat", default=50, help="Batches to time")
+def main(hashes: int, vms: int, repeat: int):
+    batch = [os.urandom(32) for _ in range(hashes)]
+    print(f"Routing {hashes} hashes to {vms} VMs (NumPy {'available' if routing.numpy else 'not installed'})")
+    timed("loop (original)", hashes, repeat, lambda: [loop_vm_for_hash(h, vms) for h in batch])
+    timed("vm_for_hash", hashes, repeat, lambda: [routing.vm_for_hash(h, vms) for h in batch])
+    timed("vm_for_hashes", hashes, repeat, lambda: routing.vm_for_hashes(batch, vms))
+    timed("vm_buckets", hashes, repeat, lambda: routing.vm_buckets(batch, vms))
+
+
+if __name__ == "__main__":
+    main()
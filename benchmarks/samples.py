@@ -0,0 +1,182 @@
+"""
+A synthetic message mix, shaped like what a mainnet follower sees over the wire
+
+Acks dominate, followed by commits and reveals for entries, with the occasional factoid transaction, minute seal and
+directory block state. Timestamps, salts and hashes are randomized so that every generated message is unique. Each
+factory draws them from the `rng` it's given, so a seeded generator reproduces the same messages.
+"""
+import random
+import struct
+
+import factom_core.block_elements as block_elements
+import factom_core.messages as messages
+import factom_core.primitives as primitives
+from factom_core.blocks import DirectoryBlockHeader
+
+from fixtures import vectors
+
+MAINNET_MIX = {
+    messages.Ack.TYPE: 45,
+    messages.EntryCommit.TYPE: 20,
+    messages.EntryReveal.TYPE: 20,
+    messages.ChainCommit.TYPE: 1,
+    messages.FactoidTransaction.TYPE: 3,
+    messages.EndOfMinute.TYPE: 4,
+    messages.DirectoryBlockSignature.TYPE: 2,
+    messages.MissingDataRequest.TYPE: 4,
+    messages.DirectoryBlockState.TYPE: 1,
+}
+
+
+_rng = random.Random()  # for callers that don't need reproducible messages
+
+
+def _bytes(rng: random.Random, n: int) -> bytes:
+    return rng.getrandbits(8 * n).to_bytes(n, "big")
+
+
+def _signature(rng: random.Random) -> primitives.FullSignature:
+    return primitives.FullSignature(_bytes(rng, 32), _bytes(rng, 64))
+
+
+def _timestamp(rng: random.Random) -> bytes:
+    return _bytes(rng, 6)
+
+
+def make_ack(rng: random.Random = _rng) -> bytes:
+    return messages.Ack(
+        vm_index=rng.randrange(5),
+        timestamp=_timestamp(rng),
+        salt=_bytes(rng, 8),
+        salt_number=rng.randrange(2 ** 32),
+        message_hash=_bytes(rng, 32),
+        full_message_hash=_bytes(rng, 32),
+        leader_chain_id=_bytes(rng, 32),
+        height=rng.randrange(2 ** 20),
+        process_list_height=rng.randrange(2 ** 16),
+        minute=rng.randrange(10),
+        serial_hash=_bytes(rng, 32),
+        data_area=b"",
+        signature=_signature(rng),
+    ).marshal()
+
+
+def make_entry_commit(entry_hash: bytes = None, rng: random.Random = _rng) -> bytes:
+    commit = block_elements.EntryCommit(
+        timestamp=rng.randrange(2 ** 40),
+        entry_hash=_bytes(rng, 32) if entry_hash is None else entry_hash,
+        ec_spent=1,
+        ec_public_key=_bytes(rng, 32),
+        signature=_bytes(rng, 64),
+    )
+    return messages.EntryCommit(commit=commit, signature=_signature(rng)).marshal()
+
+
+def make_chain_commit(rng: random.Random = _rng) -> bytes:
+    commit = block_elements.ChainCommit(
+        timestamp=rng.randrange(2 ** 40),
+        chain_id_hash=_bytes(rng, 32),
+        commit_weld=_bytes(rng, 32),
+        entry_hash=_bytes(rng, 32),
+        ec_spent=11,
+        ec_public_key=_bytes(rng, 32),
+        signature=_bytes(rng, 64),
+    )
+    return messages.ChainCommit(commit=commit, signature=_signature(rng)).marshal()
+
+
+def make_entry_reveal(rng: random.Random = _rng) -> bytes:
+    entry = block_elements.Entry.unmarshal(bytes.fromhex(vectors.ENTRY))
+    entry = block_elements.Entry(chain_id=_bytes(rng, 32), external_ids=entry.external_ids, content=entry.content)
+    return messages.EntryReveal(timestamp=_timestamp(rng), entry=entry).marshal()
+
+
+def make_factoid_transaction(rng: random.Random = _rng) -> bytes:
+    tx = block_elements.FactoidTransaction.unmarshal(bytes.fromhex(vectors.FACTOID_TRANSACTION))
+    tx.timestamp = rng.randrange(2 ** 40)
+    return messages.FactoidTransaction(tx=tx).marshal()
+
+
+def make_end_of_minute(rng: random.Random = _rng) -> bytes:
+    buf = bytearray()
+    buf.append(messages.EndOfMinute.TYPE)
+    buf.extend(_timestamp(rng))
+    buf.extend(_bytes(rng, 32))  # chain id
+    buf.append(rng.randrange(1, 11))  # minute
+    buf.append(rng.randrange(5))  # vm index
+    buf.append(rng.randrange(5))  # factoid vm
+    buf.extend(struct.pack(">I", rng.randrange(2 ** 20)))  # height
+    buf.extend(struct.pack(">I", rng.randrange(2 ** 20)))  # system height
+    buf.extend(_bytes(rng, 32))  # system hash
+    buf.append(1)
+    buf.extend(_signature(rng).marshal())
+    return bytes(buf)
+
+
+def make_directory_block_signature(rng: random.Random = _rng) -> bytes:
+    header_data = bytes.fromhex(vectors.DIRECTORY_BLOCK)[: DirectoryBlockHeader.LENGTH]
+    return messages.DirectoryBlockSignature(
+        timestamp=_timestamp(rng),
+        system_height=rng.randrange(2 ** 20),
+        system_hash=_bytes(rng, 32),
+        height=rng.randrange(2 ** 20),
+        vm_index=rng.randrange(5),
+        header=DirectoryBlockHeader.unmarshal(header_data),
+        chain_id=_bytes(rng, 32),
+        header_signature=_signature(rng),
+        signature=_signature(rng),
+    ).marshal()
+
+
+def make_missing_data_request(rng: random.Random = _rng) -> bytes:
+    return messages.MissingDataRequest(timestamp=_timestamp(rng), request_hash=_bytes(rng, 32)).marshal()
+
+
+def make_directory_block_state(rng: random.Random = _rng) -> bytes:
+    raw = bytes.fromhex(vectors.DIRECTORY_BLOCK_STATE)
+    return raw[:1] + _timestamp(rng) + raw[7:]
+
+
+FACTORIES = {
+    messages.Ack.TYPE: make_ack,
+    messages.EntryCommit.TYPE: make_entry_commit,
+    messages.EntryReveal.TYPE: make_entry_reveal,
+    messages.ChainCommit.TYPE: make_chain_commit,
+    messages.FactoidTransaction.TYPE: make_factoid_transaction,
+    messages.EndOfMinute.TYPE: make_end_of_minute,
+    messages.DirectoryBlockSignature.TYPE: make_directory_block_signature,
+    messages.MissingDataRequest.TYPE: make_missing_data_request,
+    messages.DirectoryBlockState.TYPE: make_directory_block_state,
+}
+
+
+def message_mix(count: int, mix: dict = None, seed: int = 0) -> list:
+    """
+    Generate `count` raw marshalled messages, with types drawn according to the relative weights in `mix`. The same
+    `seed` always generates the same messages.
+    """
+    mix = MAINNET_MIX if mix is None else mix
+    rng = random.Random(seed)
+    types = rng.choices(list(mix.keys()), weights=list(mix.values()), k=count)
+    return [FACTORIES[t](rng=rng) for t in types]
+
+
+def write_frames(path: str, payloads: list):
+    """Write `payloads` to a replay file, each prefixed by its 4 byte big-endian length"""
+    with open(path, "wb") as f:
+        for payload in payloads:
+            f.write(struct.pack(">I", len(payload)))
+            f.write(payload)
+
+
+def read_frames(path: str) -> list:
+    """Read back all of the length-prefixed payloads from a replay file"""
+    payloads = []
+    with open(path, "rb") as f:
+        while True:
+            header = f.read(4)
+            if len(header) < 4:
+                break
+            size = struct.unpack(">I", header)[0]
+            payloads.append(f.read(size))
+    return payloads
@@ -0,0 +1,97 @@
+"""
+Measure building a block's entry blocks at seal time, with the chain heads prefetched in one batched read versus
+fetched and decoded one chain at a time
+
+Creates a throwaway LevelDB holding a head entry block of `--prior-entries` entries for each chain, then seals a
+pending block with `--entries-per-chain` new entries on every chain.
+
+The entry block roots are accumulated as entries arrive (see PendingBlock), so all that's left per chain at seal time is
+its header and keymr. That isn't farmed out to worker processes: sending the work over costs more than doing it.
+
+Usage (from the repository root):
+
+    $ python -m benchmarks.seal_entry_blocks --chains 1000 --chains 10000 --chains 50000
+"""
+import click
+import os
+import tempfile
+import time
+from typing import List
+
+import factom_core.blocks as blocks
+from factom_core.blockchains import PendingBlock
+from factom_core.blockchains.local import LocalBlockchain
+from factom_core.db import FactomdLevelDB
+
+
+def make_commit(entry_hash: bytes):
+    from factom_core.block_elements import EntryCommit
+
+    return EntryCommit(timestamp=0, entry_hash=entry_hash, ec_spent=1, ec_public_key=bytes(32), signature=bytes(64))
+
+
+def populate(db: FactomdLevelDB, chain_ids: List[bytes], prior_entries: int):
+    for chain_id in chain_ids:
+        body = blocks.EntryBlockBody(entry_hashes={1: [os.urandom(32) for _ in range(prior_entries)]})
+        header = body.construct_header(chain_id, bytes(32), bytes(32), sequence=7, height=99)
+        db.put_entry_block_head(blocks.EntryBlock(header, body))
+
+
+def seal_one_at_a_time(db: FactomdLevelDB, block: PendingBlock) -> List[blocks.EntryBlock]:
+    """The entry block loop seal_block used before the chain heads were prefetched"""
+    entry_blocks = []
+    for chain_id, block_body in block.entry_blocks.items():
+        prev = db.get_entry_block_head(chain_id)
+        header = block_body.construct_header(
+            chain_id=chain_id,
+            prev_keymr=prev.keymr if prev is not None else bytes(32),
+            prev_full_hash=prev.full_hash if prev is not None else bytes(32),
+            sequence=prev.header.sequence + 1 if prev is not None else 0,
+            height=block.height,
+        )
+        entry_blocks.append(blocks.EntryBlock(header, block_body))
+    return entry_blocks
+
+
+@click.command()
+@click.option("--chains", "-c", multiple=True, type=int, help="Chains per block to measure (repeatable)")
+@click.option("--entries-per-chain", default=2, help="New entries on each chain in the sealed block")
+@click.option("--prior-entries", default=20, help="Entries in each chain's current head entry block")
+def main(chains: tuple, entries_per_chain: int, prior_entries: int):
+    for count in chains or (1000, 10000, 50000):
+        with tempfile.TemporaryDirectory() as path:
+            blockchain = LocalBlockchain(data_path=path)
+            chain_ids = [os.urandom(32) for _ in range(count)]
+            populate(blockchain.db, chain_ids, prior_entries)
+
+            block = PendingBlock(previous=object())
+            block.height = 100
+            for chain_id in chain_ids:
+                for _ in range(entries_per_chain):
+                    entry_hash = os.urandom(32)
+                    block.add_commit(make_commit(entry_hash))
+                    block.add_entry_hash(chain_id, entry_hash)
+            block.finish_merkle_roots()
+
+            start = time.perf_counter()
+            before = [b.keymr for b in seal_one_at_a_time(blockchain.db, block)]
+            one_at_a_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            links = blockchain.db.get_chain_head_links(chain_ids)
+            prefetch = time.perf_counter() - start
+
+            start = time.perf_counter()
+            after = [b.keymr for b in blockchain.seal_entry_blocks(block)]
+            batched = time.perf_counter() - start
+
+            assert before == after and len(links) == count
+            blockchain.db.close()
+        print(
+            f"{count:>6} chains: one at a time {one_at_a_time * 1e3:>8.1f} ms, "
+            f"batched {batched * 1e3:>8.1f} ms (of which head prefetch {prefetch * 1e3:.1f} ms)"
+        )
+
+
+if __name__ == "__main__":
+    main()
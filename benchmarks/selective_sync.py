@@ -0,0 +1,85 @@
+"""
+Measure the time and disk saved syncing selectively (identity and exchange rate chains only) against a full sync
+
+Builds `--blocks` DirectoryBlockStates carrying entry blocks and entries for `--chains` random chains and
+`--identity-chains` identity chains each, then has a full node and a selectively syncing node store them all into
+throwaway LevelDBs. Disk is measured after a full compaction.
+
+Usage (from the repository root):
+
+    $ python -m benchmarks.selective_sync --blocks 200 --chains 50 --identity-chains 2 --entries 4 --size 1000
+"""
+import click
+import copy
+import ed25519
+import os
+import tempfile
+import time
+
+import factom_core.blocks as blocks
+from factom_core.block_elements import Entry
+from factom_core.blockchains import LocalBlockchain
+from factom_core.messages import DirectoryBlockState
+from factom_core.utils.filters import SyncFilter
+from fixtures import builders, vectors
+
+
+def make_states(count: int, chains: int, identity_chains: int, entries: int, size: int, signer) -> list:
+    template = DirectoryBlockState.unmarshal(bytes.fromhex(vectors.DIRECTORY_BLOCK_STATE))
+    chain_ids = [os.urandom(32) for _ in range(chains)]
+    chain_ids += [b"\x88\x88\x88" + os.urandom(29) for _ in range(identity_chains)]
+    states = []
+    prev_keymr = bytes(32)
+    for height in range(count):  # from genesis, each linked to the last, as only the next block is stored
+        msg = copy.deepcopy(template)
+        msg.directory_block.header.network_id = LocalBlockchain.network_id
+        msg.directory_block.header.height = height
+        msg.directory_block.header.prev_keymr = prev_keymr
+        msg.entry_blocks, msg.entries = [], []
+        for chain_id in chain_ids:
+            chain_entries = [Entry(chain_id, [], os.urandom(size)) for _ in range(entries)]
+            body = blocks.EntryBlockBody(entry_hashes={1: [entry.entry_hash for entry in chain_entries]})
+            header = body.construct_header(chain_id, bytes(32), bytes(32), sequence=height, height=height)
+            msg.entry_blocks.append(blocks.EntryBlock(header, body))
+            msg.entries.extend(chain_entries)
+        builders.reseal_directory_block_state(msg, [signer])  # claim the entry blocks, and sign as the bootstrap key
+        prev_keymr = msg.directory_block.keymr
+        states.append(msg)
+    return states
+
+
+def disk_usage(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+@click.command()
+@click.option("--blocks", "count", default=200, help="Directory block states to sync")
+@click.option("--chains", default=50, help="Other chains with an entry block in every directory block")
+@click.option("--identity-chains", default=2, help="Identity chains with an entry block in every directory block")
+@click.option("--entries", default=4, help="Entries per entry block")
+@click.option("--size", default=1000, help="Bytes of content per entry")
+def main(count: int, chains: int, identity_chains: int, entries: int, size: int):
+    signer, verifier = ed25519.create_keypair()
+    states = make_states(count, chains, identity_chains, entries, size, signer)
+    results = {}
+    for name, sync_filter in [("full", None), ("selective", SyncFilter())]:
+        with tempfile.TemporaryDirectory() as path:
+            state = LocalBlockchain(data_path=path)
+            state.db.authorities.bootstrap_key = verifier.to_bytes()
+            state.sync_filter = sync_filter
+            start = time.perf_counter()
+            for msg in states:
+                msg.follower_execute(state)
+            elapsed = time.perf_counter() - start
+            assert state.db.get_directory_block_head().header.height == count - 1
+            state.db._db.compact_range()
+            state.db.close()
+            results[name] = (elapsed, disk_usage(path))
+
+    print(f"{count} blocks x {chains + identity_chains} chains x {entries} entries of {size} bytes")
+    for name, (elapsed, disk) in results.items():
+        print(f"{name:<10} {elapsed:>6.2f}s {disk / 2 ** 20:>8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Measure Ed25519 signature verification throughput, in signatures/sec overall and per core
+
+Usage (from the repository root):
+
+    $ python -m benchmarks.signatures --signatures 20000 --workers 1 --workers 2 --workers 4
+"""
+import click
+import os
+import time
+
+import ed25519
+
+from factom_core.primitives import verification
+
+
+def make_items(count: int, keys: int = 64) -> list:
+    signers = [ed25519.create_keypair()[0] for _ in range(keys)]
+    items = []
+    for i in range(count):
+        signer = signers[i % keys]
+        message = os.urandom(200)
+        items.append((signer.get_verifying_key().to_bytes(), signer.sign(message), message))
+    return items
+
+
+@click.command()
+@click.option("--signatures", "-n", default=20000, help="Number of signatures to verify")
+@click.option("--workers", "-w", multiple=True, type=int, help="Process counts to measure (repeatable)")
+def main(signatures: int, workers: tuple):
+    items = make_items(signatures)
+    print(f"Verifying {len(items)} signatures")
+
+    for count in workers or (1, 2, 4):
+        verification.verify_batch(items[: count * 2], cache=None, workers=count, parallel_threshold=2)  # warm pool
+        start = time.perf_counter()
+        results = verification.verify_batch(items, cache=None, workers=count)
+        elapsed = time.perf_counter() - start
+        assert all(results)
+        rate = len(items) / elapsed
+        print(f"{count} workers: {rate:>10,.0f} sigs/sec ({rate / count:,.0f} sigs/sec/core)")
+    verification.shutdown()
+
+    cache = verification.SignatureCache(max_size=len(items))
+    verification.verify_batch(items, cache=cache, workers=1)
+    start = time.perf_counter()
+    verification.verify_batch(items, cache=cache, workers=1)
+    elapsed = time.perf_counter() - start
+    print(f"re-broadcast (cached): {len(items) / elapsed:>10,.0f} sigs/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Measure minute execution throughput with each VM's messages executed in its own worker process
+
+Submits a minute's worth of raw entry reveals, and the commits paying for them, to a ShardedExecutor and waits for the
+end of minute barrier to merge them into a PendingBlock, for each VM count. The in-process line executes the same
+messages in the main process, for comparison. Throughput only scales with VM count up to the number of cores available.
+
+Usage (from the repository root):
+
+    $ python -m benchmarks.vm_sharding --messages 50000 --vms 1 --vms 2 --vms 4 --vms 8
+"""
+import click
+import os
+import time
+
+from factom_core.blockchains import PendingBlock
+from factom_core.messages import unmarshal_message
+from factom_core.vm import MinuteResults, ShardedExecutor
+from factom_core.vm.sharding import execute
+from benchmarks import samples
+
+
+@click.command()
+@click.option("--messages", "-n", default=50000, help="Messages per minute, half commits and half reveals")
+@click.option("--vms", "-v", multiple=True, type=int, help="VM counts to measure (repeatable)")
+@click.option("--batch-size", default=256, help="Messages sent to a worker at a time")
+def main(messages: int, vms: tuple, batch_size: int):
+    raws = []
+    for _ in range(messages // 2):
+        reveal = samples.make_entry_reveal()
+        raws.append(samples.make_entry_commit(entry_hash=unmarshal_message(reveal).entry.entry_hash))
+        raws.append(reveal)
+    print(f"Executing {len(raws)} commits and reveals per minute (cpu_count={os.cpu_count()})")
+
+    start = time.perf_counter()
+    results = MinuteResults()
+    for raw in raws:
+        execute(raw, results)
+    elapsed = time.perf_counter() - start
+    print(f"in-process: {len(raws) / elapsed:>10,.0f} msgs/sec")
+
+    for count in vms or (1, 2, 4):
+        executor = ShardedExecutor(workers=count, batch_size=batch_size)
+        executor.start()
+        executor.end_of_minute(PendingBlock(previous=object()))  # wait for the workers to come up
+        block = PendingBlock(previous=object())
+        start = time.perf_counter()
+        for raw in raws:
+            executor.submit(raw)
+        executor.end_of_minute(block)
+        elapsed = time.perf_counter() - start
+        executor.stop()
+        assert sum(len(body.entry_hashes[0]) for body in block.entry_blocks.values()) == messages // 2
+        print(f"{count} VMs: {len(raws) / elapsed:>10,.0f} msgs/sec  (per VM: {executor.routed})")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,5 +4,5 @@ from .chain import Chain
 from .chain_commit import ChainCommit
 from .entry import Entry
 from .entry_commit import EntryCommit
-from .factoid_transaction import FactoidTransaction
+from .factoid_transaction import ECPurchase, FactoidTransaction, TransactionIO
 from .admin_messages import *  # TODO: stop being lazy, just explicitly import the classes
@@ -1,5 +1,6 @@
 import struct
 from dataclasses import dataclass
+from typing import List
 
 import factom_core.primitives as primitives
 from factom_core.utils import varint
@@ -9,6 +10,17 @@ class AdminMessage:
     """Base class to inherit from"""
 
     ADMIN_ID = None
+    MESSAGE_SIZE = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        admin_id = cls.__dict__.get("ADMIN_ID")
+        if admin_id is None:
+            return
+        existing = ADMIN_MESSAGE_TYPES[admin_id]
+        if existing is not None and existing.__qualname__ != cls.__qualname__:
+            raise ValueError(f"ADMIN_ID {admin_id} already registered to {existing.__name__}")
+        ADMIN_MESSAGE_TYPES[admin_id] = cls
 
     def marshal(self):
         raise NotImplementedError("Must be implemented by subclasses")
@@ -17,44 +29,33 @@ class AdminMessage:
     def unmarshal(cls, raw: bytes):
         raise NotImplementedError("Must be implemented by subclasses")
 
+    @classmethod
+    def unmarshal_with_remainder(cls, raw: bytes):
+        """
+        Unmarshal the message from the front of `raw` and return the remaining bytes
+
+        Fixed size messages are covered by this default, variable size messages must override it.
+
+        :param raw: bytes starting with the marshalled message (not including its ADMIN_ID byte)
+        :return: a tuple of (new message object, remaining bytes)
+        """
+        size = cls.MESSAGE_SIZE
+        return cls.unmarshal(raw[:size]), raw[size:]
+
     def to_dict(self):
         raise NotImplementedError("Must be implemented by subclasses")
 
 
+# Dense lookup table of ADMIN_ID --> AdminMessage subclass, filled in as the subclasses are defined
+ADMIN_MESSAGE_TYPES: List[type] = [None] * 256
+
+
 def unmarshal_admin_message_of_type(admin_id: int, data: bytes) -> AdminMessage:
     """Given an admin ID type and the marshalled message bytes, return the unmarshalled message."""
-    if admin_id == MinuteNumber.ADMIN_ID:
-        return MinuteNumber.unmarshal(data)
-    elif admin_id == DirectoryBlockSignature.ADMIN_ID:
-        return DirectoryBlockSignature.unmarshal(data)
-    elif admin_id == MatryoshkaHashReveal.ADMIN_ID:
-        return MatryoshkaHashReveal.unmarshal(data)
-    elif admin_id == MatryoshkaHashAddOrReplace.ADMIN_ID:
-        return MatryoshkaHashAddOrReplace.unmarshal(data)
-    elif admin_id == ServerCountIncrease.ADMIN_ID:
-        return ServerCountIncrease.unmarshal(data)
-    elif admin_id == AddFederatedServer.ADMIN_ID:
-        return AddFederatedServer.unmarshal(data)
-    elif admin_id == AddAuditServer.ADMIN_ID:
-        return AddAuditServer.unmarshal(data)
-    elif admin_id == RemoveFederatedServer.ADMIN_ID:
-        return RemoveFederatedServer.unmarshal(data)
-    elif admin_id == AddFederatedServerSigningKey.ADMIN_ID:
-        return AddFederatedServerSigningKey.unmarshal(data)
-    elif admin_id == AddFederatedServerBitcoinAnchorKey.ADMIN_ID:
-        return AddFederatedServerBitcoinAnchorKey.unmarshal(data)
-    elif admin_id == ServerFaultHandoff.ADMIN_ID:
-        return ServerFaultHandoff()
-    elif admin_id == CoinbaseDescriptor.ADMIN_ID:
-        return CoinbaseDescriptor.unmarshal(data)
-    elif admin_id == CoinbaseDescriptorCancel.ADMIN_ID:
-        return CoinbaseDescriptorCancel.unmarshal(data)
-    elif admin_id == AddAuthorityFactoidAddress.ADMIN_ID:
-        return AddAuthorityFactoidAddress.unmarshal(data)
-    elif admin_id == AddAuthorityEfficiency.ADMIN_ID:
-        return AddAuthorityEfficiency.unmarshal(data)
-    else:
+    message_class = ADMIN_MESSAGE_TYPES[admin_id]
+    if message_class is None:
         raise ValueError("Invalid Admin ID")
+    return message_class.unmarshal(data)
 
 
 @dataclass
@@ -145,6 +146,10 @@ class DirectoryBlockSignature(AdminMessage):
             "signature": self.signature.to_dict(),
         }
 
+    def validate_signature(self, previous_header: bytes) -> bool:
+        """Check the signature against the marshalled header of the preceding Directory Block"""
+        return self.signature.verify(previous_header)
+
 
 @dataclass
 class MatryoshkaHashReveal(AdminMessage):
@@ -568,6 +573,13 @@ class ServerFaultHandoff(AdminMessage):
     the blockchain.
     """
 
+    def marshal(self):
+        return b""
+
+    @classmethod
+    def unmarshal(cls, raw: bytes):
+        return ServerFaultHandoff()  # No data on chain for message
+
 
 @dataclass
 class CoinbaseDescriptor(AdminMessage):
@@ -707,7 +719,7 @@ class CoinbaseDescriptorCancel(AdminMessage):
         message_size, data = varint.decode(raw)
         message_data, data = data[:message_size], data[message_size:]
         descriptor_height, message_data = varint.decode(message_data)
-        descriptor_index, message_data = message_data[:32], message_data[32:]
+        descriptor_index, message_data = varint.decode(message_data)
         assert len(message_data) == 0, "Extra bytes remaining in message data!"
         return CoinbaseDescriptorCancel(descriptor_height, descriptor_index), data
 
@@ -796,6 +808,7 @@ class AddAuthorityEfficiency(AdminMessage):
         :return: bytes representation of the AddAuthorityEfficiency message
         """
         buf = bytearray()
+        buf.append(34)
         buf.extend(self.chain_id)
         buf.extend(struct.pack(">H", self.efficiency_percentage))
         return bytes(buf)
@@ -810,7 +823,7 @@ class AddAuthorityEfficiency(AdminMessage):
         """
         data = raw[1:]  # Skip message length, always 34
         chain_id, data = data[:32], data[32:]
-        efficiency_percentage, data = struct.unpack(">H", data[:4])[0], data[4:]
+        efficiency_percentage, data = struct.unpack(">H", data[:2])[0], data[2:]
         return AddAuthorityEfficiency(chain_id, efficiency_percentage)
 
     def to_dict(self):
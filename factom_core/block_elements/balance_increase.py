@@ -1,7 +1,9 @@
 from dataclasses import dataclass
 from factom_core.utils import varint
+from factom_core.utils.slots import slotted
 
 
+@slotted
 @dataclass
 class BalanceIncrease:
     ECID = 0x04
@@ -1,6 +1,9 @@
 from dataclasses import dataclass
 
+from factom_core.utils.slots import slotted
 
+
+@slotted
 @dataclass
 class ChainCommit:
 
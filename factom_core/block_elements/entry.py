@@ -2,8 +2,10 @@ import struct
 from dataclasses import dataclass
 from factom_core.blocks.entry_block import EntryBlock
 from hashlib import sha256, sha512
+from factom_core.utils.slots import slotted
 
 
+@slotted
 @dataclass
 class Entry:
 
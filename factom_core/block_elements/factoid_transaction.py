@@ -1,17 +1,41 @@
 import hashlib
 from dataclasses import dataclass
+from typing import List
+
+from factom_keys.fct import FactoidAddress
 
 import factom_core.primitives as primitives
+from factom_core.primitives import verification
 from factom_core.utils import varint
+from factom_core.utils.slots import FieldAccess, slotted
+
+
+@slotted
+@dataclass
+class TransactionIO(FieldAccess):
+    """A factoid transaction input or output: an amount and the factoid address (RCD hash) it's from or to"""
+
+    value: int
+    fct_address: bytes
+
+
+@slotted
+@dataclass
+class ECPurchase(FieldAccess):
+    """An entry credit purchase in a factoid transaction: an amount and the entry credit public key it's for"""
+
+    value: int
+    ec_public_key: bytes
 
 
+@slotted
 @dataclass
 class FactoidTransaction:
 
     timestamp: int
-    inputs: list
-    outputs: list
-    ec_purchases: list
+    inputs: List[TransactionIO]
+    outputs: List[TransactionIO]
+    ec_purchases: List[ECPurchase]
     rcds: primitives.FullSignatureList
 
     def __post_init__(self):
@@ -50,19 +74,26 @@ class FactoidTransaction:
         buf.append(len(self.outputs))
         buf.append(len(self.ec_purchases))
         for i in self.inputs:
-            value = i.get("value")
-            fct_address = i.get("fct_address")
-            buf.extend(varint.encode(value) + fct_address)
+            buf.extend(varint.encode(i.value) + i.fct_address)
         for o in self.outputs:
-            value = o.get("value")
-            fct_address = o.get("fct_address")
-            buf.extend(varint.encode(value) + fct_address)
+            buf.extend(varint.encode(o.value) + o.fct_address)
         for purchase in self.ec_purchases:
-            value = purchase.get("value")
-            ec_public_key = purchase.get("ec_public_key")
-            buf.extend(varint.encode(value) + ec_public_key)
+            buf.extend(varint.encode(purchase.value) + purchase.ec_public_key)
         return bytes(buf)
 
+    def validate_signatures(self) -> bool:
+        """
+        Check that each input is signed for by its RCD: the RCD's public key must hash to the input's address, and
+        its signature must cover the transaction's header and partial body
+        """
+        if len(self.rcds) != len(self.inputs):
+            return False
+        for i, rcd in zip(self.inputs, self.rcds):
+            if FactoidAddress(key_bytes=rcd.public_key).rcd_hash != i.fct_address:
+                return False
+        data = self.marshal_for_signature()
+        return all(verification.verify_batch((rcd.public_key, rcd.signature, data) for rcd in self.rcds))
+
     @classmethod
     def unmarshal(cls, raw: bytes):
         """Returns a new FactoidTransaction object, unmarshalling given bytes according to:
@@ -91,19 +122,19 @@ class FactoidTransaction:
         for i in range(input_count):
             value, data = varint.decode(data)
             fct_address, data = data[:32], data[32:]
-            inputs.append({"value": value, "fct_address": fct_address})
+            inputs.append(TransactionIO(value, fct_address))
 
         outputs = []
         for i in range(output_count):
             value, data = varint.decode(data)
             fct_address, data = data[:32], data[32:]
-            outputs.append({"value": value, "fct_address": fct_address})
+            outputs.append(TransactionIO(value, fct_address))
 
         ec_purchases = []
         for i in range(ec_purchase_count):
             value, data = varint.decode(data)
             ec_public_key, data = data[:32], data[32:]
-            ec_purchases.append({"value": value, "ec_public_key": ec_public_key})
+            ec_purchases.append(ECPurchase(value, ec_public_key))
 
         rcds = primitives.FullSignatureList()
         for i in range(input_count):
@@ -122,10 +153,10 @@ class FactoidTransaction:
         return {
             "tx_id": self.tx_id.hex(),
             "timestamp": self.timestamp,
-            "inputs": [{"value": r.get("value"), "fct_address": r.get("fct_address").hex()} for r in self.inputs],
-            "outputs": [{"value": r.get("value"), "fct_address": r.get("fct_address").hex()} for r in self.outputs],
+            "inputs": [{"value": r.value, "fct_address": r.fct_address.hex()} for r in self.inputs],
+            "outputs": [{"value": r.value, "fct_address": r.fct_address.hex()} for r in self.outputs],
             "ec_purchases": [
-                {"value": r.get("value"), "ec_public_key": r.get("ec_public_key").hex()} for r in self.ec_purchases
+                {"value": r.value, "ec_public_key": r.ec_public_key.hex()} for r in self.ec_purchases
             ],
             "rcds": [r.to_dict() for r in self.rcds],
         }
@@ -1,7 +1,10 @@
-from typing import Any, List
+from typing import Any, List, Sequence
 
 import factom_core.blocks as blocks
 from factom_core.db import FactomdLevelDB
+from factom_core.utils import routing
+from factom_core.utils.merkle import MerkleAccumulator
+from factom_core.utils.filters import SyncFilter
 
 from .pending_block import PendingBlock
 
@@ -10,11 +13,14 @@ class BaseBlockchain:
     """The base class for all Blockchain objects"""
 
     network_id: bytes = None
+    bootstrap_key: bytes = None  # signs the Directory Blocks until there are federated servers, if known
     vms: List[Any] = None
 
     data_path: str = None
     db: FactomdLevelDB = None
     current_block: PendingBlock = None
+    sync_filter: SyncFilter = None  # if set, only the entry blocks and entries of chains it accepts are stored
+    executor: Any = None  # if set, executes the VMs' messages in worker processes (see factom_core.vm.ShardedExecutor)
 
     def __init__(self, data_path: str = None) -> None:
         if not isinstance(self.network_id, bytes) or len(self.network_id) != 4:
@@ -25,10 +31,19 @@ class BaseBlockchain:
         #     )
         self.data_path = data_path
         self.db = FactomdLevelDB(path=data_path, create_if_missing=True)
+        self.db.authorities.bootstrap_key = self.bootstrap_key
+        if self.bootstrap_key is None:
+            print(
+                "Warning: no bootstrap key is known for this network, Directory Block signatures won't be checked "
+                "until its federated servers have signing keys"
+            )
 
     def load_genesis_block(self) -> blocks.DirectoryBlock:
         raise NotImplementedError("Blockchain classes must implement this method")
 
+    def vm_count(self) -> int:
+        raise NotImplementedError("Blockchain classes must implement this method")
+
     def vm_for_hash(self, h: bytes) -> int:
         raise NotImplementedError("Blockchain classes must implement this method")
 
@@ -56,22 +71,24 @@ class Blockchain(BaseBlockchain):
     def load_genesis_block(self) -> blocks.DirectoryBlock:
         pass
 
+    def vm_count(self) -> int:
+        """The number of VMs: one per federated server, unless the blockchain has its own `vms`"""
+        return len(self.vms) if self.vms else max(len(self.db.authorities.federated), 1)
+
     def vm_for_hash(self, h: bytes) -> int:
-        """
-        Compute the VM index responsible for hash h
+        """Compute the VM index responsible for hash h"""
+        return routing.vm_for_hash(h, self.vm_count())
 
-        Taken from: factomd/state/processList.go/VMindexFor(hash []byte)
-        """
-        if len(self.vms) == 0:
-            return 0
-        v = 0
-        for b in h:
-            v += b
-        return v % len(self.vms)
+    def vm_for_hashes(self, hashes: List[bytes]) -> Sequence[int]:
+        """Compute the VM index responsible for each hash in a batch"""
+        return routing.vm_for_hashes(hashes, self.vm_count())
 
     def seal_minute(self) -> None:
-        """Finalize the current block minute"""
+        """Finalize the current block minute, once every VM has ended it"""
+        if self.executor is not None:
+            self.executor.end_of_minute(self.current_block)
         self.rotate_vms()
+        self.current_block.minute_ends.clear()
 
         if self.current_block.current_minute == 10:
             self.seal_block()
@@ -81,27 +98,46 @@ class Blockchain(BaseBlockchain):
     def rotate_vms(self) -> None:
         """Rotate the responsibilities of the VM set (if necessary)"""
         # TODO: see processList.go/MakgeMap for formula per block height
-        if len(self.vms) == 1:
+        if not self.vms or len(self.vms) == 1:
             return
         self.vms = self.vms[1:] + self.vms[:1]
 
-    def seal_block(self):
+    def seal_entry_blocks(self, block: PendingBlock, tree: MerkleAccumulator = None) -> List[blocks.EntryBlock]:
         """
-        Bundles all added transactions, entries, and other elements into a set of finalized
-        blocks with headers.
+        Construct the entry blocks for every chain with entries in the pending block, linking each onto its chain head
+
+        The heads of all the chains are fetched up front in one batched read. If given a directory block body `tree`,
+        each entry block's chain id and keymr are appended to it as it's sealed.
+
+        :raises ValueError: if a chain's head entry block isn't stored (see `FactomdLevelDB.get_chain_head_links`)
         """
-        block = self.current_block
+        links = self.db.get_chain_head_links(list(block.entry_blocks))
         entry_blocks: List[blocks.EntryBlock] = []
         for chain_id, block_body in block.entry_blocks.items():
-            prev = self.db.get_entry_block_head(chain_id)
+            prev = links.get(chain_id)
+            if prev is None and chain_id in links:
+                raise ValueError(f"Can't link onto chain {chain_id.hex()}, its head entry block isn't stored")
             header = block_body.construct_header(
                 chain_id=chain_id,
                 prev_keymr=prev.keymr if prev is not None else bytes(32),
                 prev_full_hash=prev.full_hash if prev is not None else bytes(32),
-                sequence=prev.header.sequence + 1 if prev is not None else 0,
+                sequence=prev.sequence + 1 if prev is not None else 0,
                 height=block.height,
             )
-            entry_blocks.append(blocks.EntryBlock(header, block_body))
+            entry_block = blocks.EntryBlock(header, block_body)
+            if tree is not None:
+                tree.append(chain_id)
+                tree.append(entry_block.keymr)
+            entry_blocks.append(entry_block)
+        return entry_blocks
+
+    def seal_block(self):
+        """
+        Bundles all added transactions, entries, and other elements into a set of finalized
+        blocks with headers.
+        """
+        block = self.current_block
+        block.finish_merkle_roots()
 
         prev = self.db.get_entry_credit_block(height=block.height - 1)
         header = block.entry_credit_block.construct_header(
@@ -113,7 +149,7 @@ class Blockchain(BaseBlockchain):
         header = block.factoid_block.construct_header(
             prev_keymr=block.previous.body.factoid_block_keymr,
             prev_ledger_keymr=prev.ledger_keymr,
-            ec_exchange_rate=1000,  # TODO
+            ec_exchange_rate=block.ec_exchange_rate,
             height=block.height,
         )
         factoid_block = blocks.FactoidBlock(header, block.factoid_block)
@@ -124,14 +160,28 @@ class Blockchain(BaseBlockchain):
         )
         admin_block = blocks.AdminBlock(header, block.admin_block)
 
+        # The directory block body's merkle root is accumulated as its elements are sealed, entry blocks last
+        directory_tree = MerkleAccumulator()
+        for element in (
+            blocks.AdminBlockHeader.CHAIN_ID,
+            admin_block.lookup_hash,
+            blocks.EntryCreditBlockHeader.CHAIN_ID,
+            entry_credit_block.header_hash,
+            blocks.FactoidBlockHeader.CHAIN_ID,
+            factoid_block.keymr,
+        ):
+            directory_tree.append(element)
+        entry_blocks = self.seal_entry_blocks(block, directory_tree)
+
         # Compile all the above blocks and the previous directory block, into a new one
         directory_block_body = blocks.DirectoryBlockBody(
             admin_block_lookup_hash=admin_block.lookup_hash,
             entry_credit_block_header_hash=entry_credit_block.header_hash,
             factoid_block_keymr=factoid_block.keymr,
             entry_blocks=[
-                {"chain_id": entry_block.header.chain_id, "keymr": entry_block.keymr} for entry_block in entry_blocks
+                blocks.EntryBlockReference(entry_block.header.chain_id, entry_block.keymr) for entry_block in entry_blocks
             ],
+            _cached_mr=directory_tree.root,
         )
         header = directory_block_body.construct_header(
             network_id=self.network_id,
@@ -142,10 +192,14 @@ class Blockchain(BaseBlockchain):
         )
         directory_block = blocks.DirectoryBlock(header, directory_block_body)
 
-        # Persist the blocks as new chain heads
-        self.db.put_directory_block_head(directory_block)
-        self.db.put_admin_block_head(admin_block)
-        self.db.put_entry_credit_block_head(entry_credit_block)
-        self.db.put_factoid_block_head(factoid_block)
-        for entry_block in entry_blocks:
-            self.db.put_entry_block_head(entry_block)
+        # Persist the blocks as new chain heads, in one atomic batch
+        with self.db.write_batch() as batch:
+            self.db.put_directory_block_head(directory_block, batch)
+            self.db.put_admin_block_head(admin_block, batch)
+            self.db.put_entry_credit_block_head(entry_credit_block, batch)
+            self.db.put_factoid_block_head(factoid_block, batch)
+            for entry_block in entry_blocks:
+                self.db.put_entry_block_head(entry_block, batch)
+
+        # Start on the next block, carrying over the commits still waiting to be revealed
+        self.current_block = block.next_block(directory_block)
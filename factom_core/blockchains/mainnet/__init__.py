@@ -1,15 +1,16 @@
 import factom_core.blocks as blocks
 from factom_core.blockchains import Blockchain
-from factom_core.blockchains.mainnet.constants import MAINNET_NETWORK_ID
+from factom_core.blockchains.mainnet.constants import MAINNET_BOOTSTRAP_KEY, MAINNET_NETWORK_ID
 from factom_core.blockchains.mainnet.genesis import genesis_factoid_block_bytes
 
 
 class MainnetBlockchain(Blockchain):
     network_id: bytes = MAINNET_NETWORK_ID
+    bootstrap_key: bytes = MAINNET_BOOTSTRAP_KEY
 
     def load_genesis_block(self) -> blocks.DirectoryBlock:
         body = blocks.AdminBlockBody()
-        header = body.construct_header(back_reference_hash=bytes(32), height=0)
+        header = body.construct_header(prev_back_reference_hash=bytes(32), height=0)
         admin_block = blocks.AdminBlock(header, body)
 
         # Add M1 server index number
@@ -31,10 +32,13 @@ class MainnetBlockchain(Blockchain):
         )
         directory_block = blocks.DirectoryBlock(header=directory_block_header, body=directory_block_body)
 
-        # Persist the blocks as new chain heads
-        self.db.put_directory_block_head(directory_block)
-        self.db.put_admin_block_head(admin_block)
-        self.db.put_entry_credit_block_head(entry_credit_block)
-        self.db.put_factoid_block_head(factoid_block)
+        # Persist the blocks as new chain heads, in one atomic batch
+        with self.db.write_batch() as batch:
+            self.db.put_directory_block_head(directory_block, batch)
+            self.db.put_admin_block_head(admin_block, batch)
+            self.db.put_entry_credit_block_head(entry_credit_block, batch)
+            self.db.put_factoid_block_head(factoid_block, batch)
+            self.db.authorities.apply_admin_block(admin_block)  # the federated servers the network starts out with
+            self.db.commit_authorities(batch)
 
         return directory_block
@@ -1,5 +1,8 @@
 MAINNET_NETWORK_ID = b"\xfa\x92\xe5\xa2"  # 0xfa92e5a2
 
+# The key that signed the Directory Blocks before there were any federated servers
+MAINNET_BOOTSTRAP_KEY = bytes.fromhex("0426a802617848d4d16d87830fc521f4d136bb2d0c352850919c2679f189613a")
+
 CHECKPOINTS = {
     2: "5328d4bbe7ea6efc31cf7bfc45192378454cf4e1908c56a35e6a64456a691751",
     10: "3a5ec711a1dc1c6e463b0c0344560f830eb0b56e42def141cb423b0d8487a1dc",
@@ -1,20 +1,49 @@
 import datetime
+import hashlib
 from dataclasses import dataclass, field
-from typing import Dict, Union
+from typing import Dict, List, Optional, Set, Union
 
 import factom_core.block_elements as block_elements
 import factom_core.blocks as blocks
+from factom_core.db import EntryCreditBalanceLedger
+from factom_core.utils.merkle import MerkleAccumulator
+
+CommitTypes = Union[block_elements.ChainCommit, block_elements.EntryCommit]
+
+FACTOID_MINUTE_MARKER = hashlib.sha256(b"\x00").digest()  # the factoid body element closing out a minute, hashed
+
+# The number of blocks a commit can be revealed in, counting the one it was made in (an hour of 10 minute blocks)
+COMMIT_WINDOW = 6
 
 
 @dataclass
 class PendingBlock:
 
-    admin_block: blocks.AdminBlockBody = field(init=False, default=blocks.AdminBlockBody())
-    factoid_block: blocks.FactoidBlockBody = field(init=False, default=blocks.FactoidBlockBody())
-    entry_credit_block: blocks.EntryCreditBlockBody = field(init=False, default=blocks.EntryCreditBlockBody())
+    admin_block: blocks.AdminBlockBody = field(init=False, default_factory=blocks.AdminBlockBody)
+    factoid_block: blocks.FactoidBlockBody = field(init=False, default_factory=blocks.FactoidBlockBody)
+    entry_credit_block: blocks.EntryCreditBlockBody = field(init=False, default_factory=blocks.EntryCreditBlockBody)
     entry_blocks: Dict[bytes, blocks.EntryBlockBody] = field(init=False, default_factory=dict)
 
+    # Indexes over everything added so far, so replays are caught without scanning the block bodies
+    entry_hashes: Set[bytes] = field(init=False, default_factory=set)  # entries revealed
+    commit_hashes: Set[bytes] = field(init=False, default_factory=set)  # entry hashes committed to
+    transaction_ids: Set[bytes] = field(init=False, default_factory=set)
+    unrevealed_commits: Dict[bytes, CommitTypes] = field(init=False, default_factory=dict)  # entry hash --> commit
+    # ec public key --> credits committed, less credits bought, in this block
+    credits_spent: Dict[bytes, int] = field(init=False, default_factory=dict)
+    minute_ends: Set[int] = field(init=False, default_factory=set)  # VM indexes that have ended the current minute
+
+    # Merkle work done as elements arrive, so sealing only finishes off the roots
+    entry_block_trees: Dict[bytes, MerkleAccumulator] = field(init=False, default_factory=dict)  # chain id --> tree
+    factoid_tree: MerkleAccumulator = field(init=False, default_factory=MerkleAccumulator)
+    factoid_leaves: Dict[int, List[bytes]] = field(init=False, default_factory=dict)  # minute --> hashes not yet in it
+    factoid_minutes_folded: int = field(init=False, default=0)  # how many of the body's minutes are in the tree
+
     previous: blocks.DirectoryBlock = None
+    # Unrevealed commits from the blocks before this one in the commit window, oldest first (see `next_block`)
+    earlier_commits: List[Dict[bytes, CommitTypes]] = field(default_factory=list)
+    ec_balances: Optional[EntryCreditBalanceLedger] = None  # if given, commits must be covered by the key's balance
+    ec_exchange_rate: int = 1000  # factoshis per entry credit, TODO: read from the exchange rate chain
     current_minute: int = field(init=False, default=0)
     height: int = field(init=False, default=0)
     timestamp: int = int(datetime.datetime.utcnow().timestamp())
@@ -23,24 +52,148 @@ class PendingBlock:
         if self.previous is None:
             raise ValueError("PendingBlock must be instantiated with a previous directory block")
 
-    def add_factoid_transaction(self, tx: block_elements.FactoidTransaction):
+    def add_factoid_transaction(self, tx: block_elements.FactoidTransaction) -> bool:
+        """
+        Add a transaction to the current minute, returning False if it's a replay of one already in the block
+
+        Its entry credit purchases go in the entry credit block as BalanceIncreases, and can be spent on commits for
+        the rest of the block.
+        """
+        tx_id = tx.tx_id
+        if tx_id in self.transaction_ids:
+            return False
+        self.transaction_ids.add(tx_id)
+        for index, purchase in enumerate(tx.ec_purchases):
+            quantity = purchase.value // self.ec_exchange_rate
+            increase = block_elements.BalanceIncrease(
+                ec_public_key=purchase.ec_public_key, tx_id=tx_id, index=index, quantity=quantity
+            )
+            self.entry_credit_block.objects.setdefault(self.current_minute, []).append(increase)
+            self.credits_spent[purchase.ec_public_key] = self.credits_spent.get(purchase.ec_public_key, 0) - quantity
         if len(self.factoid_block.transactions.keys()) == 0:
             for i in range(1, 10):
                 self.factoid_block.transactions[i] = []
-        self.factoid_block.transactions[self.current_minute].append(tx)
+                self.factoid_leaves[i] = []
+        self.factoid_block.transactions.setdefault(self.current_minute, []).append(tx)
+        self.factoid_leaves.setdefault(self.current_minute, []).append(tx.hash)
+        self.fold_factoid_minutes()
+        return True
+
+    def fold_factoid_minutes(self):
+        """
+        Append the transaction hashes of the factoid body's leading minutes that are over to `factoid_tree`, each
+        followed by its marker. Minutes are folded in body order, and only once no more transactions can join them.
+        """
+        minutes = list(self.factoid_block.transactions)
+        while self.factoid_minutes_folded < len(minutes) and minutes[self.factoid_minutes_folded] < self.current_minute:
+            for tx_hash in self.factoid_leaves.pop(minutes[self.factoid_minutes_folded]):
+                self.factoid_tree.append(tx_hash)
+            self.factoid_tree.append(FACTOID_MINUTE_MARKER)
+            self.factoid_minutes_folded += 1
+
+    def available_credits(self, ec_public_key: bytes) -> int:
+        """
+        The key's entry credit balance as of the previous block, plus what it has bought in this one, less what it has
+        committed to in this one
+        """
+        return self.ec_balances.get(ec_public_key) - self.credits_spent.get(ec_public_key, 0)
 
-    def add_commit(self, commit: Union[block_elements.ChainCommit, block_elements.EntryCommit]):
+    def add_commit(self, commit: CommitTypes) -> bool:
+        """
+        Add a paid commit to the current minute, returning False if it's a repeat, or if its key can't cover the entry
+        credits spent (when an `ec_balances` ledger is given). The commit waits in `unrevealed_commits` until its entry
+        is revealed.
+
+        An entry hash can be committed to once per block, and not again while an earlier block's commit to it is still
+        waiting to be revealed. The first commit stands and repeats are rejected rather than replacing it, so nobody
+        pays twice for one reveal. Once revealed, the same entry can be committed to again in a later block.
+        """
+        if commit.entry_hash in self.commit_hashes or self._earlier_commit(commit.entry_hash) is not None:
+            return False
+        if self.ec_balances is not None:
+            if self.available_credits(commit.ec_public_key) < commit.ec_spent:
+                return False
+            self.credits_spent[commit.ec_public_key] = self.credits_spent.get(commit.ec_public_key, 0) + commit.ec_spent
+        self.commit_hashes.add(commit.entry_hash)
+        self.unrevealed_commits[commit.entry_hash] = commit
         if self.current_minute not in self.entry_credit_block.objects:
             self.entry_credit_block.objects[self.current_minute] = [commit]
         else:
             self.entry_credit_block.objects[self.current_minute].append(commit)
+        return True
+
+    def commit_for(self, entry_hash: bytes) -> Optional[CommitTypes]:
+        """The paid commit waiting for the entry with the given hash to be revealed, in any block of the window"""
+        commit = self.unrevealed_commits.get(entry_hash)
+        return commit if commit is not None else self._earlier_commit(entry_hash)
 
-    def add_entry(self, entry: block_elements.Entry):
-        if entry.chain_id not in self.entry_blocks:
-            entry_hashes = {self.current_minute: [entry.entry_hash]}
-            entry_block = blocks.EntryBlockBody(entry_hashes=entry_hashes)
-            self.entry_blocks[entry.chain_id] = entry_block
-        elif self.current_minute not in self.entry_blocks[entry.chain_id]:
-            self.entry_blocks[entry.chain_id].entry_hashes[self.current_minute] = [entry.entry_hash]
+    def _earlier_commit(self, entry_hash: bytes, pop: bool = False) -> Optional[CommitTypes]:
+        for commits in self.earlier_commits:
+            if entry_hash in commits:
+                return commits.pop(entry_hash) if pop else commits[entry_hash]
+        return None
+
+    def next_block(self, previous: blocks.DirectoryBlock) -> "PendingBlock":
+        """
+        The pending block to follow this one, once it has been sealed into `previous`
+
+        The commits still waiting for their entries are carried over, until they fall out of the commit window.
+        """
+        earlier_commits = (self.earlier_commits + [self.unrevealed_commits])[1 - COMMIT_WINDOW :]
+        block = PendingBlock(
+            previous=previous,
+            earlier_commits=earlier_commits,
+            ec_balances=self.ec_balances,
+            ec_exchange_rate=self.ec_exchange_rate,
+        )
+        block.height = self.height + 1
+        return block
+
+    def add_entry(self, entry: block_elements.Entry) -> bool:
+        return self.add_entry_hash(entry.chain_id, entry.entry_hash)
+
+    def add_entry_hash(self, chain_id: bytes, entry_hash: bytes) -> bool:
+        """
+        Add a revealed entry to its chain's entry block for the current minute, consuming the commit that paid for it
+
+        :return: False if the entry has no unrevealed commit in the commit window (unpaid, or a replay), otherwise True
+        """
+        if self.unrevealed_commits.pop(entry_hash, None) is None and self._earlier_commit(entry_hash, pop=True) is None:
+            return False
+        self.entry_hashes.add(entry_hash)
+        if chain_id not in self.entry_blocks:
+            entry_hashes = {self.current_minute: [entry_hash]}
+            self.entry_blocks[chain_id] = blocks.EntryBlockBody(entry_hashes=entry_hashes)
+            self.entry_block_trees[chain_id] = MerkleAccumulator()
         else:
-            self.entry_blocks[entry.chain_id].entry_hashes[self.current_minute].append(entry.entry_hash)
+            entry_hashes = self.entry_blocks[chain_id].entry_hashes
+            if self.current_minute not in entry_hashes:
+                # The chain's previous minute is over, so its marker follows that minute's entries
+                self.entry_block_trees[chain_id].append(minute_marker(list(entry_hashes)[-1]))
+                entry_hashes[self.current_minute] = []
+            entry_hashes[self.current_minute].append(entry_hash)
+        self.entry_block_trees[chain_id].append(entry_hash)
+        return True
+
+    def finish_merkle_roots(self):
+        """
+        Finish the merkle roots accumulated over the block and cache them on the entry block and factoid block bodies,
+        so that sealing doesn't hash every entry and transaction again
+        """
+        for chain_id, body in self.entry_blocks.items():
+            tree = self.entry_block_trees[chain_id].copy()
+            tree.append(minute_marker(list(body.entry_hashes)[-1]))
+            body._cached_mr = tree.root
+
+        self.fold_factoid_minutes()
+        tree = self.factoid_tree.copy()
+        for minute in list(self.factoid_block.transactions)[self.factoid_minutes_folded :]:
+            for tx_hash in self.factoid_leaves[minute]:
+                tree.append(tx_hash)
+            tree.append(FACTOID_MINUTE_MARKER)
+        self.factoid_block._cached_mr = tree.root
+
+
+def minute_marker(minute: int) -> bytes:
+    """The entry block body element that closes out a minute"""
+    return bytes(31) + bytes([minute])
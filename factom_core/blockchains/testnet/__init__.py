@@ -29,10 +29,13 @@ class TestnetBlockchain(Blockchain):
         )
         directory_block = blocks.DirectoryBlock(header=directory_block_header, body=directory_block_body)
 
-        # Persist the blocks as new chain heads
-        self.db.put_directory_block_head(directory_block)
-        self.db.put_admin_block_head(admin_block)
-        self.db.put_entry_credit_block_head(entry_credit_block)
-        self.db.put_factoid_block_head(factoid_block)
+        # Persist the blocks as new chain heads, in one atomic batch
+        with self.db.write_batch() as batch:
+            self.db.put_directory_block_head(directory_block, batch)
+            self.db.put_admin_block_head(admin_block, batch)
+            self.db.put_entry_credit_block_head(entry_credit_block, batch)
+            self.db.put_factoid_block_head(factoid_block, batch)
+            self.db.authorities.apply_admin_block(admin_block)  # the federated servers the network starts out with
+            self.db.commit_authorities(batch)
 
         return directory_block
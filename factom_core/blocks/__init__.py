@@ -1,5 +1,12 @@
 from .admin_block import AdminBlock, AdminBlockBody, AdminBlockHeader
-from .directory_block import DirectoryBlock, DirectoryBlockBody, DirectoryBlockHeader
+from .directory_block import (
+    ColumnarDirectoryBlockBody,
+    DirectoryBlock,
+    DirectoryBlockBody,
+    DirectoryBlockHeader,
+    EntryBlockReference,
+    EntryBlockTable,
+)
 from .entry_block import EntryBlock, EntryBlockBody, EntryBlockHeader
 from .entry_credit_block import (
     EntryCreditBlock,
@@ -4,9 +4,11 @@ from typing import List
 
 from factom_core.block_elements.admin_messages import *
 from factom_core.utils import varint
+from factom_core.utils.slots import slotted
 from .directory_block import DirectoryBlock
 
 
+@slotted
 @dataclass
 class AdminBlockHeader:
 
@@ -95,82 +97,13 @@ class AdminBlockBody:
         messages = []
         for i in range(message_count):
             admin_id, data = data[0], data[1:]
-            msg = None
-            if admin_id == MinuteNumber.ADMIN_ID:  # Deprecated in M2
-                size = MinuteNumber.MESSAGE_SIZE
-                msg_data, data = data[:size], data[size:]
-                msg = MinuteNumber.unmarshal(msg_data)
-
-            elif admin_id == DirectoryBlockSignature.ADMIN_ID:
-                size = DirectoryBlockSignature.MESSAGE_SIZE
-                msg_data, data = data[:size], data[size:]
-                msg = DirectoryBlockSignature.unmarshal(msg_data)
-
-            elif admin_id == MatryoshkaHashReveal.ADMIN_ID:
-                size = MatryoshkaHashReveal.MESSAGE_SIZE
-                msg_data, data = data[:size], data[size:]
-                msg = MatryoshkaHashReveal.unmarshal(msg_data)
-
-            elif admin_id == MatryoshkaHashAddOrReplace.ADMIN_ID:
-                size = MatryoshkaHashAddOrReplace.MESSAGE_SIZE
-                msg_data, data = data[:size], data[size:]
-                msg = MatryoshkaHashAddOrReplace.unmarshal(msg_data)
-
-            elif admin_id == ServerCountIncrease.ADMIN_ID:
-                size = ServerCountIncrease.MESSAGE_SIZE
-                msg_data, data = data[:size], data[size:]
-                msg = ServerCountIncrease.unmarshal(msg_data)
-
-            elif admin_id == AddFederatedServer.ADMIN_ID:
-                size = AddFederatedServer.MESSAGE_SIZE
-                msg_data, data = data[:size], data[size:]
-                msg = AddFederatedServer.unmarshal(msg_data)
-
-            elif admin_id == AddAuditServer.ADMIN_ID:
-                size = AddAuditServer.MESSAGE_SIZE
-                msg_data, data = data[:size], data[size:]
-                msg = AddAuditServer.unmarshal(msg_data)
-
-            elif admin_id == RemoveFederatedServer.ADMIN_ID:
-                size = RemoveFederatedServer.MESSAGE_SIZE
-                msg_data, data = data[:size], data[size:]
-                msg = RemoveFederatedServer.unmarshal(msg_data)
-
-            elif admin_id == AddFederatedServerSigningKey.ADMIN_ID:
-                size = AddFederatedServerSigningKey.MESSAGE_SIZE
-                msg_data, data = data[:size], data[size:]
-                msg = AddFederatedServerSigningKey.unmarshal(msg_data)
-
-            elif admin_id == AddFederatedServerBitcoinAnchorKey.ADMIN_ID:
-                size = AddFederatedServerBitcoinAnchorKey.MESSAGE_SIZE
-                msg_data, data = data[:size], data[size:]
-                msg = AddFederatedServerBitcoinAnchorKey.unmarshal(msg_data)
-
-            elif admin_id == ServerFaultHandoff.ADMIN_ID:
-                msg = ServerFaultHandoff()  # No data on chain for message
-
-            elif admin_id == CoinbaseDescriptor.ADMIN_ID:
-                msg, data = CoinbaseDescriptor.unmarshal_with_remainder(data)
-
-            elif admin_id == CoinbaseDescriptorCancel.ADMIN_ID:
-                msg, data = CoinbaseDescriptorCancel.unmarshal_with_remainder(data)
-
-            elif admin_id == AddAuthorityFactoidAddress.ADMIN_ID:
-                size = AddAuthorityFactoidAddress.MESSAGE_SIZE
-                msg_data, data = data[:size], data[size:]
-                msg = AddAuthorityFactoidAddress.unmarshal(msg_data)
-
-            elif admin_id == AddAuthorityEfficiency.ADMIN_ID:
-                size = AddAuthorityEfficiency.MESSAGE_SIZE
-                msg_data, data = data[:size], data[size:]
-                msg = AddAuthorityFactoidAddress.unmarshal(msg_data)
-
-            elif admin_id <= 0x0E:
-                msg = admin_id
-                print(f"Unsupported admin message type {admin_id} found")
-
-            if msg is not None:
-                messages.append(msg)
+            message_class = ADMIN_MESSAGE_TYPES[admin_id]
+            if message_class is None:
+                # Every defined type (up to 0x0E) has a decoder. An unknown type's size isn't known, so the rest of
+                # the body can't be read past it.
+                raise ValueError(f"Unsupported admin message type {admin_id} found")
+            msg, data = message_class.unmarshal_with_remainder(data)
+            messages.append(msg)
 
         assert len(messages) == message_count, "Unexpected message count"
 
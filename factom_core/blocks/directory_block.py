@@ -1,11 +1,16 @@
+import array
+import bisect
 import hashlib
 import struct
 from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
 
 import factom_core
 from factom_core.utils import merkle
+from factom_core.utils.slots import FieldAccess, slotted
 
 
+@slotted
 @dataclass
 class DirectoryBlockHeader:
     LENGTH = 113
@@ -60,15 +65,25 @@ class DirectoryBlockHeader:
         )
 
 
+@slotted
+@dataclass
+class EntryBlockReference(FieldAccess):
+    """An entry block listed in a directory block body"""
+
+    chain_id: bytes
+    keymr: bytes
+
+
 @dataclass
 class DirectoryBlockBody:
 
     admin_block_lookup_hash: bytes
     entry_credit_block_header_hash: bytes
     factoid_block_keymr: bytes
-    entry_blocks: list = field(default_factory=list)
+    entry_blocks: List[EntryBlockReference] = field(default_factory=list)
 
     _cached_mr: bytes = None
+    _cached_index: Dict[bytes, bytes] = field(default=None, repr=False, compare=False)
 
     def __post_init__(self):
         # TODO: value assertions
@@ -88,8 +103,7 @@ class DirectoryBlockBody:
             self.factoid_block_keymr,
         ]
         for e_block in self.entry_blocks:
-            body_elements.append(e_block.get("chain_id"))
-            body_elements.append(e_block.get("keymr"))
+            body_elements.extend(e_block)
         self._cached_mr = merkle.get_merkle_root(body_elements)
         return self._cached_mr
 
@@ -102,8 +116,8 @@ class DirectoryBlockBody:
         buf.extend(factom_core.blocks.FactoidBlockHeader.CHAIN_ID)
         buf.extend(self.factoid_block_keymr)
         for e_block in self.entry_blocks:
-            buf.extend(e_block.get("chain_id"))
-            buf.extend(e_block.get("keymr"))
+            buf.extend(e_block.chain_id)
+            buf.extend(e_block.keymr)
         return bytes(buf)
 
     @classmethod
@@ -128,7 +142,7 @@ class DirectoryBlockBody:
         for i in range(block_count - 3):
             entry_block_chain_id, data = data[:32], data[32:]
             entry_block_keymr, data = data[:32], data[32:]
-            entry_blocks.append({"chain_id": entry_block_chain_id, "keymr": entry_block_keymr})
+            entry_blocks.append(EntryBlockReference(entry_block_chain_id, entry_block_keymr))
         return (
             DirectoryBlockBody(
                 admin_block_lookup_hash=admin_block_lookup_hash,
@@ -139,6 +153,12 @@ class DirectoryBlockBody:
             data,
         )
 
+    def keymr_for(self, chain_id: bytes) -> Optional[bytes]:
+        """The keymr of the entry block for `chain_id` listed in this body, if any, from an index built on first use"""
+        if self._cached_index is None:
+            self._cached_index = {e_block.chain_id: e_block.keymr for e_block in self.entry_blocks}
+        return self._cached_index.get(chain_id)
+
     def construct_header(
         self, network_id: bytes, prev_keymr: bytes, prev_full_hash: bytes, timestamp: int, height: int,
     ) -> DirectoryBlockHeader:
@@ -153,6 +173,120 @@ class DirectoryBlockBody:
         )
 
 
+class EntryBlockTable(Sequence[EntryBlockReference]):
+    def __init__(self, data: bytes):
+        """
+        A directory block's entry block references, stored column-wise in the layout they're marshalled in: one
+        contiguous buffer of 64 byte (chain id, keymr) records
+
+        References are sliced out of the buffer when accessed. Looking one up by chain id bisects a sorted index of
+        record positions (4 bytes per record), built on first use.
+        """
+        assert len(data) % 64 == 0, "Entry block table must be a whole number of 64 byte records"
+        self.raw = bytes(data)
+        self._sorted: array.array = None
+
+    def __len__(self):
+        return len(self.raw) // 64
+
+    def __getitem__(self, i: int) -> EntryBlockReference:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("entry block index out of range")
+        offset = i * 64
+        return EntryBlockReference(self.raw[offset : offset + 32], self.raw[offset + 32 : offset + 64])
+
+    def __eq__(self, other):
+        if isinstance(other, EntryBlockTable):
+            return self.raw == other.raw
+        return list(self) == list(other)
+
+    def chain_id(self, i: int) -> bytes:
+        return self.raw[i * 64 : i * 64 + 32]
+
+    def keymr_for(self, chain_id: bytes) -> Optional[bytes]:
+        """The keymr of the entry block for `chain_id` listed in this table, if any, in O(log n)"""
+        if self._sorted is None:
+            self._sorted = array.array("I", sorted(range(len(self)), key=self.chain_id))
+        sorted_chain_ids = _SortedChainIds(self)
+        k = bisect.bisect_left(sorted_chain_ids, chain_id)
+        if k == len(sorted_chain_ids) or sorted_chain_ids[k] != chain_id:
+            return None
+        offset = self._sorted[k] * 64
+        return self.raw[offset + 32 : offset + 64]
+
+
+class _SortedChainIds:
+    """The chain ids of an EntryBlockTable in sorted order, as a sequence bisect can search"""
+
+    def __init__(self, table: EntryBlockTable):
+        self.table = table
+
+    def __len__(self):
+        return len(self.table._sorted)
+
+    def __getitem__(self, k: int) -> bytes:
+        return self.table.chain_id(self.table._sorted[k])
+
+
+@dataclass
+class ColumnarDirectoryBlockBody(DirectoryBlockBody):
+    """
+    A DirectoryBlockBody holding its entry block references in an EntryBlockTable, for directory blocks listing tens
+    of thousands of entry blocks. Decoding copies the references in one slice, and marshalling writes them back as is.
+    """
+
+    entry_blocks: EntryBlockTable = field(default_factory=lambda: EntryBlockTable(b""))
+
+    @property
+    def merkle_root(self):
+        if self._cached_mr is not None:
+            return self._cached_mr
+
+        raw = self.entry_blocks.raw
+        body_elements = [
+            factom_core.blocks.AdminBlockHeader.CHAIN_ID,
+            self.admin_block_lookup_hash,
+            factom_core.blocks.EntryCreditBlockHeader.CHAIN_ID,
+            self.entry_credit_block_header_hash,
+            factom_core.blocks.FactoidBlockHeader.CHAIN_ID,
+            self.factoid_block_keymr,
+        ]
+        body_elements.extend(raw[i : i + 32] for i in range(0, len(raw), 32))
+        self._cached_mr = merkle.get_merkle_root(body_elements)
+        return self._cached_mr
+
+    def marshal(self):
+        buf = bytearray()
+        buf.extend(factom_core.blocks.AdminBlockHeader.CHAIN_ID)
+        buf.extend(self.admin_block_lookup_hash)
+        buf.extend(factom_core.blocks.EntryCreditBlockHeader.CHAIN_ID)
+        buf.extend(self.entry_credit_block_header_hash)
+        buf.extend(factom_core.blocks.FactoidBlockHeader.CHAIN_ID)
+        buf.extend(self.factoid_block_keymr)
+        buf.extend(self.entry_blocks.raw)
+        return bytes(buf)
+
+    @classmethod
+    def unmarshal_with_remainder(cls, raw: bytes, block_count: int):
+        body, data = DirectoryBlockBody.unmarshal_with_remainder(raw[: 6 * 32], 3)
+        size = (block_count - 3) * 64
+        entry_blocks, data = EntryBlockTable(raw[6 * 32 : 6 * 32 + size]), raw[6 * 32 + size :]
+        return (
+            ColumnarDirectoryBlockBody(
+                admin_block_lookup_hash=body.admin_block_lookup_hash,
+                entry_credit_block_header_hash=body.entry_credit_block_header_hash,
+                factoid_block_keymr=body.factoid_block_keymr,
+                entry_blocks=entry_blocks,
+            ),
+            data,
+        )
+
+    def keymr_for(self, chain_id: bytes) -> Optional[bytes]:
+        return self.entry_blocks.keymr_for(chain_id)
+
+
 @dataclass
 class DirectoryBlock:
 
@@ -190,7 +324,7 @@ class DirectoryBlock:
         return bytes(buf)
 
     @classmethod
-    def unmarshal(cls, raw: bytes):
+    def unmarshal(cls, raw: bytes, columnar: bool = False):
         """Returns a new DirectoryBlock object, unmarshalling given bytes according to:
         https://github.com/FactomProject/FactomDocs/blob/master/factomDataStructureDetails.md#directory-block
 
@@ -198,21 +332,28 @@ class DirectoryBlock:
 
         DirectoryBlock created will not include contextual metadata, such as anchor information or the pointer to the
         next directory block.
+
+        :param columnar: decode the body as a ColumnarDirectoryBlockBody
         """
-        block, data = cls.unmarshal_with_remainder(raw)
+        block, data = cls.unmarshal_with_remainder(raw, columnar)
         assert len(data) == 0, "Extra bytes remaining!"
         return block
 
     @classmethod
-    def unmarshal_with_remainder(cls, raw: bytes):
+    def unmarshal_with_remainder(cls, raw: bytes, columnar: bool = False):
         header_data, data = (
             raw[: DirectoryBlockHeader.LENGTH],
             raw[DirectoryBlockHeader.LENGTH :],
         )
         header = DirectoryBlockHeader.unmarshal(header_data)
-        body, data = DirectoryBlockBody.unmarshal_with_remainder(data, header.block_count)
+        body_class = ColumnarDirectoryBlockBody if columnar else DirectoryBlockBody
+        body, data = body_class.unmarshal_with_remainder(data, header.block_count)
         return DirectoryBlock(header=header, body=body), data
 
+    def find_entry_block(self, chain_id: bytes) -> Optional[bytes]:
+        """Returns the keymr of the entry block this directory block includes for `chain_id`, or None if it has none"""
+        return self.body.keymr_for(chain_id)
+
     def to_dict(self):
         return {
             "keymr": self.keymr.hex(),
@@ -226,7 +367,7 @@ class DirectoryBlock:
             "entry_credit_block_header_hash": self.body.entry_credit_block_header_hash.hex(),
             "factoid_block_keymr": self.body.factoid_block_keymr.hex(),
             "entry_blocks": [
-                {"chain_id": entry_block.get("chain_id").hex(), "keymr": entry_block.get("keymr").hex(),}
+                {"chain_id": entry_block.chain_id.hex(), "keymr": entry_block.keymr.hex()}
                 for entry_block in self.body.entry_blocks
             ],
         }
@@ -4,9 +4,11 @@ from dataclasses import dataclass
 from typing import Dict, List
 
 from factom_core.utils import merkle
+from factom_core.utils.slots import slotted
 from .directory_block import DirectoryBlock
 
 
+@slotted
 @dataclass
 class EntryBlockHeader:
     LENGTH = 140
@@ -118,9 +120,10 @@ class EntryBlockBody:
         Creates an returns an EntryBlockHeader for this body object, given the specified contextual
         parameters.
         """
+        # The count includes the minute markers
         entry_count = 0
         for hashes in self.entry_hashes.values():
-            entry_count += len(hashes)
+            entry_count += len(hashes) + 1
         return EntryBlockHeader(
             chain_id=chain_id,
             body_mr=self.merkle_root,
@@ -7,12 +7,14 @@ from factom_core.block_elements.balance_increase import BalanceIncrease
 from factom_core.block_elements.chain_commit import ChainCommit
 from factom_core.block_elements.entry_commit import EntryCommit
 from factom_core.utils import varint
+from factom_core.utils.slots import slotted
 from .directory_block import DirectoryBlock
 
 
 ECIDTypes = Union[ChainCommit, EntryCommit, int]
 
 
+@slotted
 @dataclass
 class EntryCreditBlockHeader:
 
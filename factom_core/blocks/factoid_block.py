@@ -5,9 +5,11 @@ from typing import Dict, List
 
 from factom_core.block_elements.factoid_transaction import FactoidTransaction
 from factom_core.utils import merkle, varint
+from factom_core.utils.slots import slotted
 from .directory_block import DirectoryBlock
 
 
+@slotted
 @dataclass
 class FactoidBlockHeader:
 
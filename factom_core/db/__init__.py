@@ -1 +1,6 @@
-from factom_core.db.leveldb import FactomdLevelDB
+from factom_core.db.authorities import AuthoritySet
+from factom_core.db.balances import BalanceLedger, EntryCreditBalanceLedger, FactoidBalanceLedger
+from factom_core.db.chain_heads import ChainHeadTable
+from factom_core.db.leveldb import AddressTransaction, ChainHeadLink, FactomdLevelDB
+from factom_core.db.pruning import Pruner
+from factom_core.db.read_service import ReadServer, RemoteDB, connect
@@ -0,0 +1,119 @@
+import struct
+from typing import Dict, List, Optional, Set, Union
+
+import plyvel
+
+import factom_core.blocks as blocks
+from factom_core.block_elements import admin_messages
+from factom_core.block_elements.admin_messages import (
+    AddFederatedServer,
+    AddFederatedServerSigningKey,
+    RemoveFederatedServer,
+)
+
+AuthorityChange = Union[AddFederatedServer, AddFederatedServerSigningKey, RemoveFederatedServer]
+
+
+class AuthoritySet:
+    def __init__(
+        self,
+        federated: Set[bytes] = None,
+        signing_keys: Dict[bytes, bytes] = None,
+        pending: List[AuthorityChange] = None,
+    ):
+        """
+        The federated servers as of the last block applied, and the keys they sign Directory Blocks with
+
+        Admin blocks add and remove federated servers and replace their signing keys, each change taking effect for
+        the blocks after its activation height. Until a network has any federated servers, its blocks are signed by
+        the `bootstrap_key` (set by the blockchain, it isn't stored), as are those of a federated server that has no
+        signing key of its own yet: the bootstrap identity added by a genesis admin block.
+
+        :param federated: the identity chain ids of the federated servers
+        :param signing_keys: identity chain id --> its current block signing key
+        :param pending: changes waiting for their activation height
+        """
+        self.federated: Set[bytes] = set() if federated is None else federated
+        self.signing_keys: Dict[bytes, bytes] = {} if signing_keys is None else signing_keys
+        self.pending: List[AuthorityChange] = [] if pending is None else pending
+        self.bootstrap_key: Optional[bytes] = None
+        self.dirty = False
+
+    @classmethod
+    def load(cls, db: plyvel.DB, key: bytes):
+        raw = db.get(key)
+        return cls() if raw is None else cls.unmarshal(raw)
+
+    def keys(self) -> Set[bytes]:
+        """The public keys that may sign the next Directory Block, empty if none are known"""
+        if len(self.federated) == 0:
+            return set() if self.bootstrap_key is None else {self.bootstrap_key}
+        keys = {self.signing_keys.get(chain_id, self.bootstrap_key) for chain_id in self.federated}
+        keys.discard(None)
+        return keys
+
+    def quorum(self) -> int:
+        """The number of distinct keys that must sign a Directory Block: a majority of the federated servers"""
+        return max(len(self.federated), 1) // 2 + 1
+
+    def apply_admin_block(self, block: blocks.AdminBlock):
+        """Queue the block's federated server changes, then make those active that are due by the block's height"""
+        for message in block.body.messages:
+            if isinstance(message, (AddFederatedServer, AddFederatedServerSigningKey, RemoveFederatedServer)):
+                self.pending.append(message)
+                self.dirty = True
+        due = [m for m in self.pending if m.activation_height <= block.header.height]
+        if len(due) == 0:
+            return
+        self.pending = [m for m in self.pending if m.activation_height > block.header.height]
+        for message in due:
+            if isinstance(message, AddFederatedServer):
+                self.federated.add(message.chain_id)
+            elif isinstance(message, RemoveFederatedServer):
+                self.federated.discard(message.chain_id)
+            else:
+                self.signing_keys[message.chain_id] = message.new_public_key
+
+    def write(self, batch, key: bytes):
+        """Add the set to a write batch under `key`, if it changed"""
+        if self.dirty:
+            batch.put(key, self.marshal())
+            self.dirty = False
+
+    def marshal(self) -> bytes:
+        """
+        Marshal the set into the following representation:
+        - 4 bytes number of federated servers, followed by their 32 byte identity chain ids
+        - 4 bytes number of signing keys, followed by each server's 32 byte chain id and 32 byte public key
+        - 4 bytes number of pending changes, followed by each admin message's id byte and its marshalled bytes
+        """
+        buf = bytearray()
+        buf.extend(struct.pack(">I", len(self.federated)))
+        for chain_id in sorted(self.federated):
+            buf.extend(chain_id)
+        buf.extend(struct.pack(">I", len(self.signing_keys)))
+        for chain_id, public_key in sorted(self.signing_keys.items()):
+            buf.extend(chain_id)
+            buf.extend(public_key)
+        buf.extend(struct.pack(">I", len(self.pending)))
+        for message in self.pending:
+            buf.append(message.ADMIN_ID)
+            buf.extend(message.marshal())
+        return bytes(buf)
+
+    @classmethod
+    def unmarshal(cls, raw: bytes):
+        count, data = struct.unpack(">I", raw[:4])[0], raw[4:]
+        federated = {data[i * 32 : (i + 1) * 32] for i in range(count)}
+        data = data[count * 32 :]
+        count, data = struct.unpack(">I", data[:4])[0], data[4:]
+        signing_keys = {data[i * 64 : i * 64 + 32]: data[i * 64 + 32 : (i + 1) * 64] for i in range(count)}
+        data = data[count * 64 :]
+        count, data = struct.unpack(">I", data[:4])[0], data[4:]
+        pending = []
+        for _ in range(count):
+            message_class = admin_messages.ADMIN_MESSAGE_TYPES[data[0]]
+            message, data = message_class.unmarshal_with_remainder(data[1:])
+            pending.append(message)
+        assert len(data) == 0, "Extra bytes remaining!"
+        return cls(federated, signing_keys, pending)
@@ -0,0 +1,180 @@
+import collections
+import multiprocessing
+import struct
+from typing import Dict, Iterable, List, Optional
+
+import plyvel
+
+import factom_core.blocks as blocks
+from factom_core.block_elements import BalanceIncrease, ChainCommit, EntryCommit
+
+HEIGHT_KEY = b"Height"
+
+
+class BalanceLedger:
+    def __init__(self, db: plyvel.DB, prefix: bytes, cache_size: int = 100000):
+        """
+        Address --> balance, kept under a key prefix in LevelDB and updated a block at a time
+
+        Balances read or changed recently are cached in memory (least recently used ones are dropped past
+        `cache_size`), and changes are held until `write` adds them to a write batch, along with the height of the last
+        block applied, so each block's balance changes reach the database in the same atomic commit as the block.
+
+        :param db: the database the balances live in
+        :param prefix: the key prefix of the balances
+        :param cache_size: the number of balances to keep in memory
+        """
+        self._db = db
+        self.prefix = prefix
+        self.cache_size = cache_size
+        self._cache: Dict[bytes, int] = collections.OrderedDict()
+        self._dirty: Dict[bytes, int] = {}
+        raw_height = db.get(prefix + HEIGHT_KEY)
+        self.height: Optional[int] = None if raw_height is None else struct.unpack(">I", raw_height)[0]
+
+    @property
+    def pending(self) -> int:
+        """The number of changed balances not yet written"""
+        return len(self._dirty)
+
+    def get(self, address: bytes) -> int:
+        balance = self._dirty.get(address)
+        if balance is not None:
+            return balance
+        balance = self._cache.get(address)
+        if balance is not None:
+            self._cache.move_to_end(address)
+            return balance
+        raw = self._db.get(self.prefix + address)
+        balance = 0 if raw is None else struct.unpack(">q", raw)[0]
+        self._remember(address, balance)
+        return balance
+
+    def _remember(self, address: bytes, balance: int):
+        self._cache[address] = balance
+        self._cache.move_to_end(address)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def apply(self, height: int, deltas: Dict[bytes, int]):
+        """Add each address' change in balance for the block at `height`, unless that block was already applied"""
+        if self.height is not None and height <= self.height:
+            return
+        for address, delta in deltas.items():
+            balance = self.get(address) + delta
+            self._dirty[address] = balance
+            self._remember(address, balance)
+        self.height = height
+
+    def write(self, batch):
+        """Add the changed balances and the applied height to a write batch of the database, and forget them"""
+        for address, balance in self._dirty.items():
+            batch.put(self.prefix + address, struct.pack(">q", balance))
+        if self.height is not None:
+            batch.put(self.prefix + HEIGHT_KEY, struct.pack(">I", self.height))
+        self._dirty = {}
+
+    def reset(self, height: int, balances: Dict[bytes, int]):
+        """Replace every balance with `balances`, as of the block at `height`"""
+        with self._db.write_batch(transaction=True) as batch:
+            for key in self._db.iterator(prefix=self.prefix, include_value=False):
+                batch.delete(key)
+            for address, balance in balances.items():
+                batch.put(self.prefix + address, struct.pack(">q", balance))
+            batch.put(self.prefix + HEIGHT_KEY, struct.pack(">I", height))
+        self._cache.clear()
+        self._dirty = {}
+        self.height = height
+
+
+class FactoidBalanceLedger(BalanceLedger):
+    """Factoid balances, by factoid address (RCD hash), in factoshis"""
+
+    @staticmethod
+    def deltas(block: blocks.FactoidBlock) -> Dict[bytes, int]:
+        """Each factoid address' change in balance over the block: outputs received less inputs spent"""
+        deltas = collections.defaultdict(int)
+        for transactions in block.body.transactions.values():
+            for tx in transactions:
+                for i in tx.inputs:
+                    deltas[i.fct_address] -= i.value
+                for o in tx.outputs:
+                    deltas[o.fct_address] += o.value
+        return deltas
+
+    def apply_block(self, block: blocks.FactoidBlock):
+        self.apply(block.header.height, self.deltas(block))
+
+
+class EntryCreditBalanceLedger(BalanceLedger):
+    """Entry credit balances, by entry credit public key, in entry credits"""
+
+    @staticmethod
+    def deltas(block: blocks.EntryCreditBlock) -> Dict[bytes, int]:
+        """Each entry credit key's change in balance over the block: credits purchased less credits spent on commits"""
+        deltas = collections.defaultdict(int)
+        for objects in block.body.objects.values():
+            for o in objects:
+                if isinstance(o, BalanceIncrease):
+                    deltas[o.ec_public_key] += o.quantity
+                elif isinstance(o, (ChainCommit, EntryCommit)):
+                    deltas[o.ec_public_key] -= o.ec_spent
+        return deltas
+
+    def apply_block(self, block: blocks.EntryCreditBlock):
+        self.apply(block.header.height, self.deltas(block))
+
+
+def sum_factoid_deltas(raw_blocks: List[bytes]) -> Dict[bytes, int]:
+    """Decode a run of marshalled factoid blocks and total their balance changes (run in a rebuild worker)"""
+    totals = collections.Counter()
+    for raw in raw_blocks:
+        totals.update(FactoidBalanceLedger.deltas(blocks.FactoidBlock.unmarshal(raw)))
+    return totals
+
+
+def sum_entry_credit_deltas(raw_blocks: List[bytes]) -> Dict[bytes, int]:
+    """Decode a run of marshalled entry credit blocks and total their balance changes (run in a rebuild worker)"""
+    totals = collections.Counter()
+    for raw in raw_blocks:
+        totals.update(EntryCreditBalanceLedger.deltas(blocks.EntryCreditBlock.unmarshal(raw)))
+    return totals
+
+
+def rebuild(
+    ledger: BalanceLedger, raw_blocks: Iterable[bytes], sum_deltas, workers: int = None, chunk_size: int = 1000
+) -> int:
+    """
+    Recompute every balance from genesis, decoding blocks in parallel
+
+    Balance changes add up in any order, so height ranges of `chunk_size` blocks are decoded and totalled by separate
+    worker processes and the totals merged as they come back. The raw blocks are read in this process (LevelDB allows a
+    single process to have the database open), and only they and the totals cross the process boundary.
+
+    :param ledger: the ledger to replace
+    :param raw_blocks: every marshalled block, from genesis to the head
+    :param sum_deltas: totals the balance changes over a list of marshalled blocks, must be picklable
+    :param workers: the number of worker processes, defaults to the number of cpus
+    :return: the number of blocks applied
+    """
+    count = 0
+
+    def chunks():
+        nonlocal count
+        chunk = []
+        for raw in raw_blocks:
+            chunk.append(raw)
+            count += 1
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if len(chunk) != 0:
+            yield chunk
+
+    balances = collections.Counter()
+    with multiprocessing.Pool(workers) as pool:
+        for totals in pool.imap_unordered(sum_deltas, chunks()):
+            balances.update(totals)
+    if count != 0:
+        ledger.reset(count - 1, balances)
+    return count
@@ -0,0 +1,59 @@
+import sys
+from typing import Dict, Optional
+
+import plyvel
+
+
+class ChainHeadTable:
+    def __init__(self, heads: Dict[bytes, bytes] = None):
+        """
+        Every chain's head held in memory, so reading one doesn't touch LevelDB
+
+        Heads put with `put` are applied in memory straight away, and also held until `write` adds them to a write
+        batch. Heads written along with their block are only applied in memory, with `update`.
+
+        :param heads: chain id --> head (the keymr, or the lookup hash / header hash for the admin and EC chains)
+        """
+        self._heads: Dict[bytes, bytes] = {} if heads is None else heads
+        self._dirty: Dict[bytes, bytes] = {}
+
+    @classmethod
+    def load(cls, sub_db: plyvel.DB):
+        """Load every head with one scan over the `ChainHead;` prefixed database"""
+        return cls(dict(sub_db.iterator()))
+
+    def __len__(self):
+        return len(self._heads)
+
+    def __contains__(self, chain_id: bytes):
+        return chain_id in self._heads
+
+    @property
+    def pending(self) -> int:
+        """The number of updated heads not yet written"""
+        return len(self._dirty)
+
+    def get(self, chain_id: bytes) -> Optional[bytes]:
+        return self._heads.get(chain_id)
+
+    def put(self, chain_id: bytes, head: bytes):
+        self._heads[chain_id] = head
+        self._dirty[chain_id] = head
+
+    def update(self, chain_id: bytes, head: bytes):
+        """Apply a head that's already in a write batch"""
+        self._heads[chain_id] = head
+        self._dirty.pop(chain_id, None)
+
+    def write(self, batch):
+        """Add the buffered updates to a write batch of the `ChainHead;` prefixed database, and forget them"""
+        for chain_id, head in self._dirty.items():
+            batch.put(chain_id, head)
+        self._dirty = {}
+
+    def memory_usage(self) -> int:
+        """Approximate bytes held by the table: the dict and the key and value objects"""
+        size = sys.getsizeof(self._heads) + sys.getsizeof(self._dirty)
+        for chain_id, head in self._heads.items():
+            size += sys.getsizeof(chain_id) + sys.getsizeof(head)
+        return size
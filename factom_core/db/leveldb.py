@@ -1,14 +1,28 @@
+import contextlib
+import hashlib
 import plyvel
 import os
 import struct
-from typing import List, Tuple, Union
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
 
 import factom_core.blocks as blocks
 import factom_core.block_elements as block_elements
+from factom_core.utils.bloom import BloomFilter
+from .authorities import AuthoritySet
+from .balances import (
+    BalanceLedger,
+    EntryCreditBalanceLedger,
+    FactoidBalanceLedger,
+    rebuild,
+    sum_entry_credit_deltas,
+    sum_factoid_deltas,
+)
+from .chain_heads import ChainHeadTable
 
 DIRECTORY_BLOCK = b"DirectoryBlock;"
 DIRECTORY_BLOCK_NUMBER = b"DirectoryBlockNumber;"
 DIRECTORY_BLOCK_SECONDARY = b"DirectoryBlockSecondaryIndex;"
+DIRECTORY_BLOCK_BLOOM = b"DirectoryBlockBloom;"
 
 ADMIN_BLOCK = b"AdminBlock;"
 ADMIN_BLOCK_NUMBER = b"AdminBlockNumber;"
@@ -17,6 +31,7 @@ ADMIN_BLOCK_SECONDARY = b"AdminBlockSecondaryIndex;"
 FACTOID_BLOCK = b"FactoidBlock;"
 FACTOID_BLOCK_NUMBER = b"FactoidBlockNumber;"
 FACTOID_BLOCK_SECONDARY = b"FactoidBlockSecondaryIndex;"
+FACTOID_BLOCK_HEADER = b"FactoidBlockHeader;"  # the headers of pruned factoid blocks
 
 ENTRY_CREDIT_BLOCK = b"EntryCreditBlock;"
 ENTRY_CREDIT_BLOCK_NUMBER = b"EntryCreditBlockNumber;"
@@ -28,6 +43,8 @@ ENTRY_BLOCK = b"EntryBlock;"
 ENTRY_BLOCK_NUMBER = b"EntryBlockNumber;"
 ENTRY_BLOCK_SECONDARY = b"EntryBlockSecondaryIndex;"
 
+ENTRY_BLOCK_BY_CHAIN_HEIGHT = b"EntryBlockByChainHeight;"
+
 ENTRY = b"Entry;"
 
 DIR_BLOCK_INFO = b"DirBlockInfo;"
@@ -37,38 +54,172 @@ DIR_BLOCK_INFO_SECONDARY = b"DirBlockInfoSecondaryIndex;"
 
 INCLUDED_IN = b"IncludedIn;"
 
+FACTOID_BALANCE = b"FactoidBalance;"
+ENTRY_CREDIT_BALANCE = b"EntryCreditBalance;"
+
+FACTOID_TRANSACTION = b"FactoidTransaction;"
+FACTOID_ADDRESS_HISTORY = b"FactoidAddressHistory;"
+
 PAID_FOR = b"PaidFor;"
 KEY_VALUE_STORE = b"KeyValueStore;"
 
+AUTHORITY_SET = b"AuthoritySet"  # the federated servers and their signing keys, as of the directory block head
+
 
 FullBlockSet = Tuple[
     blocks.DirectoryBlock, blocks.AdminBlock, blocks.EntryCreditBlock, blocks.FactoidBlock, List[blocks.EntryBlock],
 ]
 
 
+class ChainHeadLink(NamedTuple):
+    """What the next entry block in a chain needs from the current head: its keymr, full hash and sequence"""
+
+    keymr: bytes
+    full_hash: bytes
+    sequence: int
+
+
+class AddressTransaction(NamedTuple):
+    """A factoid transaction in an address' history: the block height, its position in the block, and its tx_id"""
+
+    height: int
+    position: int
+    tx_id: bytes
+
+
+def directory_block_bloom(block: blocks.DirectoryBlock) -> BloomFilter:
+    """A Bloom filter over the chain ids of the entry blocks a directory block includes"""
+    return BloomFilter.for_items(entry_block.chain_id for entry_block in block.body.entry_blocks)
+
+
+def index_entry_blocks(batch, block: blocks.DirectoryBlock):
+    """
+    Add a directory block's entry block index to a write batch of the database:
+        chain id + height --> keymr of the entry block the chain got at that height
+    """
+    height_encoded = struct.pack(">I", block.header.height)
+    for entry_block in block.body.entry_blocks:
+        batch.put(ENTRY_BLOCK_BY_CHAIN_HEIGHT + entry_block.chain_id + height_encoded, entry_block.keymr)
+
+
+def index_factoid_block(batch, block: blocks.FactoidBlock):
+    """
+    Add a factoid block's transaction indexes to a write batch of the database:
+        tx_id --> block keymr + position in the block
+        address + height + position --> tx_id, for every factoid address a transaction spends from or pays to
+    """
+    height_encoded = struct.pack(">I", block.header.height)
+    position = 0
+    for transactions in block.body.transactions.values():
+        for tx in transactions:
+            tx_id = tx.tx_id
+            position_encoded = struct.pack(">I", position)
+            batch.put(FACTOID_TRANSACTION + tx_id, block.keymr + position_encoded)
+            for address in {io.fct_address for io in tx.inputs + tx.outputs}:
+                batch.put(FACTOID_ADDRESS_HISTORY + address + height_encoded + position_encoded, tx_id)
+            position += 1
+
+
 class FactomdLevelDB:
-    def __init__(self, path: str = None, **kwargs):
+    def __init__(self, path: str = None, db: plyvel.DB = None, **kwargs):
         """
         A wrapper around the legacy factomd level-db
 
         :param path: filepath to the factomd leveldb database, defaults to: /$HOME/.factom/hydra/data/
+        :param db: an already open database to wrap instead of opening `path` (or a read-only stand-in for one, like
+            the RemoteDB of another process' ReadServer)
         """
-        if path is None:
-            home = os.getenv("HOME")
-            path = f"{home}/.factom/hydra/data/"
-        self._db = plyvel.DB(path, **kwargs)
+        if db is None:
+            if path is None:
+                home = os.getenv("HOME")
+                path = f"{home}/.factom/hydra/data/"
+            db = plyvel.DB(path, **kwargs)
+        self._db = db
+        self.chain_heads: ChainHeadTable = None
+        self.factoid_balances = FactoidBalanceLedger(self._db, FACTOID_BALANCE)
+        self.entry_credit_balances = EntryCreditBalanceLedger(self._db, ENTRY_CREDIT_BALANCE)
+        self.authorities = AuthoritySet.load(self._db, AUTHORITY_SET)
 
     def close(self):
+        self.commit_chain_heads()
+        self.commit_balances()
+        self.commit_authorities()
         self._db.close()
 
+    def load_chain_heads(self) -> ChainHeadTable:
+        """
+        Load every chain head into memory with one prefix scan. From then on, chain head reads are served from memory.
+        Heads put on their own with `put_chain_head` are buffered until `commit_chain_heads`, the heads of blocks are
+        written with the block.
+        """
+        self.chain_heads = ChainHeadTable.load(self._db.prefixed_db(CHAIN_HEAD))
+        return self.chain_heads
+
+    def commit_chain_heads(self):
+        """Write the buffered chain head updates, if any, in one atomic batch"""
+        if self.chain_heads is None or self.chain_heads.pending == 0:
+            return
+        with self._db.prefixed_db(CHAIN_HEAD).write_batch(transaction=True) as batch:
+            self.chain_heads.write(batch)
+
+    def commit_balances(self):
+        """
+        Write balance changes applied directly to the ledgers, if any, in one atomic batch (those of blocks stored as
+        chain heads are written with the block)
+        """
+        if self.factoid_balances.pending == 0 and self.entry_credit_balances.pending == 0:
+            return
+        with self._db.write_batch(transaction=True) as batch:
+            self.factoid_balances.write(batch)
+            self.entry_credit_balances.write(batch)
+
+    def commit_authorities(self, batch=None):
+        """Write the authority set, if the admin blocks applied since the last commit changed it"""
+        if not self.authorities.dirty:
+            return
+        with self.write_batch(batch) as batch:
+            self.authorities.write(batch, AUTHORITY_SET)
+
+    @contextlib.contextmanager
+    def write_batch(self, batch=None):
+        """
+        A write batch, committed atomically on leaving the context. Given an outer `batch`, it's used instead, so the
+        `put_*` methods taking one can all go into a single batch, and nothing is written until the outer one is.
+        """
+        if batch is not None:
+            yield batch
+            return
+        with self._db.write_batch(transaction=True) as batch:
+            yield batch
+
+    def _rebuild_balances(
+        self, ledger: BalanceLedger, number_prefix: bytes, block_prefix: bytes, sum_deltas, workers: int = None
+    ) -> int:
+        self.commit_balances()
+        with self._db.snapshot() as snapshot:
+            block_ids = snapshot.iterator(prefix=number_prefix, include_key=False)
+            raw_blocks = (snapshot.get(block_prefix + block_id) for block_id in block_ids)
+            return rebuild(ledger, raw_blocks, sum_deltas, workers)
+
     def get_chain_head(self, chain_id: bytes):
+        if self.chain_heads is not None:
+            return self.chain_heads.get(chain_id)
         sub_db = self._db.prefixed_db(CHAIN_HEAD)
         return sub_db.get(chain_id)
 
     def put_chain_head(self, chain_id: bytes, head: bytes):
+        if self.chain_heads is not None:
+            self.chain_heads.put(chain_id, head)
+            return
         sub_db = self._db.prefixed_db(CHAIN_HEAD)
         sub_db.put(chain_id, head)
 
+    def _put_chain_head(self, batch, chain_id: bytes, head: bytes):
+        """Add a chain head to the write batch of the block it points to, and to the in-memory table if loaded"""
+        batch.put(CHAIN_HEAD + chain_id, head)
+        if self.chain_heads is not None:
+            self.chain_heads.update(chain_id, head)
+
     #
     # Directory Block
     #
@@ -94,14 +245,87 @@ class FactomdLevelDB:
         return self.get_directory_block(keymr=prev_keymr)
 
     def put_directory_block(self, block: blocks.DirectoryBlock):
-        sub_db = self._db.prefixed_db(DIRECTORY_BLOCK_NUMBER)
-        sub_db.put(struct.pack(">I", block.header.height), block.keymr)
-        sub_db = self._db.prefixed_db(DIRECTORY_BLOCK)
-        sub_db.put(block.keymr, block.marshal())
+        with self._db.write_batch(transaction=True) as batch:
+            self._put_directory_block(batch, block)
+
+    @staticmethod
+    def _put_directory_block(batch, block: blocks.DirectoryBlock):
+        height_encoded = struct.pack(">I", block.header.height)
+        batch.put(DIRECTORY_BLOCK_NUMBER + height_encoded, block.keymr)
+        batch.put(DIRECTORY_BLOCK + block.keymr, block.marshal())
+        index_entry_blocks(batch, block)
+        batch.put(DIRECTORY_BLOCK_BLOOM + height_encoded, directory_block_bloom(block).marshal())
+
+    def get_directory_block_bloom(self, height: int) -> Union[BloomFilter, None]:
+        raw = self._db.get(DIRECTORY_BLOCK_BLOOM + struct.pack(">I", height))
+        return None if raw is None else BloomFilter.unmarshal(raw)
+
+    def iter_directory_blocks(
+        self, start: int = 0, stop: int = None, chain_id: bytes = None
+    ) -> Iterator[blocks.DirectoryBlock]:
+        """
+        Yield the directory blocks with a height in range(start, stop) (to the head if `stop` is None), in order
+
+        :param chain_id: only yield the directory blocks including an entry block for this chain. Blocks whose Bloom
+            filter rules the chain out are skipped without being read or decoded.
+        """
+        start_key = DIRECTORY_BLOCK_NUMBER + struct.pack(">I", start)
+        stop_key = DIRECTORY_BLOCK_NUMBER + (b"\xff" * 5 if stop is None else struct.pack(">I", stop))
+        with self._db.snapshot() as snapshot:
+            for key, keymr in snapshot.iterator(start=start_key, stop=stop_key):
+                height_encoded = key[len(DIRECTORY_BLOCK_NUMBER) :]
+                if chain_id is not None:
+                    raw_bloom = snapshot.get(DIRECTORY_BLOCK_BLOOM + height_encoded)
+                    if raw_bloom is not None and chain_id not in BloomFilter.unmarshal(raw_bloom):
+                        continue
+                block = blocks.DirectoryBlock.unmarshal(snapshot.get(DIRECTORY_BLOCK + keymr))
+                if chain_id is None or block.find_entry_block(chain_id) is not None:
+                    yield block
+
+    def rebuild_directory_block_blooms(self, batch_size: int = 1000) -> int:
+        """
+        Write the chain id Bloom filter of every directory block already stored, streaming the blocks in height order
+        and writing the filters `batch_size` blocks at a time
 
-    def put_directory_block_head(self, block: blocks.DirectoryBlock):
-        self.put_directory_block(block)
-        self.put_chain_head(block.header.CHAIN_ID, block.keymr)
+        :return: the number of directory blocks
+        """
+        count = 0
+        with self._db.snapshot() as snapshot:
+            batch = self._db.write_batch()
+            for keymr in snapshot.iterator(prefix=DIRECTORY_BLOCK_NUMBER, include_key=False):
+                block = blocks.DirectoryBlock.unmarshal(snapshot.get(DIRECTORY_BLOCK + keymr))
+                height_encoded = struct.pack(">I", block.header.height)
+                batch.put(DIRECTORY_BLOCK_BLOOM + height_encoded, directory_block_bloom(block).marshal())
+                count += 1
+                if count % batch_size == 0:
+                    batch.write()
+                    batch = self._db.write_batch()
+            batch.write()
+        return count
+
+    def backfill_entry_block_index(self, batch_size: int = 1000) -> int:
+        """
+        Write the (chain id, height) --> entry block keymr index for every directory block already stored, streaming
+        the blocks in height order and writing the index `batch_size` blocks at a time
+
+        :return: the number of directory blocks indexed
+        """
+        count = 0
+        with self._db.snapshot() as snapshot:
+            batch = self._db.write_batch()
+            for keymr in snapshot.iterator(prefix=DIRECTORY_BLOCK_NUMBER, include_key=False):
+                index_entry_blocks(batch, blocks.DirectoryBlock.unmarshal(snapshot.get(DIRECTORY_BLOCK + keymr)))
+                count += 1
+                if count % batch_size == 0:
+                    batch.write()
+                    batch = self._db.write_batch()
+            batch.write()
+        return count
+
+    def put_directory_block_head(self, block: blocks.DirectoryBlock, batch=None):
+        with self.write_batch(batch) as batch:
+            self._put_directory_block(batch, block)
+            self._put_chain_head(batch, block.header.CHAIN_ID, block.keymr)
 
     #
     # Admin Block
@@ -131,14 +355,18 @@ class FactomdLevelDB:
         return self.get_admin_block(lookup_hash=prev_hash)
 
     def put_admin_block(self, block: blocks.AdminBlock):
-        sub_db = self._db.prefixed_db(ADMIN_BLOCK_NUMBER)
-        sub_db.put(struct.pack(">I", block.header.height), block.lookup_hash)
-        sub_db = self._db.prefixed_db(ADMIN_BLOCK)
-        sub_db.put(block.lookup_hash, block.marshal())
+        with self._db.write_batch(transaction=True) as batch:
+            self._put_admin_block(batch, block)
 
-    def put_admin_block_head(self, block: blocks.AdminBlock):
-        self.put_admin_block(block)
-        self.put_chain_head(block.header.CHAIN_ID, block.lookup_hash)
+    @staticmethod
+    def _put_admin_block(batch, block: blocks.AdminBlock):
+        batch.put(ADMIN_BLOCK_NUMBER + struct.pack(">I", block.header.height), block.lookup_hash)
+        batch.put(ADMIN_BLOCK + block.lookup_hash, block.marshal())
+
+    def put_admin_block_head(self, block: blocks.AdminBlock, batch=None):
+        with self.write_batch(batch) as batch:
+            self._put_admin_block(batch, block)
+            self._put_chain_head(batch, block.header.CHAIN_ID, block.lookup_hash)
 
     #
     # Factoid Block
@@ -161,6 +389,18 @@ class FactomdLevelDB:
         block = blocks.FactoidBlock.unmarshal(raw)
         return block
 
+    def get_factoid_block_header(self, keymr: bytes) -> Union[blocks.FactoidBlockHeader, None]:
+        """Returns a factoid block's header, which is still stored once the block's body has been pruned"""
+        raw = self._db.get(FACTOID_BLOCK + keymr)
+        if raw is not None:
+            return blocks.FactoidBlockHeader.unmarshal_with_remainder(raw)[0]
+        raw = self._db.get(FACTOID_BLOCK_HEADER + keymr)
+        return None if raw is None else blocks.FactoidBlockHeader.unmarshal(raw)
+
+    def has_pruned_factoid_blocks(self) -> bool:
+        """Whether any factoid block has been cut down to its header by the Pruner"""
+        return next(self._db.iterator(prefix=FACTOID_BLOCK_HEADER, include_value=False), None) is not None
+
     def get_factoid_block_head(self) -> Union[blocks.FactoidBlock, None]:
         prev_keymr = self.get_chain_head(blocks.FactoidBlockHeader.CHAIN_ID)
         if prev_keymr is None:
@@ -168,14 +408,96 @@ class FactomdLevelDB:
         return self.get_factoid_block(keymr=prev_keymr)
 
     def put_factoid_block(self, block: blocks.FactoidBlock):
-        sub_db = self._db.prefixed_db(FACTOID_BLOCK_NUMBER)
-        sub_db.put(struct.pack(">I", block.header.height), block.keymr)
-        sub_db = self._db.prefixed_db(FACTOID_BLOCK)
-        sub_db.put(block.keymr, block.marshal())
+        with self._db.write_batch(transaction=True) as batch:
+            self._put_factoid_block(batch, block)
+
+    @staticmethod
+    def _put_factoid_block(batch, block: blocks.FactoidBlock):
+        batch.put(FACTOID_BLOCK_NUMBER + struct.pack(">I", block.header.height), block.keymr)
+        batch.put(FACTOID_BLOCK + block.keymr, block.marshal())
+        index_factoid_block(batch, block)
+
+    def put_factoid_block_head(self, block: blocks.FactoidBlock, batch=None):
+        """Store the block as the factoid chain head, writing its balance changes in the same batch"""
+        self.factoid_balances.apply_block(block)
+        with self.write_batch(batch) as batch:
+            self._put_factoid_block(batch, block)
+            self._put_chain_head(batch, block.header.CHAIN_ID, block.keymr)
+            self.factoid_balances.write(batch)
+
+    def get_factoid_transaction(self, tx_id: bytes) -> Union[block_elements.FactoidTransaction, None]:
+        """Returns the factoid transaction with the given tx_id, read from its block via the transaction index"""
+        location = self._db.get(FACTOID_TRANSACTION + tx_id)
+        if location is None:
+            return None
+        block = self.get_factoid_block(keymr=location[:32])
+        if block is None:
+            return None
+        position = struct.unpack(">I", location[32:])[0]
+        transactions = [tx for txs in block.body.transactions.values() for tx in txs]
+        return transactions[position]
+
+    def get_address_history(
+        self, address: bytes, start_height: int = 0, start_position: int = 0, limit: int = 100
+    ) -> List[AddressTransaction]:
+        """
+        Returns a page of the factoid transactions that spend from or pay to `address` (an RCD hash), oldest first
+
+        :param start_height: the height of the first transaction to return
+        :param start_position: the position in its block of the first transaction to return
+        :param limit: the maximum number of transactions to return. To get the next page, start just after the last
+            transaction returned: at its height and position + 1
+        """
+        prefix = FACTOID_ADDRESS_HISTORY + address
+        start = prefix + struct.pack(">II", start_height, start_position)
+        history = []
+        for key, tx_id in self._db.iterator(start=start, stop=prefix + b"\xff" * 8):
+            if len(history) == limit:
+                break
+            height, position = struct.unpack(">II", key[-8:])
+            history.append(AddressTransaction(height, position, tx_id))
+        return history
+
+    def backfill_factoid_indexes(self, batch_size: int = 1000) -> int:
+        """
+        Write the transaction and address history indexes for every factoid block already stored, streaming the blocks
+        in height order with a range iterator and writing the indexes `batch_size` blocks at a time
 
-    def put_factoid_block_head(self, block: blocks.FactoidBlock):
-        self.put_factoid_block(block)
-        self.put_chain_head(block.header.CHAIN_ID, block.keymr)
+        Factoid blocks cut down to their header by the Pruner are skipped, there are no transactions left to index.
+
+        :return: the number of factoid blocks indexed
+        """
+        count = 0
+        with self._db.snapshot() as snapshot:
+            batch = self._db.write_batch()
+            for keymr in snapshot.iterator(prefix=FACTOID_BLOCK_NUMBER, include_key=False):
+                raw = snapshot.get(FACTOID_BLOCK + keymr)
+                if raw is None:
+                    continue  # pruned
+                index_factoid_block(batch, blocks.FactoidBlock.unmarshal(raw))
+                count += 1
+                if count % batch_size == 0:
+                    batch.write()
+                    batch = self._db.write_batch()
+            batch.write()
+        return count
+
+    def get_factoid_balance(self, address: bytes) -> int:
+        """Returns the balance of a factoid address (RCD hash) in factoshis, as of the factoid block head"""
+        return self.factoid_balances.get(address)
+
+    def rebuild_factoid_balances(self, workers: int = None) -> int:
+        """
+        Recompute every factoid balance by replaying all factoid blocks from genesis, with `workers` processes
+
+        :return: the number of factoid blocks replayed
+        :raises ValueError: if factoid blocks have been pruned, they can't be replayed
+        """
+        if self.has_pruned_factoid_blocks():
+            raise ValueError("Factoid blocks have been pruned down to their headers, balances can't be rebuilt")
+        return self._rebuild_balances(
+            self.factoid_balances, FACTOID_BLOCK_NUMBER, FACTOID_BLOCK, sum_factoid_deltas, workers
+        )
 
     #
     # Entry Credit Block
@@ -205,14 +527,39 @@ class FactomdLevelDB:
         return self.get_entry_credit_block(header_hash=prev_hash)
 
     def put_entry_credit_block(self, block: blocks.EntryCreditBlock):
-        sub_db = self._db.prefixed_db(ENTRY_CREDIT_BLOCK_NUMBER)
-        sub_db.put(struct.pack(">I", block.header.height), block.header_hash)
-        sub_db = self._db.prefixed_db(ENTRY_CREDIT_BLOCK)
-        sub_db.put(block.header_hash, block.marshal())
+        with self._db.write_batch(transaction=True) as batch:
+            self._put_entry_credit_block(batch, block)
+
+    @staticmethod
+    def _put_entry_credit_block(batch, block: blocks.EntryCreditBlock):
+        batch.put(ENTRY_CREDIT_BLOCK_NUMBER + struct.pack(">I", block.header.height), block.header_hash)
+        batch.put(ENTRY_CREDIT_BLOCK + block.header_hash, block.marshal())
+
+    def put_entry_credit_block_head(self, block: blocks.EntryCreditBlock, batch=None):
+        """Store the block as the entry credit chain head, writing its balance changes in the same batch"""
+        self.entry_credit_balances.apply_block(block)
+        with self.write_batch(batch) as batch:
+            self._put_entry_credit_block(batch, block)
+            self._put_chain_head(batch, block.header.CHAIN_ID, block.header_hash)
+            self.entry_credit_balances.write(batch)
+
+    def get_entry_credit_balance(self, ec_public_key: bytes) -> int:
+        """Returns the balance of an entry credit public key in entry credits, as of the entry credit block head"""
+        return self.entry_credit_balances.get(ec_public_key)
+
+    def rebuild_entry_credit_balances(self, workers: int = None) -> int:
+        """
+        Recompute every entry credit balance by replaying all entry credit blocks from genesis, with `workers` processes
 
-    def put_entry_credit_block_head(self, block: blocks.EntryCreditBlock):
-        self.put_entry_credit_block(block)
-        self.put_chain_head(block.header.CHAIN_ID, block.header_hash)
+        :return: the number of entry credit blocks replayed
+        """
+        return self._rebuild_balances(
+            self.entry_credit_balances,
+            ENTRY_CREDIT_BLOCK_NUMBER,
+            ENTRY_CREDIT_BLOCK,
+            sum_entry_credit_deltas,
+            workers,
+        )
 
     #
     # Entry Block
@@ -232,13 +579,52 @@ class FactomdLevelDB:
             return None
         return self.get_entry_block(prev_keymr)
 
+    def get_entry_block_keymr(self, chain_id: bytes, height: int) -> Union[bytes, None]:
+        """
+        Returns the keymr of the entry block `chain_id` got in the directory block at `height`, or None if it got none
+
+        Served from the (chain id, height) index written alongside each directory block, so neither the directory block
+        nor the chain needs to be read.
+        """
+        sub_db = self._db.prefixed_db(ENTRY_BLOCK_BY_CHAIN_HEIGHT)
+        return sub_db.get(chain_id + struct.pack(">I", height))
+
+    def get_chain_head_links(self, chain_ids: List[bytes]) -> Dict[bytes, Optional[ChainHeadLink]]:
+        """
+        Read what's needed to link a new entry block onto each chain's head, for many chains at once
+
+        All reads are made against one snapshot (or memory, for the heads once loaded), and the head entry blocks
+        aren't unmarshalled: the keymr is the chain head itself, the full hash is the hash of the stored bytes, and the
+        sequence is read from the header.
+
+        :return: chain id --> ChainHeadLink, for the chains that have a head. None for a chain whose head entry block
+            isn't stored (left out by a sync filter, or pruned), so it can't be linked onto.
+        """
+        links = {}
+        with self._db.snapshot() as snapshot:
+            for chain_id in chain_ids:
+                if self.chain_heads is not None:
+                    keymr = self.chain_heads.get(chain_id)
+                else:
+                    keymr = snapshot.get(CHAIN_HEAD + chain_id)
+                if keymr is None:
+                    continue
+                raw = snapshot.get(ENTRY_BLOCK + keymr)
+                if raw is None:
+                    links[chain_id] = None
+                    continue
+                sequence = struct.unpack(">I", raw[128:132])[0]
+                links[chain_id] = ChainHeadLink(keymr, hashlib.sha256(raw).digest(), sequence)
+        return links
+
     def put_entry_block(self, block: blocks.EntryBlock):
         sub_db = self._db.prefixed_db(ENTRY_BLOCK)
         sub_db.put(block.keymr, block.marshal())
 
-    def put_entry_block_head(self, block: blocks.EntryBlock):
-        self.put_entry_block(block)
-        self.put_chain_head(block.header.chain_id, block.keymr)
+    def put_entry_block_head(self, block: blocks.EntryBlock, batch=None):
+        with self.write_batch(batch) as batch:
+            batch.put(ENTRY_BLOCK + block.keymr, block.marshal())
+            self._put_chain_head(batch, block.header.chain_id, block.keymr)
 
     #
     # Entry
@@ -252,8 +638,7 @@ class FactomdLevelDB:
         raw = self._db.get(chain_id + b";" + entry_hash)
         return None if raw is None else block_elements.Entry.unmarshal(raw)
 
-    def put_entry(self, entry: block_elements.Entry):
-        sub_db = self._db.prefixed_db(ENTRY)
-        sub_db.put(entry.entry_hash, entry.chain_id)
-        sub_db = self._db.prefixed_db(entry.chain_id + ";".encode())
-        sub_db.put(entry.entry_hash, entry.marshal())
+    def put_entry(self, entry: block_elements.Entry, batch=None):
+        with self.write_batch(batch) as batch:
+            batch.put(ENTRY + entry.entry_hash, entry.chain_id)
+            batch.put(entry.chain_id + b";" + entry.entry_hash, entry.marshal())
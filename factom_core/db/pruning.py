@@ -0,0 +1,213 @@
+import struct
+import threading
+from typing import Dict, List, Optional
+
+import factom_core.blocks as blocks
+from factom_core.utils.filters import SyncFilter
+from .leveldb import (
+    DIRECTORY_BLOCK,
+    DIRECTORY_BLOCK_NUMBER,
+    ENTRY,
+    ENTRY_BLOCK,
+    ENTRY_BLOCK_BY_CHAIN_HEIGHT,
+    FACTOID_BLOCK,
+    FACTOID_BLOCK_HEADER,
+    FACTOID_BLOCK_NUMBER,
+    FactomdLevelDB,
+)
+
+PRUNED_HEIGHT = b"Pruner;PrunedHeight"  # the next directory block height to prune everything older than `keep_blocks`
+FILTERED_HEIGHT = b"Pruner;FilteredHeight"  # the next directory block height to prune chains outside `keep_chains`
+
+
+class Pruner:
+    def __init__(
+        self,
+        db: FactomdLevelDB,
+        keep_blocks: int = None,
+        keep_chains: SyncFilter = None,
+        prune_factoid_blocks: bool = False,
+        batch_size: int = 10000,
+    ):
+        """
+        Deletes old or unwanted entry data a bounded batch at a time, keeping what's needed to prove the rest
+
+        Entries (the `Entry;` index and the `<chain_id>;` payloads) are deleted if they're in a directory block more
+        than `keep_blocks` below the head, or their chain is rejected by `keep_chains`. Directory blocks, entry blocks
+        and the other block headers are kept, so the merkle roots and entry hashes linking every remaining entry to a
+        directory block stay in place. An entry revealed again in a block that's still kept (a repeat entry) stays
+        until that block is old enough too, found through the `EntryBlockByChainHeight;` index. With
+        `prune_factoid_blocks`, factoid blocks older than `keep_blocks` are cut down to their header.
+
+        Progress is stored in the database with each batch, so pruning picks up where it left off after a restart.
+        Pruned factoid blocks can't be replayed, so rebuild balances and indexes before pruning them. Likewise, on a
+        database written before the `EntryBlockByChainHeight;` index was, run backfill_entry_block_index first.
+
+        :param db: the database to prune
+        :param keep_blocks: the number of most recent directory blocks to keep everything for (None keeps every block)
+        :param keep_chains: the chains to keep entries for, beyond the most recent `keep_blocks` (None keeps all)
+        :param prune_factoid_blocks: whether to also cut factoid blocks older than `keep_blocks` down to their header
+        :param batch_size: the number of deletions to aim for in each write batch
+        """
+        assert keep_blocks is not None or keep_chains is not None, "Nothing to prune without keep_blocks or keep_chains"
+        self.db = db
+        self.keep_blocks = keep_blocks
+        self.keep_chains = keep_chains
+        self.prune_factoid_blocks = prune_factoid_blocks
+        self.batch_size = batch_size
+        self.pruned_height = self._load(PRUNED_HEIGHT)
+        self.filtered_height = self._load(FILTERED_HEIGHT)
+        self._deleted_ranges: Dict[bytes, List[bytes]] = {}  # key prefix --> [lowest, highest] key deleted under it
+        # chain id --> entry hash --> the highest height it is in, of the blocks read so far (see `_kept_heights`)
+        self._kept: Dict[bytes, Dict[bytes, int]] = {}
+        self._kept_scanned: Dict[bytes, int] = {}  # chain id --> the next height to read into `_kept`
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def _load(self, key: bytes) -> int:
+        raw = self.db._db.get(key)
+        return 0 if raw is None else struct.unpack(">I", raw)[0]
+
+    def _targets(self):
+        """The heights the two passes may prune up to (exclusive), given the current head"""
+        head = self.db.get_chain_head(blocks.DirectoryBlockHeader.CHAIN_ID)
+        if head is None:
+            return 0, 0
+        head_height = self.db.get_directory_block(keymr=head).header.height
+        age_target = 0 if self.keep_blocks is None else max(0, head_height + 1 - self.keep_blocks)
+        filter_target = 0 if self.keep_chains is None else head_height + 1
+        return age_target, filter_target
+
+    def step(self) -> int:
+        """
+        Prune whole directory blocks until about `batch_size` keys are deleted (or nothing is left to prune), and
+        write the deletions and progress in one batch. The key ranges deleted from are noted for `compact`.
+
+        :return: the number of keys deleted
+        """
+        age_target, filter_target = self._targets()
+        deleted = 0
+        batch = self.db._db.write_batch(transaction=True)
+        while deleted < self.batch_size:
+            if self.pruned_height < age_target:
+                deleted += self._prune_block(batch, self.pruned_height, True, age_target)
+                self.pruned_height += 1
+            elif max(self.filtered_height, self.pruned_height) < filter_target:
+                self.filtered_height = max(self.filtered_height, self.pruned_height)
+                deleted += self._prune_block(batch, self.filtered_height, False, age_target)
+                self.filtered_height += 1
+            else:
+                break
+        batch.put(PRUNED_HEIGHT, struct.pack(">I", self.pruned_height))
+        batch.put(FILTERED_HEIGHT, struct.pack(">I", self.filtered_height))
+        batch.write()
+        return deleted
+
+    def compact(self):
+        """Compact the key ranges deleted from since the last compaction, so the space is given back"""
+        for lowest, highest in self._deleted_ranges.values():
+            self.db._db.compact_range(start=lowest, stop=highest + b"\x00")
+        self._deleted_ranges = {}
+
+    def _delete(self, batch, prefix: bytes, key: bytes):
+        batch.delete(prefix + key)
+        deleted_range = self._deleted_ranges.get(prefix)
+        if deleted_range is None:
+            self._deleted_ranges[prefix] = [prefix + key, prefix + key]
+        else:
+            deleted_range[0] = min(deleted_range[0], prefix + key)
+            deleted_range[1] = max(deleted_range[1], prefix + key)
+
+    def _kept_heights(self, chain_id: bytes, age_target: int) -> Dict[bytes, int]:
+        """
+        Entry hash --> the highest height it's in, for the chain's entry blocks that weren't old enough to prune when
+        first read. An entry is kept if that's at least the current age target.
+
+        Each entry block is read once, from the age target when the chain is first pruned, on to the blocks written
+        since, however many steps the chain is pruned over. The cache is dropped once `run` has caught up.
+        """
+        kept = self._kept.setdefault(chain_id, {})
+        prefix = ENTRY_BLOCK_BY_CHAIN_HEIGHT + chain_id
+        start = self._kept_scanned.get(chain_id, age_target)
+        for key, keymr in self.db._db.iterator(start=prefix + struct.pack(">I", start), stop=prefix + b"\xff" * 4):
+            height = struct.unpack(">I", key[-4:])[0]
+            self._kept_scanned[chain_id] = height + 1
+            raw = self.db._db.get(ENTRY_BLOCK + keymr)
+            if raw is not None:
+                entry_block = blocks.EntryBlock.unmarshal(raw)
+                for entry_hashes in entry_block.body.entry_hashes.values():
+                    kept.update(dict.fromkeys(entry_hashes, height))
+        return kept
+
+    def _prune_block(self, batch, height: int, everything: bool, age_target: int) -> int:
+        """
+        Add the deletions for one directory block to the batch, returning how many keys they cover
+
+        :param everything: True for the age pass, which prunes every chain (except for repeat entries). False for the
+            filter pass, which only prunes chains that aren't kept at any height.
+        """
+        height_encoded = struct.pack(">I", height)
+        keymr = self.db._db.get(DIRECTORY_BLOCK_NUMBER + height_encoded)
+        if keymr is None:
+            return 0
+        directory_block = blocks.DirectoryBlock.unmarshal(self.db._db.get(DIRECTORY_BLOCK + keymr))
+        deleted = 0
+        for reference in directory_block.body.entry_blocks:
+            if not everything and self.keep_chains(reference.chain_id):
+                continue
+            raw = self.db._db.get(ENTRY_BLOCK + reference.keymr)
+            if raw is None:
+                continue  # never stored, as in a selective sync
+            entry_block = blocks.EntryBlock.unmarshal(raw)
+            kept = self._kept_heights(reference.chain_id, age_target) if everything else {}
+            chain_prefix = reference.chain_id + b";"
+            for entry_hashes in entry_block.body.entry_hashes.values():
+                for entry_hash in entry_hashes:
+                    if kept.get(entry_hash, -1) >= age_target:
+                        continue  # revealed again since, in a block that's kept
+                    self._delete(batch, ENTRY, entry_hash)
+                    self._delete(batch, chain_prefix, entry_hash)
+                    deleted += 2
+
+        if everything and self.prune_factoid_blocks:
+            factoid_keymr = self.db._db.get(FACTOID_BLOCK_NUMBER + height_encoded)
+            raw = None if factoid_keymr is None else self.db._db.get(FACTOID_BLOCK + factoid_keymr)
+            if raw is not None:
+                header, _ = blocks.FactoidBlockHeader.unmarshal_with_remainder(raw)
+                batch.put(FACTOID_BLOCK_HEADER + factoid_keymr, header.marshal())
+                self._delete(batch, FACTOID_BLOCK, factoid_keymr)
+                deleted += 1
+        return deleted
+
+    def run(self) -> int:
+        """
+        Prune everything currently eligible, a batch at a time, then compact what was deleted. Returns the number of
+        keys deleted.
+        """
+        total = 0
+        while not self._stopped.is_set():
+            deleted = self.step()
+            total += deleted
+            if deleted == 0:
+                break
+        self._kept, self._kept_scanned = {}, {}
+        self.compact()
+        return total
+
+    def start(self, interval: float = 60):
+        """Keep pruning in a background thread, checking for newly eligible blocks every `interval` seconds"""
+
+        def loop():
+            while not self._stopped.is_set():
+                self.run()
+                self._stopped.wait(interval)
+
+        self._stopped.clear()
+        self._thread = threading.Thread(name="pruner", target=loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
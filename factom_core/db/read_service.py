@@ -0,0 +1,256 @@
+"""
+A read-only view of a FactomdLevelDB, served over a Unix socket by the one process that has the database open
+
+LevelDB allows a single process to have a database open, so the node owns it (and makes every write), and the API
+workers read through a ReadServer instead of contending for the lock. Requests and responses are framed with a one
+byte code and a 4 byte big-endian length. Responses come back in request order, so a client may write any number of
+requests before reading their responses (see RemoteDB.multi_get).
+"""
+
+import os
+import socket
+import socketserver
+import struct
+import threading
+from typing import Iterator, List, Optional, Tuple, Union
+
+import plyvel
+
+from .leveldb import FactomdLevelDB
+
+DEFAULT_SOCKET_PATH = f"{os.getenv('HOME')}/.factom/hydra/db.sock"
+
+FRAME_HEADER = struct.Struct(">BI")
+ITERATE_HEADER = struct.Struct(">IH")
+LENGTH = struct.Struct(">I")
+
+# Request codes
+GET = 0
+ITERATE = 1
+
+# Response codes
+FOUND = 0
+NOT_FOUND = 1
+ERROR = 2
+
+ITERATE_CHUNK_SIZE = 1000  # key-value pairs per ITERATE response
+
+READ_ONLY = "A database read through the node's read server is read-only, writes are made by the node"
+
+
+def encode_frame(code: int, payload: bytes) -> bytes:
+    return FRAME_HEADER.pack(code, len(payload)) + payload
+
+
+def prefix_stop(prefix: bytes) -> bytes:
+    """The smallest key greater than every key starting with `prefix` (or b"" for no bound, if there's none)"""
+    stripped = prefix.rstrip(b"\xff")
+    return stripped[:-1] + bytes([stripped[-1] + 1]) if stripped else b""
+
+
+def encode_pairs(pairs: List[Tuple[bytes, bytes]]) -> bytes:
+    return b"".join(LENGTH.pack(len(key)) + key + LENGTH.pack(len(value)) + value for key, value in pairs)
+
+
+def decode_pairs(raw: bytes) -> List[Tuple[bytes, bytes]]:
+    pairs, offset = [], 0
+    while offset < len(raw):
+        key_length = LENGTH.unpack_from(raw, offset)[0]
+        key = raw[offset + 4 : offset + 4 + key_length]
+        offset += 4 + key_length
+        value_length = LENGTH.unpack_from(raw, offset)[0]
+        value = raw[offset + 4 : offset + 4 + value_length]
+        offset += 4 + value_length
+        pairs.append((key, value))
+    return pairs
+
+
+class _ReadRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        db: plyvel.DB = self.server.db
+        while True:
+            header = self.rfile.read(FRAME_HEADER.size)
+            if len(header) != FRAME_HEADER.size:
+                return  # client hung up
+            code, length = FRAME_HEADER.unpack(header)
+            payload = self.rfile.read(length)
+            try:
+                if code == GET:
+                    value = db.get(payload)
+                    response = encode_frame(NOT_FOUND, b"") if value is None else encode_frame(FOUND, value)
+                elif code == ITERATE:
+                    limit, start_length = ITERATE_HEADER.unpack_from(payload)
+                    start = payload[ITERATE_HEADER.size : ITERATE_HEADER.size + start_length]
+                    stop = payload[ITERATE_HEADER.size + start_length :] or None
+                    pairs = []
+                    for pair in db.iterator(start=start, stop=stop):
+                        pairs.append(pair)
+                        if len(pairs) == limit:
+                            break
+                    response = encode_frame(FOUND, encode_pairs(pairs))
+                else:
+                    raise ValueError(f"Unknown request code: {code}")
+            except Exception as e:
+                response = encode_frame(ERROR, str(e).encode())
+            self.wfile.write(response)
+
+
+class ReadServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, db: FactomdLevelDB, path: str = DEFAULT_SOCKET_PATH):
+        """
+        Serves reads of `db` to other processes over a Unix socket at `path`, a thread per connection
+
+        Only reads are served: writes stay with the owning process, which makes them one at a time as blocks are
+        processed. Readers see each block once its write batch is committed, as they would reading LevelDB directly.
+
+        :param db: the database to serve, opened by this process
+        :param path: the filepath of the Unix socket to listen on (replacing any left over from a previous run)
+        """
+        if os.path.exists(path):
+            os.unlink(path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        super().__init__(path, _ReadRequestHandler)
+        os.chmod(path, 0o600)
+        self.db = db._db
+        self.path = path
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Serve in a background thread"""
+        self._thread = threading.Thread(name="read_server", target=self.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        os.unlink(self.path)
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+class RemoteDB:
+    def __init__(self, path: str = DEFAULT_SOCKET_PATH):
+        """
+        The read half of a plyvel.DB, served by a ReadServer in the process that has the database open
+
+        Connects on first use, and again on the next use after a connection fails. There are no snapshots, so reads
+        spanning several keys may see blocks committed in between (blocks are never changed once written, only added).
+        Methods of FactomdLevelDB that take a snapshot or write raise NotImplementedError.
+
+        :param path: the filepath of the ReadServer's Unix socket
+        """
+        self.path = path
+        self._socket: Optional[socket.socket] = None
+        self._rfile = None
+
+    def _connect(self):
+        if self._socket is None:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.connect(self.path)
+            self._rfile = self._socket.makefile("rb")
+
+    def close(self):
+        if self._socket is not None:
+            self._rfile.close()
+            self._socket.close()
+            self._socket, self._rfile = None, None
+
+    def _read_response(self) -> Tuple[int, bytes]:
+        header = self._rfile.read(FRAME_HEADER.size)
+        if len(header) != FRAME_HEADER.size:
+            raise ConnectionError("Read server closed the connection")
+        code, length = FRAME_HEADER.unpack(header)
+        return code, self._rfile.read(length)
+
+    def _request(self, frames: List[bytes]) -> List[Union[bytes, None]]:
+        """Write all the request frames at once, then read their responses in order"""
+        try:
+            self._connect()
+            self._socket.sendall(b"".join(frames))
+            responses = [self._read_response() for _ in frames]
+        except OSError:
+            self.close()
+            raise
+        for code, payload in responses:
+            if code == ERROR:
+                raise ValueError(payload.decode())
+        return [None if code == NOT_FOUND else payload for code, payload in responses]
+
+    def get(self, key: bytes) -> Union[bytes, None]:
+        return self._request([encode_frame(GET, key)])[0]
+
+    def multi_get(self, keys: List[bytes]) -> List[Union[bytes, None]]:
+        """Get many keys with a single round trip, by pipelining the requests"""
+        return self._request([encode_frame(GET, key) for key in keys])
+
+    def iterator(
+        self,
+        start: bytes = None,
+        stop: bytes = None,
+        prefix: bytes = None,
+        include_key: bool = True,
+        include_value: bool = True,
+    ) -> Iterator:
+        """Iterate a key range (or prefix) in order, `ITERATE_CHUNK_SIZE` pairs per round trip, as plyvel.DB does"""
+        if prefix is not None:
+            assert start is None and stop is None, "Can't combine prefix with start or stop"
+            start, stop = prefix, prefix_stop(prefix)
+        start = b"" if start is None else start
+        stop = b"" if stop is None else stop
+        while True:
+            payload = ITERATE_HEADER.pack(ITERATE_CHUNK_SIZE, len(start)) + start + stop
+            pairs = decode_pairs(self._request([encode_frame(ITERATE, payload)])[0])
+            for key, value in pairs:
+                if include_key and include_value:
+                    yield key, value
+                elif include_key:
+                    yield key
+                else:
+                    yield value
+            if len(pairs) < ITERATE_CHUNK_SIZE:
+                return
+            start = pairs[-1][0] + b"\x00"  # the smallest key after the last one returned
+
+    def prefixed_db(self, prefix: bytes):
+        return _PrefixedRemoteDB(self, prefix)
+
+    def snapshot(self):
+        raise NotImplementedError(
+            "A database read through the node's read server has no snapshots, use the node's own FactomdLevelDB"
+        )
+
+    def write_batch(self, **kwargs):
+        raise NotImplementedError(READ_ONLY)
+
+    def put(self, key: bytes, value: bytes):
+        raise NotImplementedError(READ_ONLY)
+
+    def delete(self, key: bytes):
+        raise NotImplementedError(READ_ONLY)
+
+
+class _PrefixedRemoteDB:
+    def __init__(self, db: RemoteDB, prefix: bytes):
+        self.db = db
+        self.prefix = prefix
+
+    def get(self, key: bytes) -> Union[bytes, None]:
+        return self.db.get(self.prefix + key)
+
+    def write_batch(self, **kwargs):
+        raise NotImplementedError(READ_ONLY)
+
+    def put(self, key: bytes, value: bytes):
+        raise NotImplementedError(READ_ONLY)
+
+
+def connect(path: str = DEFAULT_SOCKET_PATH) -> FactomdLevelDB:
+    """A read-only FactomdLevelDB, reading through the ReadServer listening at `path`"""
+    db = FactomdLevelDB(db=RemoteDB(path))
+    # Balances change with every block the owner processes, so don't keep any on this side of the socket
+    db.factoid_balances.cache_size = 0
+    db.entry_credit_balances.cache_size = 0
+    return db
@@ -1,4 +1,4 @@
-from .base import Message, unmarshal_message
+from .base import Message, MESSAGE_TYPES, unmarshal_message, unmarshal_messages
 from .ack import Ack
 from .block_syncing import DirectoryBlockState, DirectoryBlockStateRequest, BlockRequest
 from .entry_syncing import MissingDataRequest, MissingDataResponse
@@ -7,3 +7,4 @@ from .missing_message import MissingMessageRequest, MissingMessageResponse
 from .seals import DirectoryBlockSignature, EndOfMinute
 from .server import AddServer, ChangeServerKey, RemoveServer
 from .transactions import FactoidTransaction, ChainCommit, EntryCommit, EntryReveal
+from .index import MessageIndex
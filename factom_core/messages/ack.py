@@ -131,6 +131,12 @@ class Ack(Message):
             "signature": self.signature.to_dict(),
         }
 
+    def marshal_for_signature(self) -> bytes:
+        return self.raw[: -primitives.FullSignature.LENGTH]
+
+    def validate_signature(self) -> bool:
+        return self.signature.verify(self.marshal_for_signature())
+
     def leader_execute(self, state: Blockchain):
         self.follower_execute(state)
 
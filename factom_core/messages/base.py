@@ -1,8 +1,13 @@
+import hashlib
+import struct
 from dataclasses import dataclass, field
+from typing import Dict, Iterable, List
 
-import factom_core.messages as messages
 from factom_core.blockchains import Blockchain
 
+# Dense lookup table of message TYPE --> Message subclass, filled in as the subclasses are defined
+MESSAGE_TYPES: List[type] = [None] * 256
+
 
 @dataclass
 class Message:
@@ -13,6 +18,11 @@ class Message:
     TYPE = None  # type: int
     is_local: bool = field(init=False, default=False)
 
+    # Wire bytes and their hashes, filled in lazily. Not compared, messages are treated as immutable once hashed.
+    _raw: bytes = field(init=False, default=None, repr=False, compare=False)
+    _hash: bytes = field(init=False, default=None, repr=False, compare=False)
+    _full_hash: bytes = field(init=False, default=None, repr=False, compare=False)
+
     # __slots__ = [
     #     "origin",  # set and examined on each server (not marshalled)
     #     "network_origin",  # hash of the network peer/connection where the message is from
@@ -35,6 +45,16 @@ class Message:
     #     "is_sig_valid",
     # ]
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        msg_type = cls.__dict__.get("TYPE")
+        if msg_type is None:
+            return
+        existing = MESSAGE_TYPES[msg_type]
+        if existing is not None and existing.__qualname__ != cls.__qualname__:
+            raise ValueError(f"Message TYPE {msg_type} already registered to {existing.__name__}")
+        MESSAGE_TYPES[msg_type] = cls
+
     def __post_init__(self):
         if self.TYPE is None:
             raise ValueError("A Message class must be instantiated with a `TYPE`")
@@ -52,65 +72,70 @@ class Message:
     def unmarshal(cls, raw: bytes):
         pass
 
+    @property
+    def raw(self) -> bytes:
+        """The wire bytes of the message: as received if it came through unmarshal_message, else marshalled once"""
+        if self._raw is None:
+            self._raw = self.marshal()
+        return self._raw
+
+    def marshal_for_signature(self) -> bytes:
+        """The part of the wire bytes covered by the message's signature (all of it, for unsigned messages)"""
+        return self.raw
+
+    @property
+    def hash(self) -> bytes:
+        """The message hash, as referred to by an Ack's `message_hash`: sha256 of the signed portion"""
+        if self._hash is None:
+            self._hash = hashlib.sha256(self.marshal_for_signature()).digest()
+        return self._hash
+
+    @property
+    def full_hash(self) -> bytes:
+        """The full message hash, as referred to by an Ack's `full_message_hash`: sha256 of the wire bytes"""
+        if self._full_hash is None:
+            self._full_hash = hashlib.sha256(self.raw).digest()
+        return self._full_hash
+
     def to_dict(self) -> dict:
         return {}
 
 
 def unmarshal_message(raw: bytes):
-    msg_type = raw[0]
-    if msg_type == messages.Ack.TYPE:
-        return messages.Ack.unmarshal(raw)
-
-    elif msg_type == messages.ChainCommit.TYPE:
-        return messages.ChainCommit.unmarshal(raw)
-
-    elif msg_type == messages.EntryCommit.TYPE:
-        return messages.EntryCommit.unmarshal(raw)
-
-    elif msg_type == messages.EntryReveal.TYPE:
-        return messages.EntryReveal.unmarshal(raw)
-
-    elif msg_type == messages.FactoidTransaction.TYPE:
-        return messages.FactoidTransaction.unmarshal(raw)
-
-    elif msg_type == messages.EndOfMinute.TYPE:
-        return messages.EndOfMinute.unmarshal(raw)
-
-    elif msg_type == messages.DirectoryBlockSignature.TYPE:
-        return messages.DirectoryBlockSignature.unmarshal(raw)
-
-    elif msg_type == messages.DirectoryBlockStateRequest.TYPE:
-        return messages.DirectoryBlockStateRequest.unmarshal(raw)
-
-    elif msg_type == messages.DirectoryBlockState.TYPE:
-        return messages.DirectoryBlockState.unmarshal(raw)
-
-    elif msg_type == messages.MissingDataRequest.TYPE:
-        return messages.MissingDataRequest.unmarshal(raw)
-
-    elif msg_type == messages.MissingDataResponse.TYPE:
-        return messages.MissingDataResponse.unmarshal(raw)
-
-    elif msg_type == messages.Heartbeat.TYPE:
-        return messages.Heartbeat.unmarshal(raw)
-
-    elif msg_type == messages.AddServer.TYPE:
-        return messages.AddServer.unmarshal(raw)
-
-    elif msg_type == messages.ChangeServerKey.TYPE:
-        return messages.ChangeServerKey.unmarshal(raw)
-
-    elif msg_type == messages.RemoveServer.TYPE:
-        return messages.RemoveServer.unmarshal(raw)
-
-    elif msg_type == messages.BlockRequest.TYPE:
-        return messages.BlockRequest.unmarshal(raw)
+    message_class = MESSAGE_TYPES[raw[0]]
+    if message_class is None:
+        raise ValueError("Bad message type")
+    msg = message_class.unmarshal(raw)
+    msg._raw = bytes(raw)
+    return msg
 
-    elif msg_type == messages.MissingMessageRequest.TYPE:
-        return messages.MissingMessageRequest.unmarshal(raw)
 
-    elif msg_type == messages.MissingMessageResponse.TYPE:
-        return messages.MissingMessageResponse.unmarshal(raw)
+def unmarshal_messages(raws: Iterable[bytes], skip_invalid: bool = False) -> Dict[int, List[Message]]:
+    """
+    Unmarshal a batch of raw messages, grouped by message type
 
-    else:
-        raise ValueError("Bad message type")
+    :param raws: an iterable of marshalled messages
+    :param skip_invalid: leave out messages that fail to unmarshal, rather than raising
+    :return: a dict of message TYPE --> list of unmarshalled messages of that type, each in the order given
+    """
+    grouped = {}
+    for raw in raws:
+        grouped.setdefault(raw[0], []).append(raw)
+    decoded = {}
+    for msg_type, group in grouped.items():
+        message_class = MESSAGE_TYPES[msg_type]
+        if message_class is None:
+            if skip_invalid:
+                continue
+            raise ValueError("Bad message type")
+        messages = decoded[msg_type] = []
+        for raw in group:
+            try:
+                msg = message_class.unmarshal(raw)
+            except (ValueError, AssertionError, IndexError, struct.error):
+                if skip_invalid:
+                    continue
+                raise
+            msg._raw = bytes(raw)
+            messages.append(msg)
+    return decoded
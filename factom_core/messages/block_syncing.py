@@ -5,14 +5,17 @@ from typing import List
 import factom_core.blockchains.mainnet
 import factom_core.primitives as primitives
 from factom_core.blockchains import Blockchain
+from factom_core.db import AuthoritySet
 from factom_core.blocks import (
     DirectoryBlock,
+    DirectoryBlockHeader,
     AdminBlock,
     FactoidBlock,
     EntryCreditBlock,
     EntryBlock,
 )
 from factom_core.block_elements import Entry
+from factom_core.block_elements import admin_messages
 from factom_core.messages import Message
 
 
@@ -131,12 +134,12 @@ class DirectoryBlockState(Message):
         }
 
     def is_sane(self, state: Blockchain):
-        if None in {
+        if None in (
             self.directory_block,
             self.admin_block,
             self.factoid_block,
             self.entry_credit_block,
-        }:
+        ):
             return False
 
         if self.is_in_database:
@@ -159,9 +162,46 @@ class DirectoryBlockState(Message):
                     return False
         return True
 
-    def is_valid(self):
-        # TODO: dbstate.validate_signatures()
-
+    def follows(self, state: Blockchain) -> bool:
+        """
+        Whether the directory block is the next one on top of the state's head: one block higher, and linked to the head
+        by its previous keymr. With no head yet, only a genesis block follows.
+        """
+        header = self.directory_block.header
+        head_keymr = state.db.get_chain_head(DirectoryBlockHeader.CHAIN_ID)
+        if head_keymr is None:
+            return header.height == 0
+        head = state.db.get_directory_block(keymr=head_keymr)
+        return header.height == head.header.height + 1 and header.prev_keymr == head_keymr
+
+    def validate_signatures(self, authorities: AuthoritySet) -> bool:
+        """
+        Check that a majority of the federated servers signed the Directory Block header: there must be valid
+        signatures by at least a quorum of their distinct current keys. Signatures by other keys, and invalid ones,
+        don't count. With no known signing keys (a network without a bootstrap key, see BaseBlockchain), the
+        signatures can't be checked and are accepted.
+        """
+        keys = authorities.keys()
+        if len(keys) == 0:
+            return True
+        signatures = [s for s in self.signatures if s.public_key in keys]
+        header = self.directory_block.header.marshal()
+        results = primitives.verification.verify_batch((s.public_key, s.signature, header) for s in signatures)
+        signed = {s.public_key for s, is_valid in zip(signatures, results) if is_valid}
+        return len(signed) >= authorities.quorum()
+
+    def validate_admin_signatures(self, previous_header: bytes) -> bool:
+        """Check the admin block's Directory Block signatures against the marshalled header of the previous block"""
+        messages = self.admin_block.body.messages
+        signatures = [m for m in messages if isinstance(m, admin_messages.DirectoryBlockSignature)]
+        items = [(m.signature.public_key, m.signature.signature, previous_header) for m in signatures]
+        return all(primitives.verification.verify_batch(items))
+
+    def is_valid(self, authorities: AuthoritySet) -> bool:
+        return self.validate_signatures(authorities) and self.validate_contents()
+
+    def validate_contents(self) -> bool:
+        """Check the blocks, entry blocks and entries match what the Directory Block claims (but not who signed it)"""
         # Hash checks for all blocks in Directory Block Body
         body = self.directory_block.body
         if body.admin_block_lookup_hash != self.admin_block.lookup_hash:
@@ -196,7 +236,28 @@ class DirectoryBlockState(Message):
         self.follower_execute(state)
 
     def follower_execute(self, state: Blockchain):
-        pass
+        """
+        Store the blocks as the new chain heads, if they're the next ones and signed by a majority of the federated
+        servers. Replays of older blocks, and blocks past a gap, are dropped. With a `sync_filter` on the state, entry
+        blocks and entries of chains it rejects are skipped: the directory block still lists their keymrs, should they
+        be needed later.
+        """
+        if not self.is_sane(state) or not self.follows(state) or not self.is_valid(state.db.authorities):
+            return
+        # One atomic batch, so a crash part way through can't leave the directory block head ahead of the rest
+        with state.db.write_batch() as batch:
+            state.db.put_directory_block_head(self.directory_block, batch)
+            state.db.put_admin_block_head(self.admin_block, batch)
+            state.db.put_entry_credit_block_head(self.entry_credit_block, batch)
+            state.db.put_factoid_block_head(self.factoid_block, batch)
+            for entry_block in self.entry_blocks:
+                if state.sync_filter is None or state.sync_filter(entry_block.header.chain_id):
+                    state.db.put_entry_block_head(entry_block, batch)
+            for entry in self.entries:
+                if state.sync_filter is None or state.sync_filter(entry.chain_id):
+                    state.db.put_entry(entry, batch)
+            state.db.authorities.apply_admin_block(self.admin_block)
+            state.db.commit_authorities(batch)
 
 
 @dataclass
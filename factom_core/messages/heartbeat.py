@@ -71,6 +71,9 @@ class Heartbeat(Message):
             signature=signature,
         )
 
+    def marshal_for_signature(self) -> bytes:
+        return self.raw[: -primitives.FullSignature.LENGTH]
+
     def to_dict(self) -> dict:
         return {
             "timestamp": self.timestamp.hex(),
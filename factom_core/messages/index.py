@@ -0,0 +1,71 @@
+from typing import Dict, Tuple, Union
+
+from .ack import Ack
+from .base import Message
+from .missing_message import MissingMessageResponse
+
+
+class MessageIndex:
+    def __init__(self):
+        """
+        An in-memory index of messages and acks by message hash
+
+        Messages are keyed by their own `hash`, and acks by the `message_hash` they acknowledge, so a message and its
+        ack can be paired in O(1) whichever arrives first. Raw wire bytes are kept on each message, so anything in the
+        index can be sent back out without being marshalled again.
+        """
+        self.messages: Dict[bytes, Message] = {}
+        self.acks: Dict[bytes, Ack] = {}
+
+    def __len__(self):
+        return len(self.messages)
+
+    def __contains__(self, message_hash: bytes) -> bool:
+        return message_hash in self.messages
+
+    def add(self, msg: Message) -> bool:
+        """
+        Index a message (or an ack, by the hash it acknowledges)
+
+        :return: True if it was new to the index, False if it was already there
+        """
+        if isinstance(msg, Ack):
+            index, key = self.acks, msg.message_hash
+        else:
+            index, key = self.messages, msg.hash
+        if key in index:
+            return False
+        index[key] = msg
+        return True
+
+    def get(self, message_hash: bytes) -> Union[Message, None]:
+        return self.messages.get(message_hash)
+
+    def get_ack(self, message_hash: bytes) -> Union[Ack, None]:
+        return self.acks.get(message_hash)
+
+    def pair(self, message_hash: bytes) -> Tuple[Union[Message, None], Union[Ack, None]]:
+        """
+        Return the message and ack for `message_hash`, either of which may not have arrived yet
+
+        An ack whose `full_message_hash` doesn't match the message is not a valid pairing, and is returned as None.
+        """
+        msg, ack = self.messages.get(message_hash), self.acks.get(message_hash)
+        if msg is not None and ack is not None and ack.full_message_hash != msg.full_hash:
+            return msg, None
+        return msg, ack
+
+    def remove(self, message_hash: bytes):
+        self.messages.pop(message_hash, None)
+        self.acks.pop(message_hash, None)
+
+    def clear(self):
+        self.messages.clear()
+        self.acks.clear()
+
+    def missing_message_response(self, message_hash: bytes, timestamp: bytes) -> Union[bytes, None]:
+        """Wire bytes of a MissingMessageResponse for `message_hash`, or None if the message or its ack is unknown"""
+        msg, ack = self.pair(message_hash)
+        if msg is None or ack is None:
+            return None
+        return MissingMessageResponse.marshal_from_raw(timestamp, msg.raw, ack.raw)
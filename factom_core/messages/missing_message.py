@@ -135,6 +135,18 @@ class MissingMessageResponse(Message):
 
         return MissingMessageResponse(timestamp=timestamp)
 
+    @classmethod
+    def marshal_from_raw(cls, timestamp: bytes, message: bytes, ack: bytes) -> bytes:
+        """
+        Assemble a response straight from the wire bytes of the requested message and its ack, without decoding or
+        re-marshalling either:
+        - first byte is the message type (always 19)
+        - next 6 bytes are the timestamp
+        - next bytes are the marshalled message being responded with
+        - next bytes are the marshalled Ack of that message
+        """
+        return bytes([cls.TYPE]) + timestamp + message + ack
+
     def leader_execute(self, state: Blockchain):
         self.follower_execute(state)
 
@@ -52,9 +52,12 @@ class EndOfMinute(Message):
         buf.append(self.TYPE)
         buf.extend(self.timestamp)
         buf.extend(self.chain_id)
+        buf.append(self.minute)
         buf.append(self.vm_index)
+        buf.append(self.factoid_vm)
         buf.extend(struct.pack(">I", self.height))
         buf.extend(struct.pack(">I", self.system_height))
+        buf.extend(self.system_hash)
         buf.append(self.b)
         if self.b > 0:
             buf.extend(self.signature.marshal())
@@ -93,6 +96,9 @@ class EndOfMinute(Message):
             signature=signature,
         )
 
+    def marshal_for_signature(self) -> bytes:
+        return self.raw[: -primitives.FullSignature.LENGTH] if self.b > 0 else self.raw
+
     def to_dict(self) -> dict:
         return {
             "timestamp": self.timestamp.hex(),
@@ -108,10 +114,17 @@ class EndOfMinute(Message):
         }
 
     def leader_execute(self, state: Blockchain):
-        pass
+        self.follower_execute(state)
 
     def follower_execute(self, state: Blockchain):
-        pass
+        """Record that the VM has ended the current minute, and seal the minute once every VM has"""
+        block = state.current_block
+        vm_count = state.vm_count()
+        if self.minute != block.current_minute or self.vm_index >= vm_count:
+            return
+        block.minute_ends.add(self.vm_index)
+        if len(block.minute_ends) == vm_count:
+            state.seal_minute()
 
 
 @dataclass
@@ -204,6 +217,9 @@ class DirectoryBlockSignature(Message):
             signature=signature,
         )
 
+    def marshal_for_signature(self) -> bytes:
+        return self.raw[: -primitives.FullSignature.LENGTH]
+
     def to_dict(self) -> dict:
         return {
             "timestamp": self.timestamp.hex(),
@@ -61,6 +61,9 @@ class AddServer(Message):
             signature=signature,
         )
 
+    def marshal_for_signature(self) -> bytes:
+        return self.raw[: -primitives.FullSignature.LENGTH]
+
     def to_dict(self) -> dict:
         return {
             "timestamp": self.timestamp.hex(),
@@ -150,6 +153,9 @@ class ChangeServerKey(Message):
             signature=signature,
         )
 
+    def marshal_for_signature(self) -> bytes:
+        return self.raw[: -primitives.FullSignature.LENGTH]
+
     def to_dict(self) -> dict:
         return {
             "timestamp": self.timestamp.hex(),
@@ -224,6 +230,9 @@ class RemoveServer(Message):
             signature=signature,
         )
 
+    def marshal_for_signature(self) -> bytes:
+        return self.raw[: -primitives.FullSignature.LENGTH]
+
     def to_dict(self) -> dict:
         return {
             "timestamp": self.timestamp.hex(),
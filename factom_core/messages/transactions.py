@@ -105,6 +105,10 @@ class ChainCommit(Message):
     def to_dict(self) -> dict:
         return {"commit": self.commit.to_dict(), "signature": self.signature.to_dict()}
 
+    def marshal_for_signature(self) -> bytes:
+        """The type byte and the commit (with its own EC signature), without the trailing message signature"""
+        return self.raw[: 1 + block_elements.ChainCommit.BITLENGTH]
+
     def leader_execute(self, state: Blockchain):
         pass
 
@@ -165,6 +169,10 @@ class EntryCommit(Message):
     def to_dict(self) -> dict:
         return {"commit": self.commit.to_dict(), "signature": self.signature.to_dict()}
 
+    def marshal_for_signature(self) -> bytes:
+        """The type byte and the commit (with its own EC signature), without the trailing message signature"""
+        return self.raw[: 1 + block_elements.EntryCommit.BITLENGTH]
+
     def leader_execute(self, state: Blockchain):
         pass
 
@@ -1,9 +1,16 @@
 import struct
 from dataclasses import dataclass
+from typing import List
 
+from factom_core.utils.slots import slotted
+from . import verification
 
+
+@slotted
 @dataclass
 class FullSignature:
+    LENGTH = 96  # marshalled size: 32 byte public key + 64 byte signature
+
     public_key: bytes
     signature: bytes
 
@@ -28,6 +35,10 @@ class FullSignature:
     def to_dict(self):
         return {"public_key": self.public_key.hex(), "signature": self.signature.hex()}
 
+    def verify(self, message: bytes) -> bool:
+        """Return True if this is a valid signature of `message` by `public_key`"""
+        return verification.verify(self.public_key, self.signature, message)
+
 
 class FullSignatureList(list):
     def marshal(self) -> bytes:
@@ -46,3 +57,7 @@ class FullSignatureList(list):
             signatures.append(signature)
         assert len(data) == 0, "Extra bytes remaining!"
         return FullSignatureList(signatures)
+
+    def verify(self, message: bytes) -> List[bool]:
+        """Verify every signature in the list against the same `message`, returning whether each one is valid"""
+        return verification.verify_batch((s.public_key, s.signature, message) for s in self)
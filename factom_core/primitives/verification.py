@@ -0,0 +1,167 @@
+import collections
+import concurrent.futures
+import hashlib
+import multiprocessing
+import threading
+from typing import Iterable, List, Tuple
+
+from factom_keys.fct import FactoidAddress
+
+# Batches with fewer unverified signatures than this are verified in the calling process. Below it, the cost of
+# shipping work to the pool outweighs the extra cores.
+PARALLEL_THRESHOLD = 256
+
+SignatureItem = Tuple[bytes, bytes, bytes]  # (public_key, signature, message)
+
+
+class SignatureCache:
+    def __init__(self, max_size: int = 2 ** 16):
+        """
+        A least recently used set of (public key, message hash, signature) triples that have already been verified
+
+        Re-broadcast messages arrive many times over. Only valid signatures are remembered, so an invalid signature is
+        always checked again, and junk can't push good entries out.
+
+        :param max_size: the maximum number of triples remembered
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(public_key: bytes, signature: bytes, message: bytes) -> Tuple[bytes, bytes, bytes]:
+        return public_key, hashlib.sha256(message).digest(), signature
+
+    def __contains__(self, key: Tuple[bytes, bytes, bytes]) -> bool:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True
+            self.misses += 1
+            return False
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, key: Tuple[bytes, bytes, bytes]):
+        with self._lock:
+            self._entries[key] = None
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+DEFAULT_CACHE = SignatureCache()
+
+_executor = None
+_executor_workers = None
+
+
+def _get_executor(workers: int) -> concurrent.futures.ProcessPoolExecutor:
+    """
+    The verification pool, started on first use. Its workers are spawned rather than forked: by then the node may
+    have LevelDB open and threads running, which a forked child would inherit in whatever state they were in.
+    """
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers != workers:
+        shutdown()
+        _executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        _executor_workers = workers
+    return _executor
+
+
+def shutdown():
+    """Stop the verification process pool, if one was started"""
+    global _executor, _executor_workers
+    if _executor is not None:
+        _executor.shutdown()
+    _executor = None
+    _executor_workers = None
+
+
+def _verify(item: SignatureItem) -> bool:
+    public_key, signature, message = item
+    return FactoidAddress(key_bytes=public_key).verify(signature, message)
+
+
+def _verify_chunk(items: List[SignatureItem]) -> List[bool]:
+    return [_verify(item) for item in items]
+
+
+def verify(public_key: bytes, signature: bytes, message: bytes, cache: SignatureCache = DEFAULT_CACHE) -> bool:
+    """
+    Verify a single Ed25519 signature
+
+    :param public_key: the 32 byte public key of the signer
+    :param signature: the 64 byte signature
+    :param message: the signed message
+    :param cache: the cache of already verified signatures to consult and update, or None to skip it
+    :return: True if the signature is valid for the message and public key, False otherwise
+    """
+    if cache is None:
+        return _verify((public_key, signature, message))
+    key = SignatureCache.key(public_key, signature, message)
+    if key in cache:
+        return True
+    is_valid = _verify((public_key, signature, message))
+    if is_valid:
+        cache.add(key)
+    return is_valid
+
+
+def verify_batch(
+    items: Iterable[SignatureItem],
+    cache: SignatureCache = DEFAULT_CACHE,
+    workers: int = None,
+    parallel_threshold: int = PARALLEL_THRESHOLD,
+) -> List[bool]:
+    """
+    Verify a batch of Ed25519 signatures, fanning out across a process pool when the batch is large
+
+    Signatures found in the cache are not verified again. The rest are verified in this process, or split into one
+    chunk per worker if there are at least `parallel_threshold` of them.
+
+    :param items: an iterable of (public_key, signature, message) tuples
+    :param cache: the cache of already verified signatures to consult and update, or None to skip it
+    :param workers: the number of processes to fan out to, defaults to the number of cpus
+    :param parallel_threshold: the minimum number of uncached signatures worth fanning out
+    :return: a list of booleans, whether each item's signature is valid, in the order given
+    """
+    items = list(items)
+    results = [False] * len(items)
+    pending = []
+    keys = []
+    for i, (public_key, signature, message) in enumerate(items):
+        if cache is not None:
+            key = SignatureCache.key(public_key, signature, message)
+            if key in cache:
+                results[i] = True
+                continue
+            keys.append(key)
+        pending.append(i)
+
+    workers = multiprocessing.cpu_count() if workers is None else workers
+    unverified = [items[i] for i in pending]
+    if workers > 1 and len(unverified) >= parallel_threshold:
+        chunk_size = -(-len(unverified) // workers)
+        chunks = [unverified[i : i + chunk_size] for i in range(0, len(unverified), chunk_size)]
+        verified = [is_valid for chunk in _get_executor(workers).map(_verify_chunk, chunks) for is_valid in chunk]
+    else:
+        verified = _verify_chunk(unverified)
+
+    for n, (i, is_valid) in enumerate(zip(pending, verified)):
+        results[i] = is_valid
+        if is_valid and cache is not None:
+            cache.add(keys[n])
+    return results
@@ -0,0 +1,51 @@
+import hashlib
+import math
+from typing import Iterable, List
+
+
+class BloomFilter:
+    def __init__(self, bits: bytearray, hash_count: int):
+        """
+        A Bloom filter: a compact set that can answer "definitely not present" or "probably present"
+
+        Items are hashed once with sha256, and the `hash_count` bit positions are derived from the digest by double
+        hashing, so an item costs one hash however many positions it sets.
+
+        :param bits: the filter's bit array
+        :param hash_count: the number of bits set per item
+        """
+        self.bits = bits
+        self.hash_count = hash_count
+
+    @classmethod
+    def for_items(cls, items: Iterable[bytes], false_positive_rate: float = 0.01):
+        """A filter holding `items`, sized so that the chance of a false positive is about `false_positive_rate`"""
+        items = list(items)
+        n = max(len(items), 1)
+        bit_count = math.ceil(-n * math.log(false_positive_rate) / math.log(2) ** 2)
+        hash_count = max(1, round(bit_count / n * math.log(2)))
+        bloom = cls(bytearray(math.ceil(bit_count / 8)), hash_count)
+        for item in items:
+            bloom.add(item)
+        return bloom
+
+    def _positions(self, item: bytes) -> List[int]:
+        digest = hashlib.sha256(item).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:16], "big") | 1
+        m = len(self.bits) * 8
+        return [(h1 + i * h2) % m for i in range(self.hash_count)]
+
+    def add(self, item: bytes):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: bytes) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def marshal(self) -> bytes:
+        return bytes([self.hash_count]) + bytes(self.bits)
+
+    @classmethod
+    def unmarshal(cls, raw: bytes):
+        return cls(bytearray(raw[1:]), raw[0])
@@ -1,4 +1,30 @@
+from typing import Callable, Iterable
+
+
 def is_needed_for_syncing(h: bytes):
     identity_prefix = b"\x88\x88\x88"
     exchange_rate_prefix = b"\x11\x11\x11"
     return h.startswith(identity_prefix) or h.startswith(exchange_rate_prefix)
+
+
+class SyncFilter:
+    def __init__(
+        self,
+        allow_list: Iterable[bytes] = (),
+        predicates: Iterable[Callable[[bytes], bool]] = (is_needed_for_syncing,),
+    ):
+        """
+        The chains a selectively syncing node keeps the entry blocks and entries of
+
+        A chain is kept if it's on the allow list or any predicate accepts its chain id. For every other chain, only
+        the entry block keymrs listed in the directory blocks are kept.
+
+        :param allow_list: chain ids to always keep
+        :param predicates: functions of a chain id, returning True if the chain should be kept. Defaults to keeping
+            the identity and exchange rate chains, which a node needs to follow the network.
+        """
+        self.allow_list = set(allow_list)
+        self.predicates = list(predicates)
+
+    def __call__(self, chain_id: bytes) -> bool:
+        return chain_id in self.allow_list or any(predicate(chain_id) for predicate in self.predicates)
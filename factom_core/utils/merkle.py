@@ -25,3 +25,57 @@ def build_merkle_tree(hashes: list):
 def calculate_keymr(header: bytes, body_mr: bytes):
     header_hash = sha256(header).digest()
     return sha256(header_hash + body_mr).digest()
+
+
+class MerkleAccumulator:
+    def __init__(self):
+        """
+        Builds a merkle root one leaf at a time, holding only the roots of the complete subtrees along the right edge
+        of the tree (O(log n) state, O(1) amortized hashing per leaf). The root can be taken at any time, and matches
+        get_merkle_root over the same leaves: odd nodes at any level are paired with themselves.
+        """
+        self.count = 0
+        self._subtrees = []  # root of the complete subtree of 2^level leaves at each level, or None
+
+    def __len__(self):
+        return self.count
+
+    def copy(self):
+        other = MerkleAccumulator()
+        other.count = self.count
+        other._subtrees = list(self._subtrees)
+        return other
+
+    def append(self, leaf: bytes):
+        self.count += 1
+        h = leaf
+        level = 0
+        # Like incrementing a binary counter: every carry merges two complete subtrees into one a level up
+        while not self.count & (1 << level):
+            h = sha256(self._subtrees[level] + h).digest()
+            self._subtrees[level] = None
+            level += 1
+        if level == len(self._subtrees):
+            self._subtrees.append(h)
+        else:
+            self._subtrees[level] = h
+
+    @property
+    def root(self) -> bytes:
+        """The merkle root of the leaves appended so far, or None if there are none"""
+        if self.count == 0:
+            return None
+        count = self.count
+        level = 0
+        while not count & (1 << level):
+            level += 1
+        h = self._subtrees[level]
+        while count != 1 << level:
+            # h is the last node at its level with no sibling, so it's paired with itself
+            h = sha256(h + h).digest()
+            count += 1 << level
+            level += 1
+            while not count & (1 << level):
+                h = sha256(self._subtrees[level] + h).digest()
+                level += 1
+        return h
@@ -0,0 +1,53 @@
+from typing import List, Sequence
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def vm_for_hash(h: bytes, vm_count: int) -> int:
+    """
+    Compute the VM index responsible for hash h
+
+    Taken from: factomd/state/processList.go/VMindexFor(hash []byte)
+    """
+    if vm_count == 0:
+        return 0
+    return sum(h) % vm_count
+
+
+def vm_for_hashes(hashes: List[bytes], vm_count: int, width: int = 32) -> Sequence[int]:
+    """
+    Compute the VM index responsible for each hash in a batch, equivalent to calling vm_for_hash on each
+
+    With NumPy installed, the hashes are joined into one contiguous buffer and their byte sums taken in a single
+    vectorized pass, returning a numpy array. Otherwise (or if the hashes aren't all `width` bytes), returns a list.
+    """
+    if vm_count == 0:
+        return [0] * len(hashes)
+    if numpy is not None and len(hashes) != 0:
+        buf = b"".join(hashes)
+        if len(buf) == len(hashes) * width:
+            sums = numpy.frombuffer(buf, dtype=numpy.uint8).reshape(len(hashes), width).sum(axis=1, dtype=numpy.uint32)
+            return sums % vm_count
+    return [sum(h) % vm_count for h in hashes]
+
+
+def vm_buckets(hashes: List[bytes], vm_count: int, width: int = 32) -> List[List[int]]:
+    """
+    Group a batch of hashes by the VM responsible for them
+
+    :return: a list with one entry per VM, holding the positions in `hashes` routed to it, in their original order
+    """
+    indices = vm_for_hashes(hashes, vm_count, width)
+    if vm_count == 0:
+        return [list(range(len(hashes)))]
+    if numpy is not None and isinstance(indices, numpy.ndarray):
+        order = numpy.argsort(indices, kind="stable")
+        bounds = numpy.cumsum(numpy.bincount(indices, minlength=vm_count))[:-1]
+        return [bucket.tolist() for bucket in numpy.split(order, bounds)]
+    buckets = [[] for _ in range(vm_count)]
+    for position, index in enumerate(indices):
+        buckets[index].append(position)
+    return buckets
@@ -0,0 +1,52 @@
+import dataclasses
+
+
+def slotted(cls):
+    """
+    Rebuild a dataclass with `__slots__` for its fields, so instances carry no per-instance `__dict__`
+
+    Equivalent to `@dataclass(slots=True)` on Python 3.10+. Apply it above `@dataclass`:
+
+        @slotted
+        @dataclass
+        class Thing:
+            ...
+
+    Field defaults keep working (the generated `__init__` holds them), while class constants without annotations
+    stay plain class attributes. Instances can't be given attributes that aren't fields.
+    """
+    field_names = tuple(f.name for f in dataclasses.fields(cls))
+    namespace = dict(cls.__dict__)
+    for name in field_names:
+        namespace.pop(name, None)  # a field's default as a class attribute would shadow its slot
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+    namespace["__slots__"] = field_names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+class FieldAccess:
+    """
+    Dict-style access by field name, for slotted dataclass records that replaced plain dicts
+
+    `record["value"]` reads and writes the field as the dict did, and `record.get("value")` reads it. Iterating over a
+    record yields its field values in order, like a tuple. Subclasses must be `@slotted` dataclasses.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, name: str):
+        if name not in self.__slots__:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def __setitem__(self, name: str, value):
+        if name not in self.__slots__:
+            raise KeyError(name)
+        setattr(self, name, value)
+
+    def get(self, name: str, default=None):
+        return getattr(self, name) if name in self.__slots__ else default
+
+    def __iter__(self):
+        return (getattr(self, name) for name in self.__slots__)
@@ -0,0 +1,3 @@
+from .base import BaseVM, VM
+from .process_list import ProcessList
+from .sharding import MinuteResults, ShardedExecutor
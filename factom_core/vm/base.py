@@ -1,6 +1,71 @@
+import hashlib
+from typing import Dict, List, Tuple
+
+from factom_core.messages import Ack, Message
+
+
 class BaseVM:
     pass
 
 
 class VM(BaseVM):
-    pass
+    def __init__(self, index: int):
+        """
+        A single VM's process list for the current block: an append-only list of acknowledged messages, in process
+        list height order
+
+        Pairs that arrive ahead of the next height are held in `pending` until the gap before them is filled. Each
+        appended ack's serial hash is checked against the running one:
+            - height 0: serial_hash == message_hash
+            - height n: serial_hash == sha256(serial_hash[n - 1] + message_hash)
+
+        :param index: the index of this VM in the block
+        """
+        self.index = index
+        self.messages: List[Message] = []
+        self.acks: List[Ack] = []
+        self.serial_hash: bytes = None
+        self.pending: Dict[int, Tuple[Ack, Message]] = {}
+        self.highest_seen = -1  # highest process list height of any ack seen, paired with its message or not
+        self.rejected = 0  # acks dropped for a serial hash mismatch
+
+    @property
+    def height(self) -> int:
+        """The process list height of the next message to be appended"""
+        return len(self.messages)
+
+    def expected_serial_hash(self, message_hash: bytes) -> bytes:
+        if self.serial_hash is None:
+            return message_hash
+        return hashlib.sha256(self.serial_hash + message_hash).digest()
+
+    def add(self, ack: Ack, msg: Message) -> List[Tuple[Ack, Message]]:
+        """
+        Stage an ack and its message at the ack's process list height, then append as many staged pairs as are now
+        contiguous with the end of the list
+
+        :return: the (ack, message) pairs appended to the process list, in order
+        """
+        height = ack.process_list_height
+        self.highest_seen = max(self.highest_seen, height)
+        if height < self.height or height in self.pending:
+            return []
+        self.pending[height] = (ack, msg)
+
+        appended = []
+        while self.height in self.pending:
+            ack, msg = self.pending.pop(self.height)
+            serial_hash = self.expected_serial_hash(ack.message_hash)
+            if ack.serial_hash != serial_hash:
+                # Can't be appended, the slot stays empty until a valid ack is fetched for it again
+                self.rejected += 1
+                break
+            self.messages.append(msg)
+            self.acks.append(ack)
+            self.serial_hash = serial_hash
+            appended.append((ack, msg))
+        return appended
+
+    def missing_heights(self) -> List[int]:
+        """Process list heights up to the highest ack seen that don't yet have an ack and message pair to append"""
+        return [h for h in range(self.height, self.highest_seen + 1) if h not in self.pending]
@@ -0,0 +1,82 @@
+from typing import Dict, List, Tuple
+
+from factom_core.messages import Ack, Message, MissingMessageRequest
+from .base import VM
+
+# Process list heights asked for per MissingMessageRequest
+MAX_HEIGHTS_PER_REQUEST = 100
+
+
+class ProcessList:
+    def __init__(self, height: int, vm_count: int):
+        """
+        The process lists of every VM for one directory block height
+
+        Messages and acks can arrive in any order. Whichever of the two arrives first waits, keyed by message hash, for
+        the other. Once paired, they're handed to the ack's VM, which appends them in process list height order.
+
+        :param height: the directory block height the process lists are for
+        :param vm_count: the number of VMs (federated servers) in the block
+        """
+        self.height = height
+        self.vms = [VM(i) for i in range(vm_count)]
+        self.messages_waiting: Dict[bytes, Message] = {}  # message hash --> message that arrived before its ack
+        self.acks_waiting: Dict[bytes, Ack] = {}  # message hash --> ack that arrived before its message
+
+    def add_message(self, msg: Message) -> List[Tuple[Ack, Message]]:
+        """
+        Add a message, pairing it with its ack if that has already arrived
+
+        :return: the (ack, message) pairs appended to process lists as a result, in order
+        """
+        ack = self.acks_waiting.pop(msg.hash, None)
+        if ack is None:
+            self.messages_waiting[msg.hash] = msg
+            return []
+        return self.vms[ack.vm_index].add(ack, msg)
+
+    def add_ack(self, ack: Ack) -> List[Tuple[Ack, Message]]:
+        """
+        Add an ack, pairing it with its message if that has already arrived
+
+        Acks for other directory block heights or unknown VMs are ignored.
+
+        :return: the (ack, message) pairs appended to process lists as a result, in order
+        """
+        if ack.height != self.height or ack.vm_index >= len(self.vms):
+            return []
+        vm = self.vms[ack.vm_index]
+        msg = self.messages_waiting.pop(ack.message_hash, None)
+        if msg is None:
+            self.acks_waiting[ack.message_hash] = ack
+            vm.highest_seen = max(vm.highest_seen, ack.process_list_height)
+            return []
+        return vm.add(ack, msg)
+
+    def missing_message_requests(self, timestamp: bytes, asking: bytes, system_height: int = 0):
+        """
+        Build MissingMessageRequests for every gap in the process lists
+
+        A gap is any height below the highest ack seen for a VM that doesn't have both an ack and message staged,
+        including acks still waiting on their message.
+
+        :param timestamp: the 6 byte timestamp for the requests
+        :param asking: the identity chain id of this node
+        :param system_height: the current system height
+        :return: a list of MissingMessageRequest, one per VM with gaps (more if a VM has a lot of them)
+        """
+        requests = []
+        for vm in self.vms:
+            missing = vm.missing_heights()
+            for i in range(0, len(missing), MAX_HEIGHTS_PER_REQUEST):
+                requests.append(
+                    MissingMessageRequest(
+                        timestamp=timestamp,
+                        asking=asking,
+                        vm_index=vm.index,
+                        height=self.height,
+                        system_height=system_height,
+                        process_list_heights=missing[i : i + MAX_HEIGHTS_PER_REQUEST],
+                    )
+                )
+        return requests
@@ -0,0 +1,187 @@
+import multiprocessing
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import factom_core.blocks as blocks
+from factom_core.messages import ChainCommit, EntryCommit, EntryReveal, FactoidTransaction, unmarshal_message
+from factom_core.utils import routing
+
+# Message types whose routing hash sits at raw[8:40]: the chain id of an entry reveal, the entry hash of an entry
+# commit, and the chain id hash of a chain commit (1 byte type, then 6 byte timestamp or 1 byte version + 6 byte
+# timestamp, then 1 more byte before the hash)
+ROUTED_BY_PAYLOAD = (EntryReveal.TYPE, EntryCommit.TYPE, ChainCommit.TYPE)
+
+_END_OF_MINUTE = "end_of_minute"
+
+
+@dataclass
+class MinuteResults:
+    """Everything one VM's worker executed during a minute, ready to be merged into the PendingBlock"""
+
+    entries: Dict[bytes, List[bytes]] = field(default_factory=dict)  # chain id --> entry hashes, in process order
+    commits: list = field(default_factory=list)  # ChainCommit and EntryCommit block elements
+    transactions: list = field(default_factory=list)  # FactoidTransaction block elements
+    processed: Dict[int, int] = field(default_factory=dict)  # message type --> messages executed
+    failed: Dict[int, int] = field(default_factory=dict)  # message type --> messages that couldn't be decoded
+
+
+def routing_hash(raw: bytes) -> Optional[bytes]:
+    """
+    The hash a raw message is routed to a VM by, read straight off the wire, or None if the message type isn't
+    executed by the VMs. Matches factomd: factoid transactions all go to the VM for the factoid chain id.
+    """
+    if raw[0] in ROUTED_BY_PAYLOAD:
+        return raw[8:40]
+    if raw[0] == FactoidTransaction.TYPE:
+        return blocks.FactoidBlock.CHAIN_ID
+    return None
+
+
+def execute(raw: bytes, results: MinuteResults):
+    """Decode a routed message and record its effect on the block in `results`"""
+    try:
+        msg = unmarshal_message(raw)
+    except Exception:
+        results.failed[raw[0]] = results.failed.get(raw[0], 0) + 1
+        return
+    results.processed[msg.TYPE] = results.processed.get(msg.TYPE, 0) + 1
+    if type(msg) is EntryReveal:
+        results.entries.setdefault(msg.entry.chain_id, []).append(msg.entry.entry_hash)
+    elif type(msg) is FactoidTransaction:
+        results.transactions.append(msg.tx)
+    else:
+        results.commits.append(msg.commit)
+
+
+def shard_worker(inbox: multiprocessing.Queue, outbox: multiprocessing.Queue, index: int):
+    """Execute batches of raw messages for one VM, handing back the minute's results at each end of minute"""
+    results = MinuteResults()
+    while True:
+        batch = inbox.get()
+        if batch is None:
+            return
+        if batch == _END_OF_MINUTE:
+            outbox.put((index, results))
+            results = MinuteResults()
+            continue
+        for raw in batch:
+            execute(raw, results)
+
+
+class ShardedExecutor:
+    def __init__(self, workers: int, vm_count: Callable[[], int] = None, batch_size: int = 256):
+        """
+        Executes the VMs' messages in worker processes
+
+        Messages are routed to their VM on the hash read from their raw bytes, so the parent never decodes them, and
+        VM i is executed by worker i % `workers`. Workers decode and execute their share, and the end of minute is a
+        barrier: every worker hands back what it executed, which is merged into the PendingBlock in worker order.
+        Routing depends only on the number of VMs, so rotating which server is responsible for each VM index between
+        minutes doesn't move any state. The number of workers is a local choice, it doesn't change the routing.
+
+        :param workers: the number of worker processes
+        :param vm_count: returns the network's current number of VMs, e.g. Blockchain.vm_count (defaults to one VM
+            per worker). It can be set after the workers are started.
+        :param batch_size: the number of messages buffered for a worker before they're sent to it
+        """
+        self.workers = workers
+        self.vm_count = (lambda: workers) if vm_count is None else vm_count
+        self.batch_size = batch_size
+        self.routed = [0] * workers  # messages sent to each worker
+        self.rejected = 0  # replays and unpaid reveals turned away by the PendingBlock
+        self.processed: Dict[int, int] = {}  # message type --> messages executed, as of the last end of minute
+        self.failed: Dict[int, int] = {}  # message type --> messages that couldn't be decoded, likewise
+
+        self._buffers: List[List[bytes]] = [[] for _ in range(workers)]
+        self._inboxes: List[multiprocessing.Queue] = []
+        self._outbox: multiprocessing.Queue = None
+        self._workers: List[multiprocessing.Process] = []
+
+    def start(self):
+        self._outbox = multiprocessing.Queue()
+        for i in range(self.workers):
+            inbox = multiprocessing.Queue()
+            worker = multiprocessing.Process(target=shard_worker, args=(inbox, self._outbox, i), daemon=True)
+            worker.start()
+            self._inboxes.append(inbox)
+            self._workers.append(worker)
+
+    def stop(self):
+        for inbox in self._inboxes:
+            inbox.put(None)
+        for worker in self._workers:
+            worker.join()
+        self._inboxes, self._workers = [], []
+
+    def _flush(self, index: int):
+        if len(self._buffers[index]) != 0:
+            self._inboxes[index].put(self._buffers[index])
+            self._buffers[index] = []
+
+    def submit(self, raw: bytes) -> bool:
+        """
+        Route a raw message to its VM's worker
+
+        :return: True if the message was routed, False if it isn't a type the VMs execute
+        """
+        h = routing_hash(raw)
+        if h is None:
+            return False
+        index = routing.vm_for_hash(h, self.vm_count()) % self.workers
+        self.routed[index] += 1
+        self._buffers[index].append(raw)
+        if len(self._buffers[index]) >= self.batch_size:
+            self._flush(index)
+        return True
+
+    def submit_batch(self, raws: List[bytes]) -> int:
+        """
+        Route a batch of raw messages to their VMs' workers, computing every VM index in one vectorized pass
+
+        :return: the number of messages routed
+        """
+        routable, hashes = [], []
+        for raw in raws:
+            h = routing_hash(raw)
+            if h is not None:
+                routable.append(raw)
+                hashes.append(h)
+        for vm_index, positions in enumerate(routing.vm_buckets(hashes, self.vm_count())):
+            index = vm_index % self.workers
+            self.routed[index] += len(positions)
+            self._buffers[index].extend(routable[p] for p in positions)
+            if len(self._buffers[index]) >= self.batch_size:
+                self._flush(index)
+        return len(routable)
+
+    def end_of_minute(self, pending_block) -> List[MinuteResults]:
+        """
+        Wait for every worker to finish the minute, then merge their results into `pending_block` at its current
+        minute, in worker order. Reveals whose commit hasn't been merged by the end of the minute are rejected.
+
+        :return: the results of each worker, by index
+        """
+        for i, inbox in enumerate(self._inboxes):
+            self._flush(i)
+            inbox.put(_END_OF_MINUTE)
+        results: List[MinuteResults] = [None] * self.workers
+        for _ in range(self.workers):
+            index, minute_results = self._outbox.get()
+            results[index] = minute_results
+            for msg_type, count in minute_results.processed.items():
+                self.processed[msg_type] = self.processed.get(msg_type, 0) + count
+            for msg_type, count in minute_results.failed.items():
+                self.failed[msg_type] = self.failed.get(msg_type, 0) + count
+
+        # Commits first: an entry's commit is routed by entry hash and its reveal by chain id, so they're usually
+        # executed by different VMs
+        for minute_results in results:
+            for commit in minute_results.commits:
+                self.rejected += not pending_block.add_commit(commit)
+        for minute_results in results:
+            for chain_id, entry_hashes in minute_results.entries.items():
+                for entry_hash in entry_hashes:
+                    self.rejected += not pending_block.add_entry_hash(chain_id, entry_hash)
+            for tx in minute_results.transactions:
+                self.rejected += not pending_block.add_factoid_transaction(tx)
+        return results
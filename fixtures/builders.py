@@ -0,0 +1,23 @@
+import factom_core.blocks as blocks
+import factom_core.primitives as primitives
+from factom_core.messages import DirectoryBlockState
+
+
+def reseal_directory_block_state(msg: DirectoryBlockState, signers: list):
+    """Rebuild the directory block around the message's entry blocks, signed by the ed25519 `signers` alone"""
+    body = msg.directory_block.body
+    references = [blocks.EntryBlockReference(b.header.chain_id, b.keymr) for b in msg.entry_blocks]
+    body = blocks.DirectoryBlockBody(
+        body.admin_block_lookup_hash, body.entry_credit_block_header_hash, body.factoid_block_keymr, references
+    )
+    header = msg.directory_block.header
+    header = body.construct_header(
+        header.network_id, header.prev_keymr, header.prev_full_hash, header.timestamp, header.height
+    )
+    msg.directory_block = blocks.DirectoryBlock(header, body)
+    msg.signatures = primitives.FullSignatureList(
+        [
+            primitives.FullSignature(signer.get_verifying_key().to_bytes(), signer.sign(header.marshal()))
+            for signer in signers
+        ]
+    )
@@ -0,0 +1,95 @@
+"""Marshalled objects (hex encoded) for the tests and benchmarks to build from"""
+
+ENTRY = (
+    "00b312a0401879366b3d72a1844b3ca0da1009545ffa8e4038f80da1528cb572ab002200202140840000b4505bbb025bb7a3"
+    "2b2054eeed84a0eda2905e6272b30365abfdcd7b224f5052436861696e4944223a2244343254395842467559786872434e6e"
+    "37713336365a46644c6f3173676d5455625838586b76527a6f353367222c2244626874223a3139393435392c2257696e6e69"
+    "6e6750726576696f75734f5052223a5b22474e506f62614b674b777464396a36667265616d6f353765335363543754465234"
+    "344d7a7a5841696631594c222c22345456696b36414a35434e774c625671353458635a3972384b6b6332384d42795a395862"
+    "573771636b777831222c223756764e6b6556484734666d626a5868546579776e3862766459664d5976437644755146727366"
+    "46504c5977222c224162765970583653486b39534e4a4a4467457964645370437179504656696e37385042536a3842373537"
+    "4656222c2245743656625534673261696a654d486f777850625a5275547a6a657455687478695a656361657155566a566e22"
+    "2c22324156557a4144455a535262366f44564855434c58625a725661436b69684b694c3365773269486a6377656e222c224a"
+    "353875426e6238644541714c706159434d6a6f524247784568647864553154426677315a4e4c39444d794d222c2244765171"
+    "7574534b554a635a696d3454445242503271526268655875547a437670364d744a4b46354d59794e222c2247334b43364a36"
+    "504d4e594d707031636832717850537654754c3252737361744476356d316a37584445574d222c2246314738637650584647"
+    "4b4e316a52696a714a6d4864747a43537952785a6533587768486a674e4176437650225d2c22436f696e62617365504e5441"
+    "646472657373223a2274504e5432565365523967613538366d337138354a5772756e69526a6e706a6b6e4c7479616a31654a"
+    "345834676e457a6265373662313033222c22466163746f6d4469676974616c4944223a5b2270726f746f74797065222c2270"
+    "676d696e657231225d2c22504e54223a302c22555344223a312c22455552223a302e3838362c224a5059223a3130382e3336"
+    "31352c22474250223a302e373930372c22434144223a312e333133352c22434846223a302e393837322c22494e52223a3639"
+    "2e313737342c22534744223a312e333536322c22434e59223a362e383531382c22484b44223a372e3831352c22584155223a"
+    "31352e31312c22584147223a313338352e362c22585044223a313532382c22585054223a3833302c22584254223a31303438"
+    "322e393134352c22455448223a3239322e3830342c224c5443223a3132312e333032322c22584243223a3431362e35393835"
+    "2c22464354223a352e333837367d"
+)
+
+FACTOID_TRANSACTION = (
+    "02016bb2d7cd7e0201008991b4e605c07d49124e6a6d968a25be00596939e7cb27af821a3119d60e55fd075ab1838e8d8b64"
+    "330fd717584445ac866dc2facd8b856e63bdb8b15b5ed46c0b053b2c6c5c5c3f8991b4e605330fd717584445ac866dc2facd"
+    "8b856e63bdb8b15b5ed46c0b053b2c6c5c5c3f0117646c5e142a35d2b7d6522cb738dfadb3e4057b7027926173de1e514c5f"
+    "151c92cf5723e76b54a04d42bea61f81c8b7313aabecb5089efcf24d0b03b5f77d6473c4142ac021a041b5aed6ab7d224adf"
+    "9ebe9f8767e4fd5bb3581b2ea62e1102012c94f2bbe49899679c54482eba49bf1d024476845e478f9cce3238f612edd761ef"
+    "8c41822702b5caa37399d857b8601fc36fe66b451359f4f8764b9f6b1bdbcd439fe4f540d31aa7434eb080ccdc59056c14f8"
+    "d70099a362e00f315cd2e41407"
+)
+
+DIRECTORY_BLOCK = (
+    "00fa92e5a268621e0e173b9615f6f154b2a8db4fbe02f8e960bcdf52b380404afa2d2ea96e06a775ece14fb21e14fd3df37c"
+    "5e51c039789206d9c8402ed9ff9d9ca903ac246c3390e0d8e4238a431499056bba94cffb56ddad0a3a6c3a559e28bd5671ad"
+    "bf018d3e9100030b240000000d000000000000000000000000000000000000000000000000000000000000000af493fe8bcf"
+    "b9625c59387f1542e04ed06fd7beaf436daceb79de8651c62d19940000000000000000000000000000000000000000000000"
+    "00000000000000000c95dcfe56875b826336c09059d1259401082042cdc99e9b7f41b2b6deadb5e26b000000000000000000"
+    "000000000000000000000000000000000000000000000fff57136cc4967ac4e626bc7ab588cb8212863c61f91d3a594fa0cf"
+    "dbab4e84d70f47c100669876d0c4692de4d1a4b6f69634da4abce161827d21af79dcddcd6b5f8ef24d68f2480580c5b99be8"
+    "8f8bd4c858c7f4bc494cf2bd61dcfa868d189516dada470ad7b7755892cba35202f6e0b353ae57bed88282c95527ff295b08"
+    "9ccc4b5eb4255b8cc130e4d8ea68181b6bef719df4f1e6426ea61d0c94f3fb5564187158d359a646dda403efb7ac94828245"
+    "85cb8e351a9cf3fd05c4f083308d625bace4ac53e46f7a4ea373ed79b6b32b6d6d95447c72e48e9682bf444031fe0d2828d2"
+    "c5f58d869ee142b6bdb1a1d868712e3fa471e3b378cd8622a915ab46a4e39d579398bc7e1c5be3b47a479049671c6006435e"
+    "d6c8f808fef99e3ebbbcf94a35522c834022a4153c4ac92f61f22fad640647f91a21a65cf632f73871796651a38541e56c3b"
+    "c10f957c88cbc55f2097c600d39a078b1636e589e503632d185f23f3f40383497f3d7a7c86ba067c4f14e792950ed748fce5"
+    "9be27991bfc954fcdc22ee23a0bc05820479da7df89562cabb71ec61e2d5aa7b48af0da6e97a606e4540d08d5ac6a1a394e9"
+    "82fb6a2ab8b516ee751c37420055141b94fe070bfe40f99b78c9f92c20262afa5671a021be07846388dbdef1251daa1d1089"
+    "c98f499b5c6dbec96faef4f855182fa8d1475427eed27fc18f4c8deec588d1c252b7f8b805d0521d0e99686dd471f472d52b"
+    "8fcba06f675413f5664c376ebb527cc54cb312a0401879366b3d72a1844b3ca0da1009545ffa8e4038f80da1528cb572ab09"
+    "df02abdb74f44ddf1762bf578790219ff012b5786813b51229770a343724d8c9facbecd7f5b2aaea4c6040d0d312b0c663f8"
+    "ffbd34e82056cf285abfabfbef230928d8a86de42c768fd1b312302a56a4a5e4329826f7eec7ce8e445e479553"
+)
+
+DIRECTORY_BLOCK_STATE = (
+    "14016bc45d142f00fa92e5a2fdc025295a9a1705a288dc1043a1a3506a6526c3ae4ad1f181643db8190ecb5726d84fa9d63a"
+    "52a2022c3d1d90d750fe1ef77c5b7aaf0963838de84b6e9f073303e1d9c915b67a9be2bc69cd032cafafb5c5574420fdbd3f"
+    "63a8ca19b35edeea016e806a0000000a00000004000000000000000000000000000000000000000000000000000000000000"
+    "000a60d6c075925bbd2ddaf3b8c6737225d9df1963d0d098e10b67605d557857fc5200000000000000000000000000000000"
+    "0000000000000000000000000000000c96131286eb49d4eb587a7dbce7a6af968b52fa0b0a9f31be9c4ff6ce5096ce680000"
+    "00000000000000000000000000000000000000000000000000000000000f05c7a500db98dfe393b296998b7d9b74e8f2d2cf"
+    "eacd1d44c05cfb50bd2cbaf3df3ade9eec4b08d5379cc64270c30ea7315d8a8a1a69efe2b98a60ecdd69e604027a0aa245d4"
+    "bd893e3b50bc642827524f867819ffd66e3bf57d62d251f98a29000000000000000000000000000000000000000000000000"
+    "000000000000000a3975db81e58939290e9399d319d8e946b8bf6d26ab9e7506a176035dc8dd02ff0000000a000000000200"
+    "0000830100000000000000000000000000000000000000000000000000000000000000000426a802617848d4d16d87830fc5"
+    "21f4d136bb2d0c352850919c2679f189613a3dea02b1f44ee668e165e2005ba8fa3473a814db4c6b40d9631a5917d44f59cf"
+    "0f65411dbbec312a110b5a43afff9d48ae967f0662a1797beee140d921b75702000100000000000000000000000000000000"
+    "0000000000000000000000000000000fbd99abfabe12023b57c933bbb8a54dce5e3fe03ec048c9d47279615dc6ab785312bf"
+    "ddc1e888a144352db3e50366ae3f022e5a7abe9d3ad911d66fddbbdfd2417cdf1f82f8446985333d6ee6141cba7907c8065d"
+    "34cc45bc14b39749038d791800000000000a2be80000000a00000000010000001402014f8ad10e2000000000000000000000"
+    "000000000000000000000000000000000000000000000000000000000000000000000c898b0672bb93057a2dec036ee99ef1"
+    "a2cae3fcea76733b0f3272e2f5c69bd0e8b88eb7b3fc0c1899e1e4603b04ce0820f2a14b754df75587164d6dfb577b0d19ec"
+    "d06bcf6041c4206d59e249b7442f46254063b9e68d6fef4b7d233ab8f6c8c00000000a00000000000000000e000000000000"
+    "01b10000010101020300014f8ad36d8d0503fe82359416fc8caecc4a33fbbe94b78f02929e91cbbd022a3c5cab685f6b0117"
+    "ef7a21d1a616d65e6b73f3c6a7ad5c49340a6c2592872020ec60767ff00d7d0bb90cd75fa38d6669deb8a23c31ed04524cde"
+    "e8574b4bb2576e5a1b7768855e1a07e89c62ebfb6abee3bf4d9e5cdee3b91c2390ab400c37f0f5f40201509d0d0300014f8a"
+    "d36d8fa479f8d5d76be64f1a82d0a1f9bdcc2d29ab9507811660e095a8423a515d877a0117ef7a21d1a616d65e6b73f3c6a7"
+    "ad5c49340a6c2592872020ec60767ff00d7dcac9dc9364259903c19f99f4f65c407e3345e9f4a45336c366947ca7dbc6ff5a"
+    "c474a061030922d625f2af03bedf8f812032e2647fa9c7a4d7de34481eef4a000300014f8ad36d90a952983ddf6331a705b7"
+    "62f30cd01265b23ec5ce98b5398326bf4b14f3a708f60117ef7a21d1a616d65e6b73f3c6a7ad5c49340a6c2592872020ec60"
+    "767ff00d7d8d4d4ce70cc7e699d1a49269228d5c058002337962d0440d0cd2b9d4b8f196a750b703928a61160f4507275730"
+    "5fec2db9a5f670a44f0509b69d6ad2fc0fdd000103010401050106010701080109010a00000001df3ade9eec4b08d5379cc6"
+    "4270c30ea7315d8a8a1a69efe2b98a60ecdd69e6042f2425b5ee042bbb6493907377d551ad238b8def9fdfcfbbb30fcba7e5"
+    "a0448eef7646f2f9251c9e50e19ab9343c25eb88c241aa49b7ca779c2318b8ccce1f8abbd9f1adf24beb48367df16b9556ad"
+    "6e177f5b356aee4f37982b49c56973b767000000030000000a000000040503fe82359416fc8caecc4a33fbbe94b78f02929e"
+    "91cbbd022a3c5cab685f6ba479f8d5d76be64f1a82d0a1f9bdcc2d29ab9507811660e095a8423a515d877aa952983ddf6331"
+    "a705b762f30cd01265b23ec5ce98b5398326bf4b14f3a708f600000000000000000000000000000000000000000000000000"
+    "0000000000000300000000000000010426a802617848d4d16d87830fc521f4d136bb2d0c352850919c2679f189613a5d5d9d"
+    "d7628be37d604436bb4754e49c29ad14acf2d04f12df88d46fcc39ea53a22b4f2b7bf0687a7ca0f3dbcafdec7d6b295ea2b0"
+    "ba8519c03321f10ad08f06"
+)
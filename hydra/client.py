@@ -0,0 +1,173 @@
+import concurrent.futures
+import requests
+from typing import Dict, Iterable, Union
+
+from rpc.paths import RestPaths
+
+
+class HydraClient:
+    def __init__(self, host: str = "localhost", port: int = 8000, pool_size: int = 8, timeout: float = 10):
+        """
+        A client for the hydra RPC server, reusing pooled keep-alive connections across calls
+
+        :param host: the hostname the RPC server is listening on
+        :param port: the port the RPC server is listening on
+        :param pool_size: the maximum number of connections kept open to the server (also the bulk fetch window)
+        :param timeout: seconds to wait for a response before giving up on a request
+        """
+        self.base_url = f"http://{host}:{port}"
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _get(self, path: str) -> Union[dict, None]:
+        """
+        Fetch `path` from the server, returning the decoded JSON body or None if the object was not found
+
+        :raises requests.HTTPError: for any other error response, which is on the exception as `response`
+        """
+        r = self.session.get(f"{self.base_url}{path}", timeout=self.timeout)
+        if r.status_code == 404:
+            return None
+        r.raise_for_status()
+        return r.json()
+
+    def _get_many(self, paths: Iterable[str], max_in_flight: int = None) -> Dict[str, Union[dict, None]]:
+        """
+        Fetch all `paths` concurrently, with at most `max_in_flight` requests outstanding at any one time
+
+        :return: a dict of path --> decoded JSON body (or None if not found), in the order `paths` were given
+        """
+        max_in_flight = self.pool_size if max_in_flight is None else min(max_in_flight, self.pool_size)
+        paths = list(paths)
+        results = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            for path, result in zip(paths, executor.map(self._get, paths)):
+                results[path] = result
+        return results
+
+    #
+    # Directory Block
+    #
+
+    def get_directory_block(self, block_id: Union[int, str]) -> Union[dict, None]:
+        """Get a directory block by its height or hex encoded keymr"""
+        return self._get(f"{RestPaths.DIRECTORY_BLOCK.value}/{block_id}")
+
+    def get_directory_block_head(self) -> Union[dict, None]:
+        return self._get(f"{RestPaths.DIRECTORY_BLOCK.value}/head")
+
+    def get_directory_blocks(self, start: int, stop: int, max_in_flight: int = None) -> Dict[int, Union[dict, None]]:
+        """
+        Fetch all directory blocks with a height in range(start, stop) in parallel
+
+        :return: a dict of height --> directory block (or None if not found)
+        """
+        heights = range(start, stop)
+        paths = [f"{RestPaths.DIRECTORY_BLOCK.value}/{height}" for height in heights]
+        results = self._get_many(paths, max_in_flight)
+        return {height: results[path] for height, path in zip(heights, paths)}
+
+    #
+    # Admin Block
+    #
+
+    def get_admin_block(self, block_id: Union[int, str]) -> Union[dict, None]:
+        """Get an admin block by its height or hex encoded lookup hash"""
+        return self._get(f"{RestPaths.ADMIN_BLOCK.value}/{block_id}")
+
+    def get_admin_block_head(self) -> Union[dict, None]:
+        return self._get(f"{RestPaths.ADMIN_BLOCK.value}/head")
+
+    #
+    # Factoid Block
+    #
+
+    def get_factoid_block(self, block_id: Union[int, str]) -> Union[dict, None]:
+        """Get a factoid block by its height or hex encoded keymr"""
+        return self._get(f"{RestPaths.FACTOID_BLOCK.value}/{block_id}")
+
+    def get_factoid_block_head(self) -> Union[dict, None]:
+        return self._get(f"{RestPaths.FACTOID_BLOCK.value}/head")
+
+    #
+    # Entry Credit Block
+    #
+
+    def get_entry_credit_block(self, block_id: Union[int, str]) -> Union[dict, None]:
+        """Get an entry credit block by its height or hex encoded header hash"""
+        return self._get(f"{RestPaths.ENTRY_CREDIT_BLOCK.value}/{block_id}")
+
+    def get_entry_credit_block_head(self) -> Union[dict, None]:
+        return self._get(f"{RestPaths.ENTRY_CREDIT_BLOCK.value}/head")
+
+    #
+    # Entry Block
+    #
+
+    def get_entry_block(self, keymr: str) -> Union[dict, None]:
+        return self._get(f"{RestPaths.ENTRY_BLOCK.value}/{keymr}")
+
+    def get_entry_block_head(self, chain_id: str) -> Union[dict, None]:
+        return self._get(f"{RestPaths.ENTRY_BLOCK.value}/{chain_id}/head")
+
+    def get_chain_entry_block(self, chain_id: str, height: int) -> Union[dict, None]:
+        """Get the entry block a chain got in the directory block at `height` (None if it got none)"""
+        return self._get(f"{RestPaths.CHAIN.value}/{chain_id}/eblocks/{height}")
+
+    #
+    # Entry
+    #
+
+    def get_entry(self, entry_hash: str) -> Union[dict, None]:
+        return self._get(f"{RestPaths.ENTRY.value}/{entry_hash}")
+
+    def get_entries(self, entry_hashes: Iterable[str], max_in_flight: int = None) -> Dict[str, Union[dict, None]]:
+        """
+        Fetch all `entry_hashes` in parallel
+
+        :return: a dict of entry hash --> entry (or None if not found)
+        """
+        entry_hashes = list(entry_hashes)
+        paths = [f"{RestPaths.ENTRY.value}/{entry_hash}" for entry_hash in entry_hashes]
+        results = self._get_many(paths, max_in_flight)
+        return {entry_hash: results[path] for entry_hash, path in zip(entry_hashes, paths)}
+
+    #
+    # Address
+    #
+
+    def get_factoid_balance(self, address: str) -> Union[int, None]:
+        """Get the balance of a human readable factoid address (FA...) in factoshis"""
+        result = self._get(f"{RestPaths.ADDRESS.value}/{address}/balance")
+        return None if result is None else result["balance"]
+
+    def get_address_history(
+        self, address: str, start_height: int = 0, start_position: int = 0, limit: int = 100
+    ) -> Union[dict, None]:
+        """
+        Get a page of the factoid transactions touching a human readable factoid address (FA...), oldest first
+
+        :return: the page, with a `next` object holding the start_height and start_position of the following page
+            (None on the last page)
+        """
+        query = f"start_height={start_height}&start_position={start_position}&limit={limit}"
+        return self._get(f"{RestPaths.ADDRESS.value}/{address}/transactions?{query}")
+
+    #
+    # Factoid Transaction
+    #
+
+    def get_factoid_transaction(self, tx_id: str) -> Union[dict, None]:
+        return self._get(f"{RestPaths.TRANSACTION.value}/{tx_id}")
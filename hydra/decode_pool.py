@@ -0,0 +1,95 @@
+import multiprocessing
+import struct
+from typing import List, NamedTuple
+
+import factom_core.messages
+
+
+class MessageHandle(NamedTuple):
+    """
+    A raw message that has passed a decode worker's checks
+
+    Pickling a decoded message means pickling its whole dataclass tree, which costs more than decoding it again from
+    the raw bytes. So only the type and raw bytes cross the process boundary, and the message is decoded once, by
+    whatever executes it (the dispatcher, or a VM worker).
+    """
+
+    type: int
+    raw: bytes
+
+    def decode(self) -> factom_core.messages.Message:
+        return factom_core.messages.unmarshal_message(self.raw)
+
+
+# The types whose checks need the decoded message, and are costly enough to be worth doing off of the node's thread
+DECODED_TYPES = {factom_core.messages.DirectoryBlockState.TYPE}
+
+
+def prevalidate(raws: List[bytes]) -> List[MessageHandle]:
+    """
+    Check a batch of raw messages, returning handles to those that should be kept, in the order received
+
+    Messages of an unknown type are dropped. A DBState is decoded to check its blocks hash up to its directory block,
+    anything else is left to fail when it's decoded for execution, rather than being decoded twice. Who signed a
+    DBState is checked by the node, which knows the federated servers at its height.
+    """
+    handles = []
+    for raw in raws:
+        if len(raw) == 0 or factom_core.messages.MESSAGE_TYPES[raw[0]] is None:
+            continue
+        if raw[0] in DECODED_TYPES:
+            try:
+                msg = factom_core.messages.unmarshal_message(raw)
+            except (ValueError, AssertionError, IndexError, struct.error):
+                continue
+            if not msg.validate_contents():
+                continue
+        handles.append(MessageHandle(raw[0], bytes(raw)))
+    return handles
+
+
+def decode_worker(raw_inbox: multiprocessing.Queue, inbox: multiprocessing.Queue):
+    """Pull batches of raw messages, and push batches of handles for the ones that pass pre-validation"""
+    try:
+        while True:
+            batch = raw_inbox.get()
+            if batch is None:
+                break
+            handles = prevalidate(batch)
+            if len(handles) != 0:
+                inbox.put(handles)
+    except (KeyboardInterrupt, SystemExit):
+        pass
+
+
+class DecodePool:
+    def __init__(self, inbox: multiprocessing.Queue, workers: int = None, queue_size: int = 1000):
+        """
+        A pool of processes decoding raw messages off of the p2p accept loop
+
+        Batches of raw message bytes are put on `raw_inbox` (by the p2p server), and batches of MessageHandles come
+        out the other side on `inbox` (for the node).
+
+        :param inbox: the queue of pre-validated message handle batches for the node to process
+        :param workers: the number of decode processes to run, defaults to the number of cpus
+        :param queue_size: the maximum number of raw message batches waiting to be decoded
+        """
+        self.inbox = inbox
+        self.workers = multiprocessing.cpu_count() if workers is None else workers
+        self.raw_inbox = multiprocessing.Queue(maxsize=queue_size)
+        self.processes: List[multiprocessing.Process] = []
+
+    def start(self):
+        for i in range(self.workers):
+            p = multiprocessing.Process(
+                name=f"decode_worker_{i}", target=decode_worker, args=(self.raw_inbox, self.inbox), daemon=True,
+            )
+            p.start()
+            self.processes.append(p)
+
+    def stop(self):
+        for _ in self.processes:
+            self.raw_inbox.put(None)
+        for p in self.processes:
+            p.join()
+        self.processes = []
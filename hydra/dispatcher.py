@@ -0,0 +1,142 @@
+import collections
+import time
+from typing import Callable, Deque, Dict, Iterable, Tuple
+
+import factom_core.messages as messages
+from factom_core.blockchains import Blockchain
+
+from decode_pool import MessageHandle
+
+
+# Lanes are drained highest priority first. Anything not listed goes in the normal lane.
+HIGH_PRIORITY_TYPES = {
+    messages.Ack.TYPE,
+    messages.EndOfMinute.TYPE,
+    messages.DirectoryBlockSignature.TYPE,
+}
+BULK_TYPES = {messages.DirectoryBlockState.TYPE}
+
+HIGH, NORMAL, BULK = range(3)
+
+
+def lane_for_type(msg_type: int) -> int:
+    if msg_type in HIGH_PRIORITY_TYPES:
+        return HIGH
+    if msg_type in BULK_TYPES:
+        return BULK
+    return NORMAL
+
+
+class TypeMetrics:
+    """Queue depth and processing latency (time from being queued to finishing its handler) for one message type"""
+
+    __slots__ = ("depth", "processed", "failed", "total_latency", "max_latency")
+
+    def __init__(self):
+        self.depth = 0
+        self.processed = 0
+        self.failed = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def to_dict(self) -> dict:
+        handled = self.processed + self.failed  # latency is measured for both
+        return {
+            "depth": self.depth,
+            "processed": self.processed,
+            "failed": self.failed,
+            "mean_latency_ms": 1000 * self.total_latency / handled if handled else 0.0,
+            "max_latency_ms": 1000 * self.max_latency,
+        }
+
+
+class Dispatcher:
+    def __init__(self, blockchain: Blockchain, is_leader: bool = False):
+        """
+        Routes batches of MessageHandles from the inbox to per-type handlers, by priority lane
+
+        Every time a message is picked, the highest priority non-empty lane wins. So an Ack arriving behind a
+        backlog of DirectoryBlockStates is handled as soon as the current message finishes, not after the backlog.
+
+        By default a message is handled by its own `leader_execute` or `follower_execute`, depending on `is_leader`.
+        Use `register` to override the handler for a type.
+
+        If the blockchain has an `executor`, the messages the VMs execute (entry reveals, commits and factoid
+        transactions) are handed to it undecoded as they're submitted, rather than queued, so they stay in arrival
+        order. The executor merges what they did into the block when the minute is sealed, and they're counted as
+        processed then.
+
+        :param blockchain: the state messages are executed against
+        :param is_leader: whether to use `leader_execute` rather than `follower_execute`
+        """
+        self.blockchain = blockchain
+        self.is_leader = is_leader
+        self.executor = getattr(blockchain, "executor", None)
+        self.lanes: Tuple[Deque[Tuple[float, MessageHandle]], ...] = tuple(collections.deque() for _ in range(3))
+        self.handlers: Dict[int, Callable[[messages.Message], None]] = {}
+        self.metrics: Dict[int, TypeMetrics] = collections.defaultdict(TypeMetrics)
+
+    def register(self, msg_type: int, handler: Callable[[messages.Message], None]):
+        """Handle all messages of `msg_type` with `handler`, instead of the message's own execute method"""
+        self.handlers[msg_type] = handler
+
+    def default_handler(self, msg: messages.Message):
+        if self.is_leader:
+            msg.leader_execute(self.blockchain)
+        else:
+            msg.follower_execute(self.blockchain)
+
+    def pending(self) -> int:
+        return sum(len(lane) for lane in self.lanes)
+
+    def submit(self, handles: Iterable[MessageHandle]):
+        """Queue a batch of handles up in their lanes, or hand them straight to the executor if it executes them"""
+        now = time.perf_counter()
+        for handle in handles:
+            if self.executor is not None and self.executor.submit(handle.raw):
+                continue
+            self.lanes[lane_for_type(handle.type)].append((now, handle))
+            self.metrics[handle.type].depth += 1
+
+    def next_handle(self) -> Tuple[float, MessageHandle]:
+        for lane in self.lanes:
+            if len(lane) != 0:
+                return lane.popleft()
+        raise IndexError("No messages pending")
+
+    def dispatch(self, max_messages: int = None) -> int:
+        """
+        Handle up to `max_messages` pending messages (all of them if None), highest priority first
+
+        :return: the number of messages handled
+        """
+        count = 0
+        while self.pending() != 0 and (max_messages is None or count < max_messages):
+            queued_at, handle = self.next_handle()
+            metrics = self.metrics[handle.type]
+            metrics.depth -= 1
+            try:
+                msg = handle.decode()
+                self.handlers.get(handle.type, self.default_handler)(msg)
+            except Exception as e:
+                metrics.failed += 1
+                print(f"Failed to handle message of type {handle.type}: {e!r}")
+            else:
+                metrics.processed += 1
+            latency = time.perf_counter() - queued_at
+            metrics.total_latency += latency
+            metrics.max_latency = max(metrics.max_latency, latency)
+            count += 1
+        return count
+
+    def get_metrics(self) -> Dict[str, dict]:
+        """A snapshot of per-type metrics, keyed by message class name"""
+        if self.executor is not None:
+            # The messages handed to the executor are counted as its workers execute them
+            for msg_type, count in self.executor.processed.items():
+                self.metrics[msg_type].processed = count
+            for msg_type, count in self.executor.failed.items():
+                self.metrics[msg_type].failed = count
+        return {
+            messages.MESSAGE_TYPES[msg_type].__name__: m.to_dict() for msg_type, m in sorted(self.metrics.items())
+        }
@@ -1,13 +1,16 @@
 #!/usr/bin/env python3.7
 
 import click
+import functools
 import json
 import requests
+import time
 
 import factom_core.db
+from factom_core.utils.filters import SyncFilter
 
 import state_manager
-from rpc import server as api_server
+from client import HydraClient
 
 
 HYDRA_HEADER = "\n".join(
@@ -25,16 +28,113 @@ HYDRA_HEADER = "\n".join(
 
 
 @click.group()
-def main():
-    pass
+@click.option("--host", default="localhost", help="Hostname of the RPC server")
+@click.option("--port", default=8000, help="Port of the RPC server")
+@click.pass_context
+def main(ctx, host: str, port: int):
+    ctx.obj = {"host": host, "port": port}
 
 
 @main.command()
 @click.option("--network", "-n")
-def run(network: str):
+@click.option("--decode-workers", type=int, help="Number of message decoding processes (defaults to the cpu count)")
+@click.option("--selective-sync", is_flag=True, help="Only store entries of identity, exchange rate and allowed chains")
+@click.option("--sync-chain", multiple=True, help="Hex chain id to store entries of in selective sync (repeatable)")
+@click.option("--prune-keep-blocks", type=int, help="Prune entries older than this many blocks in the background")
+@click.option("--prune-factoid-blocks", is_flag=True, help="Also prune factoid blocks down to their headers")
+@click.option("--api-workers", default=1, help="Number of API server processes sharing the RPC port")
+@click.option("--shards", type=int, help="Number of worker processes to execute the VMs' messages in")
+def run(
+    network: str,
+    decode_workers: int,
+    selective_sync: bool,
+    sync_chain: tuple,
+    prune_keep_blocks: int,
+    prune_factoid_blocks: bool,
+    api_workers: int,
+    shards: int,
+):
     """Main entry point for the node"""
     print(HYDRA_HEADER)
-    state_manager.start(network)
+    sync_filter = SyncFilter(allow_list=[bytes.fromhex(c) for c in sync_chain]) if selective_sync else None
+    state_manager.start(
+        network,
+        decode_workers=decode_workers,
+        sync_filter=sync_filter,
+        prune_keep_blocks=prune_keep_blocks,
+        prune_factoid_blocks=prune_factoid_blocks,
+        api_workers=api_workers,
+        shards=shards,
+    )
+
+
+@main.command()
+@click.option("--keep-blocks", type=int, help="Prune entries older than this many blocks")
+@click.option("--selective-sync", is_flag=True, help="Prune entries of all but identity, exchange rate and kept chains")
+@click.option("--sync-chain", multiple=True, help="Hex chain id to keep entries of with --selective-sync (repeatable)")
+@click.option("--factoid-blocks", is_flag=True, help="Also prune factoid blocks older than --keep-blocks to headers")
+@click.option("--batch-size", "-b", default=10000, help="Keys to delete per write batch")
+def prune(keep_blocks: int, selective_sync: bool, sync_chain: tuple, factoid_blocks: bool, batch_size: int):
+    """Delete old or unwanted entry data from the database, keeping the blocks needed to prove what remains"""
+    keep_chains = SyncFilter(allow_list=[bytes.fromhex(c) for c in sync_chain]) if selective_sync else None
+    db = factom_core.db.FactomdLevelDB(create_if_missing=True)
+    pruner = factom_core.db.Pruner(db, keep_blocks, keep_chains, factoid_blocks, batch_size)
+    start = time.perf_counter()
+    deleted = pruner.run()
+    db.close()
+    print(f"Deleted {deleted} keys in {time.perf_counter() - start:.1f}s")
+
+
+@main.command()
+@click.option("--workers", "-w", type=int, help="Number of block decoding processes (defaults to the cpu count)")
+def rebuild_balances(workers: int):
+    """Recompute every factoid and entry credit balance from the blocks in the database"""
+    db = factom_core.db.FactomdLevelDB(create_if_missing=True)
+    for name, rebuild in [
+        ("factoid", db.rebuild_factoid_balances),
+        ("entry credit", db.rebuild_entry_credit_balances),
+    ]:
+        start = time.perf_counter()
+        try:
+            count = rebuild(workers=workers)
+        except ValueError as e:
+            print(f"Skipped {name} balances: {e}")
+            continue
+        print(f"Replayed {count} {name} blocks in {time.perf_counter() - start:.1f}s")
+    db.close()
+
+
+@main.command()
+@click.option("--batch-size", "-b", default=1000, help="Factoid blocks to index per write batch")
+def backfill_indexes(batch_size: int):
+    """Index the transactions of every factoid block in the database by tx_id and by address"""
+    db = factom_core.db.FactomdLevelDB(create_if_missing=True)
+    start = time.perf_counter()
+    count = db.backfill_factoid_indexes(batch_size=batch_size)
+    db.close()
+    print(f"Indexed {count} factoid blocks in {time.perf_counter() - start:.1f}s")
+
+
+@main.command()
+@click.option("--batch-size", "-b", default=1000, help="Directory blocks to index per write batch")
+def backfill_entry_block_index(batch_size: int):
+    """Index the entry block of every chain in every directory block in the database by chain id and height"""
+    db = factom_core.db.FactomdLevelDB(create_if_missing=True)
+    start = time.perf_counter()
+    count = db.backfill_entry_block_index(batch_size=batch_size)
+    db.close()
+    print(f"Indexed the entry blocks of {count} directory blocks in {time.perf_counter() - start:.1f}s")
+
+
+@main.command()
+@click.option("--batch-size", "-b", default=1000, help="Directory blocks per write batch")
+def rebuild_blooms(batch_size: int):
+    """Rewrite the chain id Bloom filter of every directory block in the database"""
+    db = factom_core.db.FactomdLevelDB(create_if_missing=True)
+    start = time.perf_counter()
+    count = db.rebuild_directory_block_blooms(batch_size=batch_size)
+    db.close()
+    print(f"Built Bloom filters for {count} directory blocks in {time.perf_counter() - start:.1f}s")
 
 
 # --------------------
@@ -44,10 +144,34 @@ def run(network: str):
 ERROR_NOT_FOUND = '{"error": {"detail": "not found"}}'
 
 
+def print_result(result):
+    print(json.dumps(result) if result is not None else ERROR_NOT_FOUND)
+
+
+def pass_client(f):
+    """
+    Pass an RPC wrapper command the HydraClient for --host and --port, created on first use and closed on exit. An
+    error response from the server is printed as is, rather than raised.
+    """
+
+    @click.pass_context
+    def new_func(ctx, *args, **kwargs):
+        if "client" not in ctx.obj:
+            ctx.obj["client"] = HydraClient(host=ctx.obj["host"], port=ctx.obj["port"])
+            ctx.find_root().call_on_close(ctx.obj["client"].close)
+        try:
+            return ctx.invoke(f, ctx.obj["client"], *args, **kwargs)
+        except requests.HTTPError as e:
+            print(e.response.text)
+
+    return functools.update_wrapper(new_func, f)
+
+
 @main.command()
 @click.option("--connection-type", "-c", type=click.Choice(["rpc", "db"]))
 @click.argument("block_id")
-def get_directory_block(connection_type, block_id):
+@pass_client
+def get_directory_block(client: HydraClient, connection_type, block_id):
     if connection_type == "db":
         db = factom_core.db.FactomdLevelDB(create_if_missing=True)
         block = (
@@ -57,30 +181,38 @@ def get_directory_block(connection_type, block_id):
         )
         print(json.dumps(block.to_dict()) if block is not None else ERROR_NOT_FOUND)
         return
-    r = requests.get(
-        f"http://localhost:8000{api_server.RestPaths.DIRECTORY_BLOCK.value}/{block_id}"
-    )
-    print(r.text)
+    print_result(client.get_directory_block(block_id))
 
 
 @main.command()
 @click.option("--connection-type", "-c", type=click.Choice(["rpc", "db"]))
-def get_directory_block_head(connection_type):
+@pass_client
+def get_directory_block_head(client: HydraClient, connection_type):
     if connection_type == "db":
         db = factom_core.db.FactomdLevelDB(create_if_missing=True)
         block = db.get_directory_block_head()
         print(json.dumps(block.to_dict()) if block is not None else ERROR_NOT_FOUND)
         return
-    r = requests.get(
-        f"http://localhost:8000{api_server.RestPaths.DIRECTORY_BLOCK.value}/head"
-    )
-    print(r.text)
+    print_result(client.get_directory_block_head())
+
+
+@main.command()
+@click.option("--max-in-flight", "-w", default=8, help="Maximum number of concurrent requests")
+@click.argument("start", type=int)
+@click.argument("stop", type=int)
+@pass_client
+def get_directory_blocks(client: HydraClient, max_in_flight: int, start: int, stop: int):
+    """Fetch all directory blocks with a height in the range [START, STOP)"""
+    blocks = client.get_directory_blocks(start, stop, max_in_flight=max_in_flight)
+    for block in blocks.values():
+        print_result(block)
 
 
 @main.command()
 @click.option("--connection-type", "-c", type=click.Choice(["rpc", "db"]))
 @click.argument("block_id")
-def get_admin_block(connection_type, block_id):
+@pass_client
+def get_admin_block(client: HydraClient, connection_type, block_id):
     if connection_type == "db":
         db = factom_core.db.FactomdLevelDB(create_if_missing=True)
         block = (
@@ -90,30 +222,26 @@ def get_admin_block(connection_type, block_id):
         )
         print(json.dumps(block.to_dict()) if block is not None else ERROR_NOT_FOUND)
         return
-    r = requests.get(
-        f"http://localhost:8000{api_server.RestPaths.ADMIN_BLOCK.value}/{block_id}"
-    )
-    print(r.text)
+    print_result(client.get_admin_block(block_id))
 
 
 @main.command()
 @click.option("--connection-type", "-c", type=click.Choice(["rpc", "db"]))
-def get_admin_block_head(connection_type):
+@pass_client
+def get_admin_block_head(client: HydraClient, connection_type):
     if connection_type == "db":
         db = factom_core.db.FactomdLevelDB(create_if_missing=True)
         block = db.get_admin_block_head()
         print(json.dumps(block.to_dict()) if block is not None else ERROR_NOT_FOUND)
         return
-    r = requests.get(
-        f"http://localhost:8000{api_server.RestPaths.ADMIN_BLOCK.value}/head"
-    )
-    print(r.text)
+    print_result(client.get_admin_block_head())
 
 
 @main.command()
 @click.option("--connection-type", "-c", type=click.Choice(["rpc", "db"]))
 @click.argument("block_id")
-def get_factoid_block(connection_type, block_id):
+@pass_client
+def get_factoid_block(client: HydraClient, connection_type, block_id):
     if connection_type == "db":
         db = factom_core.db.FactomdLevelDB(create_if_missing=True)
         block = (
@@ -123,102 +251,87 @@ def get_factoid_block(connection_type, block_id):
         )
         print(json.dumps(block.to_dict()) if block is not None else ERROR_NOT_FOUND)
         return
-    r = requests.get(
-        f"http://localhost:8000{api_server.RestPaths.FACTOID_BLOCK.value}/{block_id}"
-    )
-    print(r.text)
+    print_result(client.get_factoid_block(block_id))
 
 
 @main.command()
 @click.option("--connection-type", "-c", type=click.Choice(["rpc", "db"]))
-def get_factoid_block_head(connection_type):
+@pass_client
+def get_factoid_block_head(client: HydraClient, connection_type):
     if connection_type == "db":
         db = factom_core.db.FactomdLevelDB(create_if_missing=True)
         block = db.get_factoid_block_head()
         print(json.dumps(block.to_dict()) if block is not None else ERROR_NOT_FOUND)
         return
-    r = requests.get(
-        f"http://localhost:8000{api_server.RestPaths.FACTOID_BLOCK.value}/head"
-    )
-    print(r.text)
+    print_result(client.get_factoid_block_head())
 
 
 @main.command()
 @click.option("--connection-type", "-c", type=click.Choice(["rpc", "db"]))
 @click.argument("block_id")
-def get_entry_credit_block(connection_type, block_id):
+@pass_client
+def get_entry_credit_block(client: HydraClient, connection_type, block_id):
     if connection_type == "db":
         db = factom_core.db.FactomdLevelDB(create_if_missing=True)
         block = (
             db.get_entry_credit_block(height=int(block_id))
             if len(block_id) < 64
-            else db.get_entry_credit_block(keymr=bytes.fromhex(block_id))
+            else db.get_entry_credit_block(header_hash=bytes.fromhex(block_id))
         )
         print(json.dumps(block.to_dict()) if block is not None else ERROR_NOT_FOUND)
         return
-    r = requests.get(
-        f"http://localhost:8000{api_server.RestPaths.ENTRY_CREDIT_BLOCK.value}/{block_id}"
-    )
-    print(r.text)
+    print_result(client.get_entry_credit_block(block_id))
 
 
 @main.command()
 @click.option("--connection-type", "-c", type=click.Choice(["rpc", "db"]))
-def get_entry_credit_block_head(connection_type):
+@pass_client
+def get_entry_credit_block_head(client: HydraClient, connection_type):
     if connection_type == "db":
         db = factom_core.db.FactomdLevelDB(create_if_missing=True)
         block = db.get_entry_credit_block_head()
         print(json.dumps(block.to_dict()) if block is not None else ERROR_NOT_FOUND)
         return
-    r = requests.get(
-        f"http://localhost:8000{api_server.RestPaths.ENTRY_CREDIT_BLOCK.value}/head"
-    )
-    print(r.text)
+    print_result(client.get_entry_credit_block_head())
 
 
 @main.command()
 @click.option("--connection-type", "-c", type=click.Choice(["rpc", "db"]))
 @click.argument("keymr")
-def get_entry_block(connection_type, keymr):
+@pass_client
+def get_entry_block(client: HydraClient, connection_type, keymr):
     if connection_type == "db":
         db = factom_core.db.FactomdLevelDB(create_if_missing=True)
         block = db.get_entry_block(keymr=keymr)
         print(json.dumps(block.to_dict()) if block is not None else ERROR_NOT_FOUND)
         return
-    r = requests.get(
-        f"http://localhost:8000{api_server.RestPaths.ENTRY_BLOCK.value}/{keymr}"
-    )
-    print(r.text)
+    print_result(client.get_entry_block(keymr))
 
 
 @main.command()
 @click.option("--connection-type", "-c", type=click.Choice(["rpc", "db"]))
 @click.argument("chain-id")
-def get_entry_block_head(connection_type, chain_id):
+@pass_client
+def get_entry_block_head(client: HydraClient, connection_type, chain_id):
     if connection_type == "db":
         db = factom_core.db.FactomdLevelDB(create_if_missing=True)
         block = db.get_entry_block_head(chain_id=bytes.fromhex(chain_id))
         print(json.dumps(block.to_dict()) if block is not None else ERROR_NOT_FOUND)
         return
-    r = requests.get(
-        f"http://localhost:8000{api_server.RestPaths.ENTRY_BLOCK.value}/{chain_id}/head"
-    )
-    print(r.text)
+    print_result(client.get_entry_block_head(chain_id))
 
 
 @main.command()
 @click.option("--connection-type", "-c", type=click.Choice(["rpc", "db"]))
 @click.argument("entry_hash")
-def get_entry(connection_type, entry_hash):
+@pass_client
+def get_entry(client: HydraClient, connection_type, entry_hash):
     if connection_type == "db":
         db = factom_core.db.FactomdLevelDB(create_if_missing=True)
         block = db.get_entry(bytes.fromhex(entry_hash))
         print(json.dumps(block.to_dict()) if block is not None else ERROR_NOT_FOUND)
         return
-    r = requests.get(
-        f"http://localhost:8000{api_server.RestPaths.ENTRY.value}/{entry_hash}"
-    )
-    print(r.text)
+    print_result(client.get_entry(entry_hash))
 
 
 if __name__ == "__main__":
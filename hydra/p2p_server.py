@@ -1,53 +1,142 @@
+import asyncio
 import multiprocessing
-import socketserver
+import struct
 import sys
-import factom_core.messages
+
+from p2p import P2PConfiguration
+from p2p.duplicate_filter import DuplicateFilter
 
 """
 A quick and hacky tool to listen for p2p messages forwarded from a factomd node
 
+Messages are framed with a 4 byte big-endian length prefix, followed by the raw message payload. Connections are
+long-lived: a node should dial once and keep writing frames to the same socket.
+
 Place the following snippet at this line of Who's p2p package: https://github.com/WhoSoup/factom-p2p/blob/master/peer.go#L243
 
 
 if msg.IsApplicationMessage() {
-    go func() {
-        conn, err := net.Dial("tcp", "127.0.0.1:8001")
-        if err != nil {
-            return
+    frame := make([]byte, 4+len(msg.Payload))
+    binary.BigEndian.PutUint32(frame, uint32(len(msg.Payload)))
+    copy(frame[4:], msg.Payload)
+
+    hydraMtx.Lock()
+    if hydraConn == nil {
+        hydraConn, _ = net.Dial("tcp", "127.0.0.1:8001")
+    }
+    if hydraConn != nil {
+        if _, err := hydraConn.Write(frame); err != nil {
+            hydraConn.Close()
+            hydraConn = nil
         }
-        payload := append(msg.Payload, []byte("\n")...)
-        _, _ = conn.Write(payload)
-    }()
+    }
+    hydraMtx.Unlock()
 }
 
 
+with the following package level variables:
+
+
+var hydraConn net.Conn
+var hydraMtx sync.Mutex
+
+
 Then rebuild and run his branch: https://github.com/WhoSoup/factomd/tree/FACTOMIZE_new_p2p
 """
 
+FRAME_HEADER = struct.Struct(">I")
+MAX_FRAME_SIZE = 64 * 1024 * 1024
 
-class P2PServer(socketserver.TCPServer):
+
+def encode_frame(payload: bytes) -> bytes:
+    """Prefix the payload with its length, ready to be written to a P2PServer connection"""
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+class P2PServer:
     def __init__(
         self,
-        inbox: multiprocessing.Queue,
-        server_address,
-        RequestHandlerClass,
-        bind_and_activate=True,
+        raw_inbox: multiprocessing.Queue,
+        host: str = "localhost",
+        port: int = 8001,
+        batch_size: int = 64,
+        queue_size: int = 1024,
+        duplicate_filter: DuplicateFilter = None,
     ):
-        super().__init__(server_address, RequestHandlerClass, bind_and_activate)
-        self.inbox = inbox
+        """
+        An asyncio server accepting long-lived connections of length-prefixed messages
+
+        Raw payloads are buffered in a bounded queue, then handed off in batches to the decode workers. No decoding
+        happens here, so a large message never stalls the accept loop. When the node falls behind, the queues between
+        here and the node fill up, and connections stop being read from until it catches up, pushing the backpressure
+        onto the sender's TCP window.
+
+        :param raw_inbox: the queue of raw message batches for the decode workers (see decode_pool.DecodePool)
+        :param host: the hostname to listen on
+        :param port: the port to listen on
+        :param batch_size: the maximum number of messages to forward at once
+        :param queue_size: the maximum number of raw messages to buffer before pausing reads
+        :param duplicate_filter: drops re-gossiped copies of recently seen messages before they're queued for decoding
+        """
+        self.raw_inbox = raw_inbox
+        self.host = host
+        self.port = port
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.queue = None
+        self.duplicate_filter = duplicate_filter
+
+        self.connections = 0
+        self.messages_received = 0
+        self.duplicates_dropped = 0
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                header = await reader.readexactly(FRAME_HEADER.size)
+                size = FRAME_HEADER.unpack(header)[0]
+                if size == 0 or size > MAX_FRAME_SIZE:
+                    print(f"Bad frame size ({size}), dropping connection")
+                    break
+                payload = await reader.readexactly(size)
+                self.messages_received += 1
+                if self.duplicate_filter is not None and self.duplicate_filter.is_duplicate(payload):
+                    self.duplicates_dropped += 1
+                    continue
+                await self.queue.put(payload)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass  # Peer hung up
+        finally:
+            self.connections -= 1
+            writer.close()
 
+    async def forward_messages(self):
+        """Drain the raw message buffer in batches and hand them off to the decode workers"""
+        loop = asyncio.get_event_loop()
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < self.batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            # The put blocks when the workers are behind, don't stall the event loop while waiting
+            await loop.run_in_executor(None, self.raw_inbox.put, batch)
 
-class P2PHandler(socketserver.StreamRequestHandler):
-    def handle(self):
-        payload = self.rfile.readline().strip()
-        msg = factom_core.messages.unmarshal_message(raw=payload)
-        self.server.inbox.put(msg)
+    async def serve(self):
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        forwarder = asyncio.ensure_future(self.forward_messages())
+        async with server:
+            try:
+                await server.serve_forever()
+            finally:
+                forwarder.cancel()
 
 
-def run(inbox: multiprocessing.Queue):
-    print("Starting Hacky P2P Server (localhost:8001)...")
-    server = P2PServer(inbox, ("localhost", 8001), P2PHandler)
+def run(raw_inbox: multiprocessing.Queue, host: str = "localhost", port: int = 8001, config: P2PConfiguration = None):
+    print(f"Starting P2P Server ({host}:{port})...")
+    config = P2PConfiguration() if config is None else config
+    server = P2PServer(raw_inbox, host, port, duplicate_filter=DuplicateFilter.from_config(config))
     try:
-        server.serve_forever()
+        asyncio.run(server.serve())
     except (KeyboardInterrupt, SystemExit):
         sys.exit()
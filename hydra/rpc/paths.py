@@ -0,0 +1,18 @@
+from enum import Enum
+
+
+rest_path = "/rest/v1"
+
+
+class RestPaths(Enum):
+    """The REST API's paths, shared by the server and HydraClient (which shouldn't need bottle to import them)"""
+
+    DIRECTORY_BLOCK = f"{rest_path}/dblocks"
+    ADMIN_BLOCK = f"{rest_path}/ablocks"
+    FACTOID_BLOCK = f"{rest_path}/fblocks"
+    ENTRY_CREDIT_BLOCK = f"{rest_path}/ecblocks"
+    ENTRY_BLOCK = f"{rest_path}/eblocks"
+    ENTRY = f"{rest_path}/entries"
+    CHAIN = f"{rest_path}/chains"
+    ADDRESS = f"{rest_path}/addresses"
+    TRANSACTION = f"{rest_path}/transactions"
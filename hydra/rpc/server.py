@@ -1,27 +1,54 @@
 import bottle
 import json
+import socket
 import sys
+from factom_keys.fct import FactoidAddress
+from wsgiref.simple_server import WSGIServer
+
 import factom_core.messages
 import factom_core.db
-from enum import Enum
+from rpc.paths import RestPaths
 
 
 bottle.BaseRequest.MEMFILE_MAX = 1024 * 1024
 app = bottle.default_app()
 
-rest_path = "/rest/v1"
+# The ReadServer socket of the node, which owns the database. Without one, this process opens the database itself
+read_socket: str = None
+_db: factom_core.db.FactomdLevelDB = None
+
+hex_regex = "[0-9A-Fa-f]{64}"
+fct_address_regex = "FA[1-9A-HJ-NP-Za-km-z]{50}"
 
 
-class RestPaths(Enum):
-    DIRECTORY_BLOCK = f"{rest_path}/dblocks"
-    ADMIN_BLOCK = f"{rest_path}/ablocks"
-    FACTOID_BLOCK = f"{rest_path}/fblocks"
-    ENTRY_CREDIT_BLOCK = f"{rest_path}/ecblocks"
-    ENTRY_BLOCK = f"{rest_path}/eblocks"
-    ENTRY = f"{rest_path}/entries"
+def database() -> factom_core.db.FactomdLevelDB:
+    """This worker's handle on the database, opened (or connected to through the node's read server) on first use"""
+    global _db
+    if _db is None:
+        if read_socket is None:
+            _db = factom_core.db.FactomdLevelDB(create_if_missing=True)
+        else:
+            _db = factom_core.db.connect(read_socket)
+    return _db
 
 
-hex_regex = "[0-9A-Fa-f]{64}"
+def query_int(name: str, default: int) -> int:
+    """A non-negative integer query parameter, aborting with a 400 if it's anything else"""
+    try:
+        value = int(bottle.request.query.get(name, default))
+    except ValueError:
+        value = -1
+    if value < 0:
+        bottle.abort(400, f"Query parameter {name} must be a non-negative integer")
+    return value
+
+
+class ReusePortWSGIServer(WSGIServer):
+    """Lets several worker processes listen on the same port, with the kernel spreading connections between them"""
+
+    def server_bind(self):
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
 
 
 @bottle.hook("before_request")
@@ -39,9 +66,8 @@ def health_check():
 
 @bottle.get(f"{RestPaths.DIRECTORY_BLOCK.value}/<keymr:re:{hex_regex}>")
 def get_directory_block(keymr: str):
-    db = factom_core.db.FactomdLevelDB(create_if_missing=True)
+    db = database()
     block = db.get_directory_block(keymr=bytes.fromhex(keymr))
-    db.close()
     if block is None:
         bottle.abort(404)
     return block.to_dict()
@@ -49,9 +75,8 @@ def get_directory_block(keymr: str):
 
 @app.get(f"{RestPaths.DIRECTORY_BLOCK.value}/<height:int>")
 def get_directory_block_by_height(height: int):
-    db = factom_core.db.FactomdLevelDB(create_if_missing=True)
+    db = database()
     block = db.get_directory_block(height=height)
-    db.close()
     if block is None:
         bottle.abort(404)
     return block.to_dict()
@@ -59,9 +84,8 @@ def get_directory_block_by_height(height: int):
 
 @app.get(f"{RestPaths.DIRECTORY_BLOCK.value}/head")
 def get_directory_block_head():
-    db = factom_core.db.FactomdLevelDB(create_if_missing=True)
+    db = database()
     block = db.get_directory_block_head()
-    db.close()
     if block is None:
         bottle.abort(404)
     return block.to_dict()
@@ -69,9 +93,8 @@ def get_directory_block_head():
 
 @bottle.get(f"{RestPaths.ADMIN_BLOCK.value}/<lookup_hash:re:{hex_regex}>")
 def get_admin_block(lookup_hash: str):
-    db = factom_core.db.FactomdLevelDB(create_if_missing=True)
+    db = database()
     block = db.get_admin_block(lookup_hash=bytes.fromhex(lookup_hash))
-    db.close()
     if block is None:
         bottle.abort(404)
     return block.to_dict()
@@ -79,9 +102,8 @@ def get_admin_block(lookup_hash: str):
 
 @app.get(f"{RestPaths.ADMIN_BLOCK.value}/<height:int>")
 def get_admin_block_by_height(height: int):
-    db = factom_core.db.FactomdLevelDB(create_if_missing=True)
+    db = database()
     block = db.get_admin_block(height=height)
-    db.close()
     if block is None:
         bottle.abort(404)
     return block.to_dict()
@@ -89,9 +111,8 @@ def get_admin_block_by_height(height: int):
 
 @bottle.get(f"{RestPaths.ADMIN_BLOCK.value}/head")
 def get_admin_block_head():
-    db = factom_core.db.FactomdLevelDB(create_if_missing=True)
+    db = database()
     block = db.get_admin_block_head()
-    db.close()
     if block is None:
         bottle.abort(404)
     return block.to_dict()
@@ -99,9 +120,8 @@ def get_admin_block_head():
 
 @bottle.get(f"{RestPaths.FACTOID_BLOCK.value}/<keymr:re:{hex_regex}>")
 def get_factoid_block(keymr: str):
-    db = factom_core.db.FactomdLevelDB(create_if_missing=True)
+    db = database()
     block = db.get_factoid_block(keymr=bytes.fromhex(keymr))
-    db.close()
     if block is None:
         bottle.abort(404)
     return block.to_dict()
@@ -109,9 +129,8 @@ def get_factoid_block(keymr: str):
 
 @bottle.get(f"{RestPaths.FACTOID_BLOCK.value}/<height:int>")
 def get_factoid_block_by_height(height: int):
-    db = factom_core.db.FactomdLevelDB(create_if_missing=True)
+    db = database()
     block = db.get_factoid_block(height=height)
-    db.close()
     if block is None:
         bottle.abort(404)
     return block.to_dict()
@@ -119,9 +138,8 @@ def get_factoid_block_by_height(height: int):
 
 @bottle.get(f"{RestPaths.FACTOID_BLOCK.value}/head")
 def get_factoid_block_head():
-    db = factom_core.db.FactomdLevelDB(create_if_missing=True)
+    db = database()
     block = db.get_factoid_block_head()
-    db.close()
     if block is None:
         bottle.abort(404)
     return block.to_dict()
@@ -129,9 +147,8 @@ def get_factoid_block_head():
 
 @bottle.get(f"{RestPaths.ENTRY_CREDIT_BLOCK.value}/<header_hash:re:{hex_regex}>")
 def get_entry_credit_block(header_hash: str):
-    db = factom_core.db.FactomdLevelDB(create_if_missing=True)
-    block = db.get_entry_credit_block(keymr=bytes.fromhex(header_hash))
-    db.close()
+    db = database()
+    block = db.get_entry_credit_block(header_hash=bytes.fromhex(header_hash))
     if block is None:
         bottle.abort(404)
     return block.to_dict()
@@ -139,9 +156,8 @@ def get_entry_credit_block(header_hash: str):
 
 @bottle.get(f"{RestPaths.ENTRY_CREDIT_BLOCK.value}/<height:int>")
 def get_entry_credit_block_by_height(height: int):
-    db = factom_core.db.FactomdLevelDB(create_if_missing=True)
+    db = database()
     block = db.get_entry_credit_block(height=height)
-    db.close()
     if block is None:
         bottle.abort(404)
     return block.to_dict()
@@ -149,9 +165,8 @@ def get_entry_credit_block_by_height(height: int):
 
 @bottle.get(f"{RestPaths.ENTRY_CREDIT_BLOCK.value}/head")
 def get_entry_credit_block_head():
-    db = factom_core.db.FactomdLevelDB(create_if_missing=True)
+    db = database()
     block = db.get_entry_credit_block_head()
-    db.close()
     if block is None:
         bottle.abort(404)
     return block.to_dict()
@@ -159,9 +174,8 @@ def get_entry_credit_block_head():
 
 @bottle.get(f"{RestPaths.ENTRY_BLOCK.value}/<keymr:re:{hex_regex}>")
 def get_entry_block(keymr: str):
-    db = factom_core.db.FactomdLevelDB(create_if_missing=True)
+    db = database()
     block = db.get_entry_block(keymr=bytes.fromhex(keymr))
-    db.close()
     if block is None:
         bottle.abort(404)
     return block.to_dict()
@@ -169,9 +183,18 @@ def get_entry_block(keymr: str):
 
 @bottle.get(f"{RestPaths.ENTRY_BLOCK.value}/<chain_id:re:{hex_regex}>/head")
 def get_entry_block_head(chain_id: str):
-    db = factom_core.db.FactomdLevelDB(create_if_missing=True)
+    db = database()
     block = db.get_entry_block_head(chain_id=bytes.fromhex(chain_id))
-    db.close()
+    if block is None:
+        bottle.abort(404)
+    return block.to_dict()
+
+
+@bottle.get(f"{RestPaths.CHAIN.value}/<chain_id:re:{hex_regex}>/eblocks/<height:int>")
+def get_chain_entry_block_by_height(chain_id: str, height: int):
+    db = database()
+    keymr = db.get_entry_block_keymr(bytes.fromhex(chain_id), height)
+    block = None if keymr is None else db.get_entry_block(keymr)
     if block is None:
         bottle.abort(404)
     return block.to_dict()
@@ -179,24 +202,78 @@ def get_entry_block_head(chain_id: str):
 
 @bottle.get(f"{RestPaths.ENTRY.value}/<entry_hash:re:{hex_regex}>")
 def get_entry(entry_hash: str):
-    db = factom_core.db.FactomdLevelDB(create_if_missing=True)
+    db = database()
     entry = db.get_entry(bytes.fromhex(entry_hash))
-    db.close()
     if entry is None:
         bottle.abort(404)
     return entry.to_dict()
 
 
+@bottle.get(f"{RestPaths.ADDRESS.value}/<address:re:{fct_address_regex}>/balance")
+def get_factoid_balance(address: str):
+    try:
+        rcd_hash = FactoidAddress(address_string=address).rcd_hash
+    except ValueError:
+        bottle.abort(404)
+    db = database()
+    balance = db.get_factoid_balance(rcd_hash)
+    return {"address": address, "balance": balance}
+
+
+@bottle.get(f"{RestPaths.ADDRESS.value}/<address:re:{fct_address_regex}>/transactions")
+def get_address_history(address: str):
+    """A page of the transactions touching an address. Pass the `next` object of a page as the query of the next one"""
+    try:
+        rcd_hash = FactoidAddress(address_string=address).rcd_hash
+    except ValueError:
+        bottle.abort(404)
+    start_height = query_int("start_height", 0)
+    start_position = query_int("start_position", 0)
+    limit = min(query_int("limit", 100), 1000)
+    db = database()
+    history = db.get_address_history(rcd_hash, start_height, start_position, limit + 1)
+    page, rest = history[:limit], history[limit:]
+    return {
+        "address": address,
+        "transactions": [{"height": h, "position": p, "tx_id": tx_id.hex()} for h, p, tx_id in page],
+        "next": {"start_height": rest[0].height, "start_position": rest[0].position} if rest else None,
+    }
+
+
+@bottle.get(f"{RestPaths.TRANSACTION.value}/<tx_id:re:{hex_regex}>")
+def get_factoid_transaction(tx_id: str):
+    db = database()
+    tx = db.get_factoid_transaction(bytes.fromhex(tx_id))
+    if tx is None:
+        bottle.abort(404)
+    return tx.to_dict()
+
+
 @bottle.error(404)
 def error404(e):
     body = {"errors": {"detail": "Object not found"}}
     return json.dumps(body, separators=(",", ":"))
 
 
-def run():
+@bottle.error(400)
+def error400(e):
+    body = {"errors": {"detail": e.body}}
+    return json.dumps(body, separators=(",", ":"))
+
+
+def run(socket_path: str = None, reuse_port: bool = False):
+    """
+    Serve the API on localhost:8000
+
+    :param socket_path: the node's ReadServer socket to read the database through, instead of opening it here
+    :param reuse_port: share the port with other API worker processes
+    """
+    global read_socket
+    read_socket = socket_path
     print("Starting API Server (localhost:8000)...")
+    server_class = ReusePortWSGIServer if reuse_port else WSGIServer
     try:
-        bottle.run(host="localhost", port=8000, quiet=True)
+        bottle.run(host="localhost", port=8000, quiet=True, server_class=server_class)
     except (KeyboardInterrupt, SystemExit):
         sys.exit()
 
@@ -1,32 +1,82 @@
 import multiprocessing
 import os
+import queue
 import sys
 import time
 
 import factom_core.blockchains as blockchains
+import factom_core.db
+from factom_core.utils.filters import SyncFilter
+from factom_core.vm import ShardedExecutor
 
 import p2p_server
+from decode_pool import DecodePool
+from dispatcher import Dispatcher
 from rpc import server as api_server
 
 
-inbox = multiprocessing.Queue()
+# Bounded, so a backed up node pushes back on the decode workers (and in turn the p2p server) rather than growing
+# without limit. Each item is a batch of pre-validated MessageHandles.
+INBOX_SIZE = 10000
+inbox = multiprocessing.Queue(maxsize=INBOX_SIZE)
 
+# Upper bound on messages handled between checks of the inbox, so newly arrived high priority messages are picked
+# up promptly even when a bulk backlog is queued in the dispatcher
+DISPATCH_BATCH_SIZE = 64
+METRICS_INTERVAL = 60
+PRUNE_INTERVAL = 600
 
-def start(network: str):
-    p2p = multiprocessing.Process(name="p2p", target=p2p_server.run, args=(inbox,))
-    api = multiprocessing.Process(name="api_server", target=api_server.run)
-    db_loader = multiprocessing.Process(
-        name="db_loader", target=load_database, args=(network,)
-    )
 
+def start(
+    network: str,
+    decode_workers: int = None,
+    sync_filter: SyncFilter = None,
+    prune_keep_blocks: int = None,
+    prune_factoid_blocks: bool = False,
+    api_workers: int = 1,
+    shards: int = None,
+):
+    """
+    Run the node, which alone has the database open: the API workers read it through the node's read server, and
+    every write is made by the node's dispatcher (and pruner) as it processes blocks
+
+    With `shards`, the VMs' messages are executed in that many worker processes (see ShardedExecutor)
+    """
+    decoders = DecodePool(inbox, workers=decode_workers)
+    p2p = multiprocessing.Process(name="p2p", target=p2p_server.run, args=(decoders.raw_inbox,))
+
+    # Forked before the database is opened: a process forked after LevelDB's background threads have started can
+    # deadlock
+    executor = None
+    if shards is not None:
+        executor = ShardedExecutor(workers=shards)
+        executor.start()
+    decoders.start()
     p2p.start()
-    api.start()
-    db_loader.start()
 
-    process_messages()
+    blockchain = load_database(network)
+    read_server = factom_core.db.ReadServer(blockchain.db)
+    read_server.start()
+
+    # Started once the read server is up, so they can serve requests right away. Spawned rather than forked, for the
+    # same reason as above.
+    spawn = multiprocessing.get_context("spawn")
+    for i in range(api_workers):
+        spawn.Process(
+            name=f"api_server_{i}", target=api_server.run, args=(factom_core.db.read_service.DEFAULT_SOCKET_PATH, True)
+        ).start()
+
+    blockchain.sync_filter = sync_filter
+    if executor is not None:
+        executor.vm_count = blockchain.vm_count  # routed by the network's VMs, however many workers execute them
+        blockchain.executor = executor
+    if prune_keep_blocks is not None:
+        pruner = factom_core.db.Pruner(blockchain.db, prune_keep_blocks, sync_filter, prune_factoid_blocks)
+        pruner.start(interval=PRUNE_INTERVAL)
+    process_messages(Dispatcher(blockchain))
 
 
-def load_database(network: str):
+def load_database(network: str) -> blockchains.Blockchain:
     home = os.getenv("HOME")
     if network is None or network == "mainnet":
         blockchain = blockchains.MainnetBlockchain()
@@ -45,22 +95,44 @@ def load_database(network: str):
     print(f"Network: {network}")
     print(f"Loading From Database at: {blockchain.data_path}")
 
+    start = time.monotonic()
+    chain_heads = blockchain.db.load_chain_heads()
+    print(
+        f"Loaded {len(chain_heads)} chain heads in {time.monotonic() - start:.2f}s "
+        f"({chain_heads.memory_usage() / 2 ** 20:.1f} MiB)"
+    )
+
     head = blockchain.db.get_directory_block_head()
     if head is None:
         print("Database empty, loading genesis block...")
         head = blockchain.load_genesis_block()
 
     print(f"Finished loading from database. Current block head:\n{head}")
-    blockchain.current_block = blockchains.PendingBlock(previous=head)
+    blockchain.current_block = blockchains.PendingBlock(previous=head, ec_balances=blockchain.db.entry_credit_balances)
+    return blockchain
 
 
-def process_messages():
+def process_messages(dispatcher: Dispatcher):
+    """
+    Hand batches from the inbox to the dispatcher as they arrive
+
+    Blocks on the inbox while there is nothing to do. Otherwise, drains whatever has arrived without waiting, then
+    dispatches a bounded number of messages before checking again.
+    """
     print("Running node...")
+    last_report = time.monotonic()
     try:
         while True:
-            msg = inbox.get()
-            if msg is None:
-                time.sleep(0.5)
-                continue
+            try:
+                dispatcher.submit(inbox.get(block=dispatcher.pending() == 0, timeout=METRICS_INTERVAL))
+                for _ in range(DISPATCH_BATCH_SIZE):
+                    dispatcher.submit(inbox.get_nowait())
+            except queue.Empty:
+                pass
+            dispatcher.dispatch(max_messages=DISPATCH_BATCH_SIZE)
+
+            if time.monotonic() - last_report >= METRICS_INTERVAL:
+                print(f"Dispatcher metrics: {dispatcher.get_metrics()}")
+                last_report = time.monotonic()
     except (KeyboardInterrupt, SystemExit):
         sys.exit()
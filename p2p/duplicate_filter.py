@@ -0,0 +1,89 @@
+import collections
+import hashlib
+import time
+from typing import Callable, Deque, Dict, Tuple
+
+from p2p.config import P2PConfiguration
+
+
+class DuplicateFilter:
+    def __init__(
+        self,
+        duration: int = 3600,
+        cleanup: int = 60,
+        max_entries: int = 1_000_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Remembers the hashes of recently seen messages, so that re-gossiped copies can be dropped before decoding
+
+        Hashes are grouped into time buckets `cleanup` seconds wide. A hash is a duplicate if it was seen in one of the
+        buckets covering the last `duration` seconds. Buckets that fall out of the window are dropped whole, so both
+        inserts and lookups are O(1) amortized.
+
+        Memory is bounded by `max_entries`. When a flood of unique messages reaches it, the oldest hashes are dropped
+        early, one for each new hash, which shortens the window rather than growing without limit.
+
+        :param duration: how long a message hash is remembered for, in seconds (0 to disable the filter)
+        :param cleanup: the width of each time bucket, in seconds
+        :param max_entries: the maximum number of hashes remembered at once
+        :param clock: the time source, in seconds
+        """
+        self.duration = duration
+        self.cleanup = cleanup
+        self.max_entries = max_entries
+        self.clock = clock
+
+        self.checked = 0
+        self.duplicates = 0
+
+        # message hash (first 8 bytes of sha256, as an int) --> the bucket it was inserted in
+        self._seen: Dict[int, int] = {}
+        # (bucket, hashes inserted in that bucket), oldest first
+        self._buckets: Deque[Tuple[int, Deque[int]]] = collections.deque()
+
+    @classmethod
+    def from_config(cls, config: P2PConfiguration, **kwargs):
+        return cls(duration=config.duplicate_filter, cleanup=config.duplicate_filter_cleanup, **kwargs)
+
+    def __len__(self):
+        return len(self._seen)
+
+    def _expire(self, oldest_bucket: int):
+        while len(self._buckets) != 0 and self._buckets[0][0] < oldest_bucket:
+            bucket, hashes = self._buckets.popleft()
+            for h in hashes:
+                if self._seen.get(h) == bucket:
+                    del self._seen[h]
+
+    def _make_room(self):
+        """At capacity, drop the oldest hashes one at a time, rather than whole buckets (which may be the newest)"""
+        while len(self._seen) >= self.max_entries and len(self._buckets) != 0:
+            bucket, hashes = self._buckets[0]
+            h = hashes.popleft()
+            if self._seen.get(h) == bucket:
+                del self._seen[h]
+            if len(hashes) == 0:
+                self._buckets.popleft()
+
+    def is_duplicate(self, payload: bytes) -> bool:
+        """Return True if `payload` was seen within the window, otherwise remember it and return False"""
+        if self.duration == 0:
+            return False
+        self.checked += 1
+        h = int.from_bytes(hashlib.sha256(payload).digest()[:8], "big")
+
+        bucket = int(self.clock() // self.cleanup)
+        self._expire(bucket - self.duration // self.cleanup)
+
+        seen_in = self._seen.get(h)
+        if seen_in is not None:
+            self.duplicates += 1
+            return True
+
+        self._make_room()
+        if len(self._buckets) == 0 or self._buckets[-1][0] != bucket:
+            self._buckets.append((bucket, collections.deque()))
+        self._buckets[-1][1].append(h)
+        self._seen[h] = bucket
+        return False
@@ -18,7 +18,7 @@ setup(
     py_modules=["factom_core"],
     install_requires=deps["factom-core"],
     zip_safe=False,
-    packages=find_packages(exclude=["tests", "tests.*", "hydra", "p2p"]),
+    packages=find_packages(exclude=["tests", "tests.*", "hydra", "p2p", "benchmarks", "fixtures"]),
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
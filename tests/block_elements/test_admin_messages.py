@@ -0,0 +1,16 @@
+import unittest
+
+import ed25519
+
+import factom_core.primitives as primitives
+from factom_core.block_elements.admin_messages import DirectoryBlockSignature
+
+
+class TestDirectoryBlockSignature(unittest.TestCase):
+    def test_validate_signature(self):
+        signer, verifier = ed25519.create_keypair()
+        previous_header = bytes(range(113))
+        signature = primitives.FullSignature(verifier.to_bytes(), signer.sign(previous_header))
+        msg = DirectoryBlockSignature.unmarshal(DirectoryBlockSignature(bytes(32), signature).marshal())
+        assert msg.validate_signature(previous_header)
+        assert not msg.validate_signature(previous_header[:-1] + b"\x00")
@@ -2,19 +2,12 @@ import unittest
 import datetime
 
 from factom_core.block_elements import FactoidTransaction
+from fixtures import vectors
 
 
 class TestFactoidTransaction(unittest.TestCase):
 
-    test_data = (
-        "02016bb2d7cd7e0201008991b4e605c07d49124e6a6d968a25be00596939e7cb27af821a3119d60e55fd075ab1838e8d8b64"
-        "330fd717584445ac866dc2facd8b856e63bdb8b15b5ed46c0b053b2c6c5c5c3f8991b4e605330fd717584445ac866dc2facd"
-        "8b856e63bdb8b15b5ed46c0b053b2c6c5c5c3f0117646c5e142a35d2b7d6522cb738dfadb3e4057b7027926173de1e514c5f"
-        "151c92cf5723e76b54a04d42bea61f81c8b7313aabecb5089efcf24d0b03b5f77d6473c4142ac021a041b5aed6ab7d224adf"
-        "9ebe9f8767e4fd5bb3581b2ea62e1102012c94f2bbe49899679c54482eba49bf1d024476845e478f9cce3238f612edd761ef"
-        "8c41822702b5caa37399d857b8601fc36fe66b451359f4f8764b9f6b1bdbcd439fe4f540d31aa7434eb080ccdc59056c14f8"
-        "d70099a362e00f315cd2e41407"
-    )
+    test_data = vectors.FACTOID_TRANSACTION
 
     def test_unmarshal(self):
         expected_tx_id = "bf5a4700b56c60e2cd2366094901436ee8e78db68768dbc96705bcf26a964d1a"
@@ -60,3 +53,9 @@ class TestFactoidTransaction(unittest.TestCase):
         tx_id = "bf5a4700b56c60e2cd2366094901436ee8e78db68768dbc96705bcf26a964d1a"
         tx = FactoidTransaction.unmarshal(bytes.fromhex(TestFactoidTransaction.test_data))
         assert tx.marshal().hex() == TestFactoidTransaction.test_data
+
+    def test_validate_signatures(self):
+        tx = FactoidTransaction.unmarshal(bytes.fromhex(TestFactoidTransaction.test_data))
+        assert tx.validate_signatures()
+        tx.outputs[0]["value"] += 1
+        assert not tx.validate_signatures()
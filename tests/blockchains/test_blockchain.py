@@ -0,0 +1,35 @@
+import tempfile
+import unittest
+
+import factom_core.block_elements as block_elements
+import factom_core.blocks as blocks
+from factom_core.blockchains import LocalBlockchain, PendingBlock
+from factom_core.utils.merkle import MerkleAccumulator
+
+
+class TestBlockchain(unittest.TestCase):
+    def test_directory_merkle_root(self):
+        with tempfile.TemporaryDirectory() as path:
+            blockchain = LocalBlockchain(data_path=path)
+            block = PendingBlock(previous=object())
+            for i in range(5):
+                entry = block_elements.Entry(chain_id=bytes([i % 3]) * 32, external_ids=[], content=bytes([i]))
+                commit = block_elements.EntryCommit(
+                    timestamp=0, entry_hash=entry.entry_hash, ec_spent=1, ec_public_key=bytes(32), signature=bytes(64)
+                )
+                assert block.add_commit(commit) and block.add_entry(entry)
+            block.finish_merkle_roots()
+
+            # The root accumulated while sealing matches one computed over the finished directory block body
+            leading = [bytes([i]) * 32 for i in range(3)]
+            headers = [blocks.AdminBlockHeader, blocks.EntryCreditBlockHeader, blocks.FactoidBlockHeader]
+            tree = MerkleAccumulator()
+            for chain_id, element in zip([header.CHAIN_ID for header in headers], leading):
+                tree.append(chain_id)
+                tree.append(element)
+            entry_blocks = blockchain.seal_entry_blocks(block, tree)
+            body = blocks.DirectoryBlockBody(
+                *leading, entry_blocks=[blocks.EntryBlockReference(b.header.chain_id, b.keymr) for b in entry_blocks]
+            )
+            assert len(entry_blocks) == 3 and tree.root == body.merkle_root
+            blockchain.db.close()
@@ -0,0 +1,134 @@
+import copy
+import tempfile
+import unittest
+
+import factom_core.block_elements as block_elements
+import factom_core.blocks as blocks
+from factom_core.blockchains import PendingBlock
+from factom_core.blockchains.pending_block import COMMIT_WINDOW
+from factom_core.db import FactomdLevelDB
+from fixtures import vectors
+
+
+def make_commit(entry_hash: bytes) -> block_elements.EntryCommit:
+    return block_elements.EntryCommit(
+        timestamp=0, entry_hash=entry_hash, ec_spent=1, ec_public_key=bytes(32), signature=bytes(64)
+    )
+
+
+class TestPendingBlock(unittest.TestCase):
+    def test_blocks_do_not_share_bodies(self):
+        a, b = PendingBlock(previous=object()), PendingBlock(previous=object())
+        a.add_commit(make_commit(bytes(32)))
+        assert len(b.entry_credit_block.objects) == 0
+
+    def test_reveal_requires_paid_commit(self):
+        block = PendingBlock(previous=object())
+        entry = block_elements.Entry(chain_id=bytes(32), external_ids=[b"a"], content=b"hello")
+        assert not block.add_entry(entry)
+        assert block.commit_for(entry.entry_hash) is None
+
+        commit = make_commit(entry.entry_hash)
+        assert block.add_commit(commit)
+        assert block.commit_for(entry.entry_hash) is commit
+
+        block.current_minute = 2
+        assert block.add_entry(entry)
+        assert block.entry_blocks[entry.chain_id].entry_hashes == {2: [entry.entry_hash]}
+        assert entry.entry_hash in block.entry_hashes
+        assert block.commit_for(entry.entry_hash) is None
+
+    def test_replays_rejected(self):
+        block = PendingBlock(previous=object())
+        entry = block_elements.Entry(chain_id=bytes(32), external_ids=[], content=b"hello")
+        assert block.add_commit(make_commit(entry.entry_hash))
+        assert not block.add_commit(make_commit(entry.entry_hash))
+        assert block.add_entry(entry)
+        assert not block.add_entry(entry)
+        assert block.entry_credit_block.objects == {0: [make_commit(entry.entry_hash)]}
+        assert block.entry_blocks[entry.chain_id].entry_hashes == {0: [entry.entry_hash]}
+
+        data = bytes.fromhex(vectors.FACTOID_TRANSACTION)
+        tx = block_elements.FactoidTransaction.unmarshal(data)
+        assert block.add_factoid_transaction(tx)
+        assert not block.add_factoid_transaction(tx)
+        assert block.factoid_block.transactions[0] == [tx]
+
+    def test_commits_across_window(self):
+        block = PendingBlock(previous=object())
+        entries = [block_elements.Entry(chain_id=bytes(32), external_ids=[], content=bytes([i])) for i in range(3)]
+        for entry in entries:
+            assert block.add_commit(make_commit(entry.entry_hash))
+
+        # A commit can be revealed in a later block of the window, and the first commit to an entry stands until then
+        block = block.next_block(previous=object())
+        assert block.height == 1 and block.commit_for(entries[0].entry_hash) is not None
+        assert not block.add_commit(make_commit(entries[0].entry_hash))
+        assert block.add_entry(entries[0])
+        assert not block.add_entry(entries[0])
+        assert len(block.entry_credit_block.objects) == 0
+
+        # Once revealed, the entry can be committed to again, but only once per block
+        block = block.next_block(previous=object())
+        assert block.add_commit(make_commit(entries[0].entry_hash))
+        assert block.add_entry(entries[0])
+        assert not block.add_commit(make_commit(entries[0].entry_hash))
+
+        # Commits not revealed within the window expire
+        while block.height < COMMIT_WINDOW - 1:
+            block = block.next_block(previous=object())
+        assert block.add_entry(entries[1])
+        block = block.next_block(previous=object())
+        assert block.commit_for(entries[2].entry_hash) is None
+        assert not block.add_entry(entries[2])
+
+    def test_incremental_merkle_roots(self):
+        block = PendingBlock(previous=object())
+        data = bytes.fromhex(vectors.FACTOID_TRANSACTION)
+        chain_ids = [bytes([i]) * 32 for i in range(3)]
+        for minute in range(4):
+            block.current_minute = minute
+            for i in range(minute * 3 + 1):
+                entry = block_elements.Entry(chain_id=chain_ids[i % 3], external_ids=[], content=bytes([minute, i]))
+                block.add_commit(make_commit(entry.entry_hash))
+                assert block.add_entry(entry)
+            tx = block_elements.FactoidTransaction.unmarshal(data)
+            tx.timestamp += minute
+            assert block.add_factoid_transaction(tx)
+
+        block.finish_merkle_roots()
+        for chain_id, body in block.entry_blocks.items():
+            expected = blocks.EntryBlockBody(entry_hashes=copy.deepcopy(body.entry_hashes)).merkle_root
+            assert body.merkle_root == expected
+        expected = blocks.FactoidBlockBody(transactions=copy.deepcopy(block.factoid_block.transactions)).merkle_root
+        assert block.factoid_block.merkle_root == expected
+
+    def test_commits_limited_by_balance(self):
+        with tempfile.TemporaryDirectory() as path:
+            db = FactomdLevelDB(path=path, create_if_missing=True)
+            db.entry_credit_balances.apply(0, {bytes(32): 2})
+            block = PendingBlock(previous=object(), ec_balances=db.entry_credit_balances)
+            assert block.add_commit(make_commit(bytes([1]) * 32))
+            assert block.add_commit(make_commit(bytes([2]) * 32))
+            assert block.available_credits(bytes(32)) == 0
+            assert not block.add_commit(make_commit(bytes([3]) * 32))
+            assert bytes([3]) * 32 not in block.commit_hashes
+            db.close()
+
+    def test_credits_bought_in_the_block(self):
+        with tempfile.TemporaryDirectory() as path:
+            db = FactomdLevelDB(path=path, create_if_missing=True)
+            block = PendingBlock(previous=object(), ec_balances=db.entry_credit_balances)
+            assert not block.add_commit(make_commit(bytes([1]) * 32))
+
+            purchase = block_elements.ECPurchase(2 * block.ec_exchange_rate, bytes(32))
+            tx = block_elements.FactoidTransaction(0, [], [], [purchase], [])
+            assert block.add_factoid_transaction(tx)
+            assert block.available_credits(bytes(32)) == 2
+            assert block.add_commit(make_commit(bytes([1]) * 32))
+            assert block.add_commit(make_commit(bytes([2]) * 32))
+            assert not block.add_commit(make_commit(bytes([3]) * 32))
+
+            increase = block.entry_credit_block.objects[0][0]
+            assert (increase.ec_public_key, increase.tx_id, increase.quantity) == (bytes(32), tx.tx_id, 2)
+            db.close()
@@ -1,6 +1,12 @@
 import unittest
 
-from factom_core.blocks import AdminBlock
+from factom_core.block_elements.admin_messages import (
+    AddAuthorityEfficiency,
+    AddAuthorityFactoidAddress,
+    CoinbaseDescriptorCancel,
+    ServerFaultHandoff,
+)
+from factom_core.blocks import AdminBlock, AdminBlockBody
 
 
 class TestAdminBlock(unittest.TestCase):
@@ -119,3 +125,20 @@ class TestAdminBlock(unittest.TestCase):
         assert block.lookup_hash.hex() == expected_lookup_hash, "{} != {}".format(
             block.lookup_hash.hex(), expected_lookup_hash
         )
+
+
+class TestAdminBlockBody(unittest.TestCase):
+    def test_variable_and_fixed_size_messages(self):
+        chain_id = bytes.fromhex("888888655866a003faabd999c7b0a7c908af17d63fd2ac2951dc99e1ad2a14f4")
+        body = AdminBlockBody(
+            messages=[
+                AddAuthorityEfficiency(chain_id=chain_id, efficiency_percentage=5000),
+                CoinbaseDescriptorCancel(descriptor_height=70000, descriptor_index=3),
+                ServerFaultHandoff(),
+                AddAuthorityFactoidAddress(chain_id=chain_id, fct_address=bytes(32)),
+            ]
+        )
+        raw = body.marshal()
+        unmarshalled = AdminBlockBody.unmarshal(raw, message_count=4)
+        assert unmarshalled == body
+        assert unmarshalled.marshal() == raw
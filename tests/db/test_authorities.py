@@ -0,0 +1,36 @@
+import unittest
+
+import factom_core.blocks as blocks
+from factom_core.block_elements.admin_messages import (
+    AddFederatedServer,
+    AddFederatedServerSigningKey,
+    RemoveFederatedServer,
+)
+from factom_core.db import AuthoritySet
+
+
+class TestAuthoritySet(unittest.TestCase):
+    @staticmethod
+    def admin_block(height: int, messages: list) -> blocks.AdminBlock:
+        body = blocks.AdminBlockBody(messages=messages)
+        return blocks.AdminBlock(body.construct_header(bytes(32), height=height), body)
+
+    def test_activation(self):
+        authorities = AuthoritySet()
+        assert authorities.keys() == set()
+        authorities.bootstrap_key = b"\xbb" * 32
+        assert authorities.keys() == {b"\xbb" * 32}
+
+        server = b"\x01" * 32
+        changes = [AddFederatedServer(server, 12), AddFederatedServerSigningKey(server, 0, b"\x11" * 32, 12)]
+        authorities.apply_admin_block(self.admin_block(10, changes))
+        authorities.apply_admin_block(self.admin_block(11, []))
+        assert authorities.keys() == {b"\xbb" * 32}  # not active yet
+
+        restored = AuthoritySet.unmarshal(authorities.marshal())
+        assert restored.marshal() == authorities.marshal()
+        authorities.apply_admin_block(self.admin_block(12, [RemoveFederatedServer(server, 13)]))
+        assert authorities.keys() == {b"\x11" * 32}
+        assert authorities.quorum() == 1
+        authorities.apply_admin_block(self.admin_block(13, []))
+        assert authorities.keys() == {b"\xbb" * 32}
@@ -0,0 +1,187 @@
+import tempfile
+import unittest
+
+import factom_core.block_elements as block_elements
+import factom_core.blocks as blocks
+from factom_core.db import FactomdLevelDB, leveldb
+from fixtures import vectors
+
+
+def make_factoid_block(height: int, prev_keymr: bytes, txs: list) -> blocks.FactoidBlock:
+    body = blocks.FactoidBlockBody(transactions={minute: txs if minute == 1 else [] for minute in range(1, 11)})
+    header = body.construct_header(prev_keymr, bytes(32), ec_exchange_rate=1000, height=height)
+    return blocks.FactoidBlock(header, body)
+
+
+class TestFactomdLevelDB(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db = FactomdLevelDB(path=self.directory.name, create_if_missing=True)
+
+    def tearDown(self):
+        self.db.close()
+        self.directory.cleanup()
+
+    def test_chain_head_links(self):
+        chain_id = bytes([1]) * 32
+        body = blocks.EntryBlockBody(entry_hashes={1: [bytes([2]) * 32, bytes([3]) * 32], 4: [bytes([5]) * 32]})
+        header = body.construct_header(chain_id, bytes(32), bytes(32), sequence=7, height=99)
+        head = blocks.EntryBlock(header, body)
+        self.db.put_entry_block_head(head)
+
+        links = self.db.get_chain_head_links([chain_id, bytes(32)])
+        assert list(links) == [chain_id]
+        assert links[chain_id] == (head.keymr, head.full_hash, 7)
+        assert self.db.get_entry_block_head(chain_id).keymr == head.keymr
+
+        # A chain whose head entry block isn't stored (filtered out, or pruned) has no link
+        self.db.put_chain_head(bytes([2]) * 32, bytes([3]) * 32)
+        links = self.db.get_chain_head_links([chain_id, bytes([2]) * 32])
+        assert links == {chain_id: (head.keymr, head.full_hash, 7), bytes([2]) * 32: None}
+
+    def test_outer_batch(self):
+        chain_id = bytes([1]) * 32
+        body = blocks.EntryBlockBody(entry_hashes={1: [bytes([2]) * 32]})
+        header = body.construct_header(chain_id, bytes(32), bytes(32), sequence=0, height=5)
+        block = blocks.EntryBlock(header, body)
+
+        # Nothing given an outer batch is written until it is, and a failure part way through writes nothing at all
+        with self.assertRaises(RuntimeError):
+            with self.db.write_batch() as batch:
+                self.db.put_entry_block_head(block, batch)
+                assert self.db.get_entry_block(block.keymr) is None
+                raise RuntimeError
+        assert self.db.get_entry_block(block.keymr) is None
+
+        with self.db.write_batch() as batch:
+            self.db.put_entry_block_head(block, batch)
+        assert self.db.get_entry_block(block.keymr).keymr == block.keymr
+
+    def test_chain_head_table(self):
+        heads = {bytes([i]) * 32: bytes([i + 1]) * 32 for i in range(5)}
+        for chain_id, head in heads.items():
+            self.db.put_chain_head(chain_id, head)
+
+        table = self.db.load_chain_heads()
+        assert len(table) == 5 and table.memory_usage() > 0
+        assert self.db.get_chain_head(bytes(32)) == heads[bytes(32)]
+
+        # Updates are served from memory straight away, but only reach the database on commit
+        self.db.put_chain_head(bytes(32), bytes([9]) * 32)
+        assert self.db.get_chain_head(bytes(32)) == bytes([9]) * 32
+        assert self.db._db.prefixed_db(b"ChainHead;").get(bytes(32)) == heads[bytes(32)]
+        self.db.commit_chain_heads()
+        assert table.pending == 0
+        assert self.db._db.prefixed_db(b"ChainHead;").get(bytes(32)) == bytes([9]) * 32
+
+    def test_entry_block_by_chain_height(self):
+        references = [blocks.EntryBlockReference(bytes([i]) * 32, bytes([i + 100]) * 32) for i in range(1, 4)]
+        body = blocks.DirectoryBlockBody(bytes(32), bytes(32), bytes(32), entry_blocks=references)
+        header = body.construct_header(b"\xfa\x92\xe5\xa4", bytes(32), bytes(32), timestamp=0, height=12)
+        block = blocks.DirectoryBlock(header, body)
+        self.db.put_directory_block(block)
+
+        for reference in references:
+            assert block.find_entry_block(reference.chain_id) == reference.keymr
+            assert self.db.get_entry_block_keymr(reference.chain_id, 12) == reference.keymr
+        assert block.find_entry_block(bytes(32)) is None
+        assert self.db.get_entry_block_keymr(references[0].chain_id, 11) is None
+        assert self.db.get_entry_block_keymr(bytes(32), 12) is None
+
+        # Databases from before the index was written get it from the stored directory blocks
+        for key in list(self.db._db.iterator(prefix=leveldb.ENTRY_BLOCK_BY_CHAIN_HEIGHT, include_value=False)):
+            self.db._db.delete(key)
+        assert self.db.get_entry_block_keymr(references[0].chain_id, 12) is None
+        assert self.db.backfill_entry_block_index(batch_size=1) == 1
+        for reference in references:
+            assert self.db.get_entry_block_keymr(reference.chain_id, 12) == reference.keymr
+
+    def test_factoid_balances(self):
+        raw = bytes.fromhex(vectors.FACTOID_TRANSACTION)
+        tx = block_elements.FactoidTransaction.unmarshal(raw)
+        funding = [block_elements.TransactionIO(10 ** 9, tx.inputs[0].fct_address)]
+        coinbase = block_elements.FactoidTransaction(0, [], funding, [], [])
+        prev_keymr = bytes(32)
+        for height, txs in enumerate([[coinbase], [tx], [tx]]):
+            block = make_factoid_block(height, prev_keymr, txs)
+            self.db.put_factoid_block_head(block)
+            prev_keymr = block.keymr
+        self.db.put_factoid_block_head(block)  # already applied, so ignored
+
+        expected = {tx.inputs[0].fct_address: 10 ** 9}
+        for i in tx.inputs:
+            expected[i.fct_address] = expected.get(i.fct_address, 0) - 2 * i.value
+        for o in tx.outputs:
+            expected[o.fct_address] = expected.get(o.fct_address, 0) + 2 * o.value
+        for address, balance in expected.items():
+            assert self.db.get_factoid_balance(address) == balance
+        assert self.db.get_factoid_balance(bytes(32)) == 0
+
+        assert self.db.factoid_balances.pending == 0  # written with each block
+        assert self.db.rebuild_factoid_balances(workers=1) == 3
+        assert self.db.factoid_balances.height == 2
+        for address, balance in expected.items():
+            assert self.db.get_factoid_balance(address) == balance
+
+    def test_entry_credit_balances(self):
+        key = bytes([7]) * 32
+        objects = [
+            [block_elements.BalanceIncrease(ec_public_key=key, tx_id=bytes(32), index=0, quantity=50)],
+            [
+                block_elements.EntryCommit(0, bytes([1]) * 32, 3, key, bytes(64)),
+                block_elements.ChainCommit(0, bytes(32), bytes(32), bytes([2]) * 32, 12, key, bytes(64)),
+            ],
+        ]
+        for height, minute_objects in enumerate(objects):
+            body = blocks.EntryCreditBlockBody(objects={1: minute_objects})
+            header = body.construct_header(bytes(32), bytes(32), height=height)
+            self.db.put_entry_credit_block_head(blocks.EntryCreditBlock(header, body))
+        assert self.db.get_entry_credit_balance(key) == 35
+        assert self.db.entry_credit_balances.pending == 0  # written with each block
+
+        assert self.db.rebuild_entry_credit_balances(workers=1) == 2
+        assert self.db.get_entry_credit_balance(key) == 35
+
+    def test_factoid_transaction_indexes(self):
+        tx = block_elements.FactoidTransaction.unmarshal(
+            bytes.fromhex(vectors.FACTOID_TRANSACTION)
+        )
+        address = tx.inputs[0].fct_address
+        coinbase = block_elements.FactoidTransaction(0, [], [block_elements.TransactionIO(10 ** 9, address)], [], [])
+        self.db.put_factoid_block(make_factoid_block(0, bytes(32), [coinbase]))
+        self.db.put_factoid_block(make_factoid_block(5, bytes(32), [coinbase, tx]))
+
+        assert self.db.get_factoid_transaction(tx.tx_id) == tx
+        assert self.db.get_factoid_transaction(bytes(32)) is None
+
+        history = self.db.get_address_history(address)
+        assert history == [(0, 0, coinbase.tx_id), (5, 0, coinbase.tx_id), (5, 1, tx.tx_id)]
+        assert self.db.get_address_history(address, limit=2) == history[:2]
+        assert self.db.get_address_history(address, start_height=5, start_position=1) == history[2:]
+        assert self.db.get_address_history(bytes(32)) == []
+
+        # Rewriting the indexes from the stored blocks gives the same answers
+        self.db._db.delete(b"FactoidTransaction;" + tx.tx_id)
+        assert self.db.backfill_factoid_indexes(batch_size=1) == 2
+        assert self.db.get_factoid_transaction(tx.tx_id) == tx
+        assert self.db.get_address_history(address) == history
+
+    def test_iter_directory_blocks_by_chain(self):
+        chain_id = bytes([1]) * 32
+        for height in range(6):
+            chain_ids = [bytes([height + 10]) * 32] + ([chain_id] if height % 2 == 0 else [])
+            references = [blocks.EntryBlockReference(c, bytes([height]) * 32) for c in chain_ids]
+            body = blocks.DirectoryBlockBody(bytes(32), bytes(32), bytes(32), entry_blocks=references)
+            header = body.construct_header(b"\xfa\x92\xe5\xa4", bytes(32), bytes(32), timestamp=0, height=height)
+            self.db.put_directory_block(blocks.DirectoryBlock(header, body))
+
+        assert [b.header.height for b in self.db.iter_directory_blocks()] == list(range(6))
+        assert [b.header.height for b in self.db.iter_directory_blocks(1, 4)] == [1, 2, 3]
+        assert [b.header.height for b in self.db.iter_directory_blocks(chain_id=chain_id)] == [0, 2, 4]
+        assert chain_id in self.db.get_directory_block_bloom(2)
+        assert chain_id not in self.db.get_directory_block_bloom(1)
+
+        self.db._db.delete(b"DirectoryBlockBloom;" + bytes(4))
+        assert [b.header.height for b in self.db.iter_directory_blocks(chain_id=chain_id)] == [0, 2, 4]
+        assert self.db.rebuild_directory_block_blooms() == 6
+        assert chain_id in self.db.get_directory_block_bloom(0)
@@ -0,0 +1,89 @@
+import tempfile
+import unittest
+
+import factom_core.blocks as blocks
+from factom_core.block_elements import Entry
+from factom_core.db import FactomdLevelDB, Pruner
+from factom_core.utils.filters import SyncFilter
+
+
+class TestPruner(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db = FactomdLevelDB(path=self.directory.name, create_if_missing=True)
+        self.entries = {}  # height --> (identity entry, other entry)
+        for height in range(5):
+            identity = Entry(b"\x88\x88\x88" + bytes(29), [], bytes([height]))
+            other = Entry(bytes([1]) * 32, [], bytes([height]))
+            self.put_block(height, [identity, other])
+            self.entries[height] = (identity, other)
+
+    def put_block(self, height: int, entries: list):
+        references = []
+        for entry in entries:
+            body = blocks.EntryBlockBody(entry_hashes={1: [entry.entry_hash]})
+            header = body.construct_header(entry.chain_id, bytes(32), bytes(32), sequence=height, height=height)
+            entry_block = blocks.EntryBlock(header, body)
+            self.db.put_entry_block(entry_block)
+            self.db.put_entry(entry)
+            references.append(blocks.EntryBlockReference(entry.chain_id, entry_block.keymr))
+
+        factoid_body = blocks.FactoidBlockBody(transactions={minute: [] for minute in range(1, 11)})
+        factoid_header = factoid_body.construct_header(bytes(32), bytes(32), ec_exchange_rate=1000, height=height)
+        factoid_block = blocks.FactoidBlock(factoid_header, factoid_body)
+        self.db.put_factoid_block(factoid_block)
+
+        body = blocks.DirectoryBlockBody(bytes(32), bytes(32), factoid_block.keymr, entry_blocks=references)
+        header = body.construct_header(b"\xfa\x92\xe5\xa4", bytes(32), bytes(32), timestamp=0, height=height)
+        self.db.put_directory_block_head(blocks.DirectoryBlock(header, body))
+
+    def tearDown(self):
+        self.db.close()
+        self.directory.cleanup()
+
+    def test_prune_old_blocks_and_unwanted_chains(self):
+        pruner = Pruner(self.db, keep_blocks=2, keep_chains=SyncFilter(), prune_factoid_blocks=True, batch_size=1)
+        assert pruner.run() > 0
+        assert pruner.run() == 0
+
+        for height, (identity, other) in self.entries.items():
+            assert self.db.get_entry(other.entry_hash) is None
+            assert (self.db.get_entry(identity.entry_hash) is None) == (height < 3)
+            directory_block = self.db.get_directory_block(height=height)
+            assert all(self.db.get_entry_block(e.keymr) is not None for e in directory_block.body.entry_blocks)
+            factoid_keymr = directory_block.body.factoid_block_keymr
+            assert (self.db.get_factoid_block(keymr=factoid_keymr) is None) == (height < 3)
+            assert self.db.get_factoid_block_header(factoid_keymr).height == height
+
+        # Progress is kept in the database
+        pruner = Pruner(self.db, keep_blocks=2, keep_chains=SyncFilter())
+        assert (pruner.pruned_height, pruner.filtered_height) == (3, 5)
+
+    def test_repeat_entries_are_kept(self):
+        repeated = self.entries[1][1]
+        self.put_block(5, [repeated])  # revealed again, in a block that's kept
+        assert Pruner(self.db, keep_blocks=2).run() > 0
+        assert self.db.get_entry(self.entries[0][1].entry_hash) is None
+        assert self.db.get_entry(repeated.entry_hash).content == repeated.content
+
+    def test_repeat_entries_across_steps(self):
+        pruner = Pruner(self.db, keep_blocks=2, batch_size=1)
+        assert pruner.step() > 0 and pruner.pruned_height == 1
+        assert pruner._kept_scanned[bytes([1]) * 32] == 5  # the blocks from the age target to the head were read
+
+        # Later steps only read the blocks written since
+        repeated = self.entries[2][1]
+        self.put_block(5, [repeated])
+        assert pruner.step() > 0 and pruner._kept_scanned[bytes([1]) * 32] == 6
+        assert pruner.run() > 0 and pruner.pruned_height == 4
+        assert self.db.get_entry(self.entries[1][1].entry_hash) is None
+        assert self.db.get_entry(self.entries[3][1].entry_hash) is None
+        assert self.db.get_entry(repeated.entry_hash).content == repeated.content
+        assert pruner._kept == {}
+
+    def test_pruned_factoid_blocks(self):
+        Pruner(self.db, keep_blocks=2, prune_factoid_blocks=True).run()
+        assert self.db.has_pruned_factoid_blocks()
+        assert self.db.backfill_factoid_indexes() == 2
+        with self.assertRaises(ValueError):
+            self.db.rebuild_factoid_balances(workers=1)
@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+
+import factom_core.blocks as blocks
+from factom_core.block_elements import Entry
+from factom_core.db import FactomdLevelDB, ReadServer, connect
+from factom_core.db import leveldb, read_service
+
+
+class TestReadService(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db = FactomdLevelDB(path=self.directory.name, create_if_missing=True)
+        self.db.load_chain_heads()
+        self.server = ReadServer(self.db, os.path.join(self.directory.name, "db.sock"))
+        self.server.start()
+        self.remote = connect(self.server.path)
+
+    def tearDown(self):
+        self.remote.close()
+        self.server.stop()
+        self.db.close()
+        self.directory.cleanup()
+
+    def test_reads(self):
+        entry = Entry(bytes(32), [b"external id"], b"content")
+        body = blocks.EntryBlockBody(entry_hashes={1: [entry.entry_hash]})
+        header = body.construct_header(entry.chain_id, bytes(32), bytes(32), sequence=0, height=0)
+        entry_block = blocks.EntryBlock(header, body)
+        self.db.put_entry_block_head(entry_block)
+        self.db.put_entry(entry)
+
+        assert self.remote.get_entry(entry.entry_hash).to_dict() == entry.to_dict()
+        assert self.remote.get_entry_block(entry_block.keymr).keymr == entry_block.keymr
+        assert self.remote.get_entry(bytes(32)) is None
+        assert self.remote.get_entry_block_head(entry.chain_id).keymr == entry_block.keymr  # written with the block
+
+        remote_db = self.remote._db
+        assert remote_db.multi_get([leveldb.ENTRY + entry.entry_hash, b"missing"]) == [entry.chain_id, None]
+
+    def test_iterator(self):
+        for i in range(2500):
+            self.db._db.put(b"Test;" + i.to_bytes(4, "big"), bytes([i % 256]))
+        self.db._db.put(b"Tesu;", b"")
+
+        remote_db = self.remote._db
+        assert list(remote_db.iterator(prefix=b"Test;")) == list(self.db._db.iterator(prefix=b"Test;"))
+        start, stop = b"Test;" + (10).to_bytes(4, "big"), b"Test;" + (1010).to_bytes(4, "big")
+        assert list(remote_db.iterator(start=start, stop=stop, include_key=False)) == [
+            bytes([i % 256]) for i in range(10, 1010)
+        ]
+        assert read_service.prefix_stop(b"a\xff") == b"b"
+
+    def test_read_only(self):
+        with self.assertRaisesRegex(NotImplementedError, "no snapshots"):
+            list(self.remote.iter_directory_blocks())
+        with self.assertRaisesRegex(NotImplementedError, "read-only"):
+            self.remote.put_entry(Entry(bytes(32), [], b"content"))
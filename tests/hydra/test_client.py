@@ -0,0 +1,53 @@
+import click
+import os
+import sys
+import threading
+import unittest
+from click.testing import CliRunner
+from wsgiref.simple_server import WSGIRequestHandler, make_server
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "hydra"))  # hydra runs as a script
+from hydra import hydra as cli  # noqa: E402
+from rpc import server  # noqa: E402
+
+ADDRESS = "FA2jK2HcLnRdS94dEcU27rF3meoJfpUcZPSinpb7AwQvPRY6RL1Q"
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+@click.command()
+@click.argument("address")
+@click.option("--limit", type=int)
+@cli.pass_client
+def history(client, address: str, limit: int):
+    cli.print_result(client.get_address_history(address, limit=limit))
+
+
+class TestHydraClient(unittest.TestCase):
+    def setUp(self):
+        self.httpd = make_server("localhost", 0, server.app, handler_class=QuietHandler)
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def invoke(self, *args):
+        obj = {"host": "localhost", "port": self.httpd.server_port}
+        return CliRunner().invoke(history, args, obj=obj), obj
+
+    def test_error_responses(self):
+        # The server's error body is printed, as it was before the client, rather than raised
+        result, obj = self.invoke(ADDRESS, "--limit", "-1")
+        assert result.exit_code == 0, result.output
+        assert "Query parameter limit must be a non-negative integer" in result.output
+
+        result, _ = self.invoke(ADDRESS[:-1] + "2", "--limit", "1")
+        assert result.output.strip() == cli.ERROR_NOT_FOUND
+
+        # The client is created for the command that asked for it, and its connections closed when the command exits
+        adapters = obj["client"].session.adapters.values()
+        assert all(len(adapter.poolmanager.pools) == 0 for adapter in adapters)
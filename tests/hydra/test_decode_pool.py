@@ -0,0 +1,24 @@
+import os
+import sys
+import unittest
+
+from factom_core.messages import DirectoryBlockState
+from fixtures import vectors
+from tests.messages import test_index
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "hydra"))  # hydra runs as a script
+from decode_pool import MessageHandle, prevalidate  # noqa: E402
+
+
+class TestDecodePool(unittest.TestCase):
+    def test_prevalidate(self):
+        state = bytes.fromhex(vectors.DIRECTORY_BLOCK_STATE)
+        normal = test_index.TestMessageIndex.message_data
+        # Unknown types and bad DBStates are dropped, and the rest keep the order they arrived in
+        handles = prevalidate([normal, state, b"\xff", b"", state[:-1], normal, state])
+        assert handles == [
+            MessageHandle(normal[0], normal),
+            MessageHandle(DirectoryBlockState.TYPE, state),
+            MessageHandle(normal[0], normal),
+            MessageHandle(DirectoryBlockState.TYPE, state),
+        ]
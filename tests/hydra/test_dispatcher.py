@@ -0,0 +1,121 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import factom_core.primitives as primitives
+from factom_core.blockchains import LocalBlockchain, PendingBlock
+from factom_core.messages import Ack, DirectoryBlockState, EndOfMinute, unmarshal_message
+from factom_core.vm import ShardedExecutor
+from fixtures import vectors
+from tests.messages import test_index
+from tests.vm import test_sharding
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "hydra"))  # hydra runs as a script
+from decode_pool import MessageHandle  # noqa: E402
+from dispatcher import BULK, HIGH, NORMAL, Dispatcher, lane_for_type  # noqa: E402
+
+
+def make_handle(raw: bytes) -> MessageHandle:
+    return MessageHandle(raw[0], raw)
+
+
+class TestDispatcher(unittest.TestCase):
+    def setUp(self):
+        ack = Ack(
+            vm_index=0,
+            timestamp=bytes(6),
+            salt=bytes(8),
+            salt_number=0,
+            message_hash=bytes(32),
+            full_message_hash=bytes(32),
+            leader_chain_id=bytes(32),
+            height=1,
+            process_list_height=0,
+            minute=0,
+            serial_hash=bytes(32),
+            data_area=b"",
+            signature=primitives.FullSignature(bytes(32), bytes(64)),
+        )
+        self.ack = make_handle(ack.marshal())
+        self.state = make_handle(bytes.fromhex(vectors.DIRECTORY_BLOCK_STATE))
+        self.normal = make_handle(test_index.TestMessageIndex.message_data)
+        self.handled = []
+        self.dispatcher = Dispatcher(blockchain=None)
+        for handle in [self.ack, self.state, self.normal]:
+            self.dispatcher.register(handle.type, self.handled.append)
+
+    def test_lanes(self):
+        assert [lane_for_type(h.type) for h in [self.ack, self.normal, self.state]] == [HIGH, NORMAL, BULK]
+        self.dispatcher.submit([self.state, self.state, self.normal, self.ack])
+        assert self.dispatcher.dispatch(max_messages=2) == 2
+        assert [type(msg) for msg in self.handled] == [Ack, type(unmarshal_message(self.normal.raw))]
+
+        self.dispatcher.submit([self.ack])  # jumps the remaining backlog of DirectoryBlockStates
+        assert self.dispatcher.dispatch() == 3
+        assert [type(msg) for msg in self.handled[2:]] == [Ack, DirectoryBlockState, DirectoryBlockState]
+
+    def test_metrics(self):
+        def fail_once(msg):
+            self.dispatcher.register(self.normal.type, self.handled.append)
+            raise ValueError("bad message")
+
+        self.dispatcher.register(self.normal.type, fail_once)
+        self.dispatcher.submit([self.normal, self.normal, self.ack])
+        assert self.dispatcher.metrics[self.normal.type].depth == 2
+        self.dispatcher.dispatch()
+
+        metrics = self.dispatcher.metrics[self.normal.type]
+        assert (metrics.depth, metrics.processed, metrics.failed) == (0, 1, 1)
+        assert metrics.to_dict()["mean_latency_ms"] == 1000 * metrics.total_latency / 2
+        assert metrics.max_latency <= metrics.total_latency
+        snapshot = self.dispatcher.get_metrics()
+        assert snapshot["Ack"]["processed"] == 1
+
+    def test_sharded(self):
+        chain_id = bytes(32)
+        reveal = test_sharding.make_reveal(chain_id, b"content")
+        commit = test_sharding.make_commit(reveal.entry.entry_hash)
+
+        def end_of_minute(vm_index: int) -> MessageHandle:
+            msg = EndOfMinute(
+                timestamp=bytes(6),
+                chain_id=bytes(32),
+                minute=0,
+                vm_index=vm_index,
+                factoid_vm=0,
+                height=1,
+                system_height=0,
+                system_hash=bytes(32),
+                b=0,
+                signature=primitives.FullSignature(bytes(32), bytes(64)),
+            )
+            return make_handle(msg.marshal())
+
+        executor = ShardedExecutor(workers=3)
+        executor.start()  # before the database is opened, as the node does
+        with tempfile.TemporaryDirectory() as path:
+            blockchain = LocalBlockchain(data_path=path)
+            blockchain.vms = [0, 1]
+            blockchain.current_block = PendingBlock(previous=object())
+            executor.vm_count = blockchain.vm_count
+            blockchain.executor = executor
+            try:
+                dispatcher = Dispatcher(blockchain)
+                dispatcher.submit([make_handle(m.raw) for m in [reveal, commit]] + [end_of_minute(0)])
+                assert dispatcher.pending() == 1  # the reveal and commit went to the executor's workers
+                dispatcher.dispatch()
+                assert blockchain.current_block.current_minute == 0  # waiting for the other VM
+                assert dispatcher.get_metrics().get("EntryReveal") is None
+
+                dispatcher.submit([end_of_minute(1), end_of_minute(1)])
+                dispatcher.dispatch()
+            finally:
+                executor.stop()
+                blockchain.db.close()
+
+        block = blockchain.current_block
+        assert block.current_minute == 1  # sealed once, by the last VM to end it
+        assert block.entry_blocks[chain_id].entry_hashes == {0: [reveal.entry.entry_hash]}
+        metrics = dispatcher.get_metrics()
+        assert metrics["EntryReveal"]["processed"] == 1 and metrics["EndOfMinute"]["processed"] == 3
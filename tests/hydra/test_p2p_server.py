@@ -0,0 +1,88 @@
+import asyncio
+import os
+import queue
+import sys
+import unittest
+
+from p2p.duplicate_filter import DuplicateFilter
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "hydra"))  # hydra runs as a script
+from p2p_server import FRAME_HEADER, MAX_FRAME_SIZE, P2PServer, encode_frame  # noqa: E402
+
+
+class FakeWriter:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def connect(server: P2PServer, data: bytes, chunk_size: int = None):
+    """A connection that has written `data` (in chunks of `chunk_size`) and hung up, and its handler"""
+    reader, writer = asyncio.StreamReader(), FakeWriter()
+    chunk_size = len(data) if chunk_size is None else chunk_size
+    for i in range(0, len(data), chunk_size):
+        reader.feed_data(data[i : i + chunk_size])
+    reader.feed_eof()
+    return writer, asyncio.ensure_future(server.handle_connection(reader, writer))
+
+
+def drain(q: asyncio.Queue) -> list:
+    items = []
+    while not q.empty():
+        items.append(q.get_nowait())
+    return items
+
+
+class TestP2PServer(unittest.TestCase):
+    def test_framing(self):
+        async def run():
+            server = P2PServer(queue.Queue(), duplicate_filter=DuplicateFilter(duration=60, cleanup=60))
+            server.queue = asyncio.Queue(maxsize=server.queue_size)
+            payloads = [b"\x01" * 3, b"\x02" * 70000, b"\x01" * 3, b"\x03"]
+
+            # Frames split across reads at every byte are reassembled, and the re-gossiped copy is dropped
+            writer, handler = connect(server, b"".join(map(encode_frame, payloads)), chunk_size=1)
+            await handler
+            assert drain(server.queue) == [payloads[0], payloads[1], payloads[3]]
+            assert (server.messages_received, server.duplicates_dropped) == (4, 1)
+            assert writer.closed and server.connections == 0
+
+            # A bad frame size drops the connection, without reading anything after it
+            for size in [0, MAX_FRAME_SIZE + 1]:
+                writer, handler = connect(server, FRAME_HEADER.pack(size) + encode_frame(b"\x04"))
+                await handler
+                assert writer.closed and server.queue.empty()
+
+            # A connection closing part way through a frame loses only that frame
+            writer, handler = connect(server, encode_frame(b"\x05") + encode_frame(b"\x06" * 10)[:-1])
+            await handler
+            assert drain(server.queue) == [b"\x05"]
+
+        asyncio.run(run())
+
+    def test_backpressure(self):
+        async def run():
+            raw_inbox = queue.Queue()
+            server = P2PServer(raw_inbox, batch_size=2, queue_size=2)
+            server.queue = asyncio.Queue(maxsize=server.queue_size)
+            payloads = [bytes([i]) for i in range(5)]
+
+            # With nothing forwarding, reading stops once the buffer is full: two queued, one waiting for room
+            writer, handler = connect(server, b"".join(map(encode_frame, payloads)))
+            await asyncio.sleep(0.01)
+            assert server.queue.full() and server.messages_received == 3
+            assert not handler.done()
+
+            # Forwarding makes room, and the rest of the connection is read in batches of at most `batch_size`
+            forwarder = asyncio.ensure_future(server.forward_messages())
+            await handler
+            batches = []
+            while sum(map(len, batches)) < len(payloads):
+                batches.append(await asyncio.get_event_loop().run_in_executor(None, raw_inbox.get, True, 1))
+            forwarder.cancel()
+            assert all(len(batch) <= 2 for batch in batches)
+            assert [payload for batch in batches for payload in batch] == payloads
+
+        asyncio.run(run())
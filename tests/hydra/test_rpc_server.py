@@ -0,0 +1,47 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from wsgiref.util import setup_testing_defaults
+
+import factom_core.blocks as blocks
+from factom_core.db import FactomdLevelDB
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "hydra"))  # hydra runs as a script
+from rpc import server  # noqa: E402
+
+
+def get(path: str, query: str = ""):
+    environ = {"PATH_INFO": path, "QUERY_STRING": query}
+    setup_testing_defaults(environ)
+    response = {}
+    body = server.app(environ, lambda status, headers, exc_info=None: response.update(status=status))
+    return response["status"], b"".join(body)
+
+
+class TestRpcServer(unittest.TestCase):
+    def test_bad_query_parameters(self):
+        path = f"{server.RestPaths.ADDRESS.value}/FA2jK2HcLnRdS94dEcU27rF3meoJfpUcZPSinpb7AwQvPRY6RL1Q/transactions"
+        for query in ["limit=ten", "start_height=-1", "start_position=1.5"]:
+            status, body = get(path, query)
+            assert status.startswith("400"), query
+            assert "must be a non-negative integer" in json.loads(body)["errors"]["detail"]
+
+    def test_entry_credit_block_by_header_hash(self):
+        with tempfile.TemporaryDirectory() as path:
+            server._db = FactomdLevelDB(path=path, create_if_missing=True)
+            try:
+                body = blocks.EntryCreditBlockBody(objects={minute: [] for minute in range(1, 11)})
+                header = body.construct_header(prev_header_hash=bytes(32), prev_full_hash=bytes(32), height=0)
+                block = blocks.EntryCreditBlock(header, body)
+                server._db.put_entry_credit_block_head(block)
+
+                status, body = get(f"{server.RestPaths.ENTRY_CREDIT_BLOCK.value}/{block.header_hash.hex()}")
+                assert status.startswith("200")
+                assert json.loads(body) == json.loads(json.dumps(block.to_dict()))
+                status, _ = get(f"{server.RestPaths.ENTRY_CREDIT_BLOCK.value}/{bytes(32).hex()}")
+                assert status.startswith("404")
+            finally:
+                server._db.close()
+                server._db = None
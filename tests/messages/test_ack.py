@@ -0,0 +1,35 @@
+import unittest
+
+import ed25519
+
+import factom_core.primitives as primitives
+from factom_core.messages import Ack, unmarshal_message
+
+
+class TestAck(unittest.TestCase):
+    def test_validate_signature(self):
+        signer, verifier = ed25519.create_keypair()
+        ack = Ack(
+            vm_index=0,
+            timestamp=bytes(6),
+            salt=bytes(8),
+            salt_number=0,
+            message_hash=bytes(32),
+            full_message_hash=bytes(32),
+            leader_chain_id=bytes(32),
+            height=1,
+            process_list_height=0,
+            minute=0,
+            serial_hash=bytes(32),
+            data_area=b"",
+            signature=primitives.FullSignature(verifier.to_bytes(), bytes(64)),
+        )
+        unsigned = unmarshal_message(ack.marshal())
+        assert not unsigned.validate_signature()
+
+        ack.signature = primitives.FullSignature(verifier.to_bytes(), signer.sign(unsigned.marshal_for_signature()))
+        signed = unmarshal_message(ack.marshal())
+        assert signed.validate_signature()
+
+        ack.minute = 1
+        assert not unmarshal_message(ack.marshal()).validate_signature()
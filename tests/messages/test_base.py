@@ -0,0 +1,35 @@
+import unittest
+
+import factom_core.messages as messages
+from factom_core.messages import MESSAGE_TYPES, unmarshal_message, unmarshal_messages
+
+
+class TestUnmarshalMessage(unittest.TestCase):
+
+    missing_data_request = bytes.fromhex("11deadbeef00000000000000000000000000000000000000000000000000000000000000000000")
+    block_request = bytes.fromhex("0edeadbeef0000")
+
+    def test_registry(self):
+        assert MESSAGE_TYPES[messages.Ack.TYPE] is messages.Ack
+        assert MESSAGE_TYPES[messages.DirectoryBlockState.TYPE] is messages.DirectoryBlockState
+        assert MESSAGE_TYPES[messages.MissingMessageResponse.TYPE] is messages.MissingMessageResponse
+        assert len([cls for cls in MESSAGE_TYPES if cls is not None]) == 18
+
+    def test_unmarshal_message(self):
+        msg = unmarshal_message(self.missing_data_request)
+        assert isinstance(msg, messages.MissingDataRequest)
+        with self.assertRaises(ValueError):
+            unmarshal_message(b"\xff")
+
+    def test_unmarshal_messages(self):
+        raws = [self.missing_data_request, self.block_request, self.missing_data_request]
+        grouped = unmarshal_messages(raws)
+        assert set(grouped.keys()) == {messages.MissingDataRequest.TYPE, messages.BlockRequest.TYPE}
+        assert len(grouped[messages.MissingDataRequest.TYPE]) == 2
+        assert len(grouped[messages.BlockRequest.TYPE]) == 1
+        assert grouped[messages.BlockRequest.TYPE][0].marshal() == self.block_request
+
+        with self.assertRaises(ValueError):
+            unmarshal_messages(raws + [b"\xff"])
+        grouped = unmarshal_messages(raws + [b"\xff", self.block_request + b"\x00"], skip_invalid=True)
+        assert len(grouped[messages.BlockRequest.TYPE]) == 1
@@ -0,0 +1,81 @@
+import hashlib
+import unittest
+
+import factom_core.block_elements as block_elements
+import factom_core.primitives as primitives
+from factom_core.messages import Ack, ChainCommit, MessageIndex, MissingMessageResponse, unmarshal_message
+
+
+class TestMessageIndex(unittest.TestCase):
+
+    message_data = bytes.fromhex("11deadbeef00000000000000000000000000000000000000000000000000000000000000000000")
+
+    def make_ack(self, msg) -> Ack:
+        ack = Ack(
+            vm_index=0,
+            timestamp=bytes(6),
+            salt=bytes(8),
+            salt_number=0,
+            message_hash=msg.hash,
+            full_message_hash=msg.full_hash,
+            leader_chain_id=bytes(32),
+            height=1,
+            process_list_height=0,
+            minute=0,
+            serial_hash=msg.hash,
+            data_area=b"",
+            signature=primitives.FullSignature(bytes(32), bytes(64)),
+        )
+        return unmarshal_message(ack.marshal())
+
+    def test_message_hashes(self):
+        msg = unmarshal_message(self.message_data)
+        assert msg.raw == self.message_data
+        assert msg.hash == hashlib.sha256(self.message_data).digest()
+        assert msg.full_hash == msg.hash  # unsigned
+
+        ack = self.make_ack(msg)
+        assert ack.full_hash == hashlib.sha256(ack.raw).digest()
+        assert ack.hash == hashlib.sha256(ack.raw[:-96]).digest()
+
+    def test_pairing(self):
+        msg = unmarshal_message(self.message_data)
+        ack = self.make_ack(msg)
+        index = MessageIndex()
+
+        assert index.add(ack)
+        assert index.pair(msg.hash) == (None, ack)
+        assert index.add(msg)
+        assert not index.add(msg)
+        assert index.pair(msg.hash) == (msg, ack)
+        assert msg.hash in index
+
+        response = index.missing_message_response(msg.hash, timestamp=bytes(6))
+        assert response == bytes([MissingMessageResponse.TYPE]) + bytes(6) + msg.raw + ack.raw
+
+        index.remove(msg.hash)
+        assert index.pair(msg.hash) == (None, None)
+
+    def test_commit_pairing(self):
+        commit = block_elements.ChainCommit(
+            timestamp=0,
+            chain_id_hash=bytes(32),
+            commit_weld=bytes(32),
+            entry_hash=bytes(32),
+            ec_spent=11,
+            ec_public_key=bytes(32),
+            signature=bytes(64),
+        )
+        msg = unmarshal_message(ChainCommit(commit, primitives.FullSignature(bytes(32), bytes(64))).marshal())
+        assert msg.hash == hashlib.sha256(msg.raw[:-96]).digest()
+        assert msg.hash != msg.full_hash
+
+        # The same commit relayed with a different message signature is acknowledged by the same hash
+        resigned = unmarshal_message(ChainCommit(commit, primitives.FullSignature(bytes(32), b"\x01" * 64)).marshal())
+        assert resigned.hash == msg.hash
+
+        ack = self.make_ack(msg)
+        index = MessageIndex()
+        assert index.add(ack)
+        assert index.add(msg)
+        assert index.pair(msg.hash) == (msg, ack)
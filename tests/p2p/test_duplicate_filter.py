@@ -0,0 +1,57 @@
+import unittest
+
+from p2p import P2PConfiguration
+from p2p.duplicate_filter import DuplicateFilter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDuplicateFilter(unittest.TestCase):
+    def test_duplicates_within_window(self):
+        clock = FakeClock()
+        f = DuplicateFilter(duration=10, cleanup=1, clock=clock)
+        assert not f.is_duplicate(b"ack")
+        assert f.is_duplicate(b"ack")
+        assert not f.is_duplicate(b"reveal")
+
+        clock.now = 9.5
+        assert f.is_duplicate(b"ack")
+        clock.now = 12
+        assert not f.is_duplicate(b"ack")
+        assert f.checked == 5
+        assert f.duplicates == 2
+
+    def test_expired_buckets_are_dropped(self):
+        clock = FakeClock()
+        f = DuplicateFilter(duration=10, cleanup=1, clock=clock)
+        for i in range(100):
+            clock.now = i / 4
+            f.is_duplicate(bytes([i]))
+        clock.now = 100
+        f.is_duplicate(b"new")
+        assert len(f) == 1
+
+    def test_max_entries(self):
+        f = DuplicateFilter(duration=10, cleanup=1, max_entries=50, clock=FakeClock())
+        for i in range(200):
+            f.is_duplicate(i.to_bytes(2, "big"))
+        assert len(f) <= 50
+
+    def test_max_entries_drops_oldest_first(self):
+        f = DuplicateFilter(duration=10, cleanup=1, max_entries=1000, clock=FakeClock())
+        for i in range(1001):
+            assert not f.is_duplicate(i.to_bytes(2, "big"))
+        assert len(f) == 1000
+        assert all(f.is_duplicate(i.to_bytes(2, "big")) for i in range(1, 1001))
+        assert not f.is_duplicate((0).to_bytes(2, "big"))
+
+    def test_disabled(self):
+        f = DuplicateFilter.from_config(P2PConfiguration(duplicate_filter=0))
+        assert not f.is_duplicate(b"ack")
+        assert not f.is_duplicate(b"ack")
@@ -0,0 +1,55 @@
+import unittest
+
+import ed25519
+
+from factom_core.primitives import FullSignature, FullSignatureList, verification
+from factom_core.primitives.verification import SignatureCache, verify, verify_batch
+
+
+class TestVerification(unittest.TestCase):
+    def setUp(self):
+        self.signer, verifier = ed25519.create_keypair()
+        self.public_key = verifier.to_bytes()
+        self.messages = [bytes([i]) * 32 for i in range(8)]
+        self.signatures = [self.signer.sign(message) for message in self.messages]
+
+    def test_verify(self):
+        cache = SignatureCache()
+        assert verify(self.public_key, self.signatures[0], self.messages[0], cache=cache)
+        assert not verify(self.public_key, self.signatures[0], self.messages[1], cache=cache)
+        assert len(cache) == 1
+
+        assert verify(self.public_key, self.signatures[0], self.messages[0], cache=cache)
+        assert cache.hits == 1
+
+    def test_verify_batch(self):
+        items = list(zip([self.public_key] * 8, self.signatures, self.messages))
+        items[3] = (self.public_key, self.signatures[3], b"tampered")
+        expected = [True, True, True, False, True, True, True, True]
+        assert verify_batch(items, cache=None, workers=1) == expected
+        assert verify_batch(items, cache=None, workers=2, parallel_threshold=2) == expected
+        assert verification._executor._mp_context.get_start_method() == "spawn"  # safe once the database is open
+
+        cache = SignatureCache()
+        assert verify_batch(items, cache=cache, workers=1) == expected
+        assert len(cache) == 7
+        assert verify_batch(items, cache=cache, workers=1) == expected
+        assert cache.hits == 7
+
+    def test_cache_eviction(self):
+        cache = SignatureCache(max_size=2)
+        for signature, message in zip(self.signatures[:3], self.messages[:3]):
+            verify(self.public_key, signature, message, cache=cache)
+        assert len(cache) == 2
+        assert SignatureCache.key(self.public_key, self.signatures[0], self.messages[0]) not in cache
+
+    def test_full_signature_list(self):
+        message = b"header"
+        signatures = FullSignatureList(
+            [
+                FullSignature(public_key=self.public_key, signature=self.signer.sign(message)),
+                FullSignature(public_key=self.public_key, signature=self.signatures[0]),
+            ]
+        )
+        assert signatures[0].verify(message)
+        assert signatures.verify(message) == [True, False]
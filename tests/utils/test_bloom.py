@@ -0,0 +1,20 @@
+import os
+import unittest
+
+from factom_core.utils.bloom import BloomFilter
+
+
+class TestBloomFilter(unittest.TestCase):
+    def test_membership(self):
+        items = [os.urandom(32) for _ in range(1000)]
+        bloom = BloomFilter.for_items(items, false_positive_rate=0.01)
+        assert all(item in bloom for item in items)
+
+        bloom = BloomFilter.unmarshal(bloom.marshal())
+        assert all(item in bloom for item in items)
+        false_positives = sum(os.urandom(32) in bloom for _ in range(10000))
+        assert false_positives < 300
+
+    def test_empty(self):
+        bloom = BloomFilter.for_items([])
+        assert bytes(32) not in bloom
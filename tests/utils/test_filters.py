@@ -0,0 +1,18 @@
+import unittest
+
+from factom_core.utils.filters import SyncFilter
+
+
+class TestSyncFilter(unittest.TestCase):
+    def test_default_keeps_identity_and_exchange_rate_chains(self):
+        sync_filter = SyncFilter()
+        assert sync_filter(b"\x88\x88\x88" + bytes(29))
+        assert sync_filter(b"\x11\x11\x11" + bytes(29))
+        assert not sync_filter(bytes(32))
+
+    def test_allow_list_and_predicates(self):
+        allowed = bytes([1]) * 32
+        sync_filter = SyncFilter(allow_list=[allowed], predicates=[lambda chain_id: chain_id[0] == 2])
+        assert sync_filter(allowed)
+        assert sync_filter(bytes([2]) * 32)
+        assert not sync_filter(b"\x88\x88\x88" + bytes(29))
@@ -0,0 +1,22 @@
+import hashlib
+import unittest
+
+from factom_core.utils import merkle
+
+
+class TestMerkleAccumulator(unittest.TestCase):
+    def test_root_matches_full_tree(self):
+        leaves = [hashlib.sha256(i.to_bytes(4, "big")).digest() for i in range(70)]
+        accumulator = merkle.MerkleAccumulator()
+        assert accumulator.root is None
+        for i, leaf in enumerate(leaves):
+            accumulator.append(leaf)
+            assert accumulator.root == merkle.get_merkle_root(leaves[: i + 1])
+
+    def test_copy_is_independent(self):
+        accumulator = merkle.MerkleAccumulator()
+        accumulator.append(bytes(32))
+        other = accumulator.copy()
+        other.append(bytes([1]) * 32)
+        assert len(accumulator) == 1 and accumulator.root == bytes(32)
+        assert len(other) == 2
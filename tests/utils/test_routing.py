@@ -0,0 +1,33 @@
+import hashlib
+import unittest
+from unittest import mock
+
+from factom_core.utils import routing
+
+
+class TestRouting(unittest.TestCase):
+
+    hashes = [hashlib.sha256(i.to_bytes(4, "big")).digest() for i in range(1000)]
+
+    def check_equivalent(self):
+        for vm_count in (0, 1, 2, 3, 5, 7, 32):
+            expected = [routing.vm_for_hash(h, vm_count) for h in self.hashes]
+            assert list(routing.vm_for_hashes(self.hashes, vm_count)) == expected
+
+            buckets = routing.vm_buckets(self.hashes, vm_count)
+            assert len(buckets) == max(vm_count, 1)
+            for index, positions in enumerate(buckets):
+                assert positions == [i for i, vm in enumerate(expected) if vm == index]
+
+    def test_scalar(self):
+        assert routing.vm_for_hash(bytes([255] * 32), 5) == (255 * 32) % 5
+        assert routing.vm_for_hash(bytes(32), 0) == 0
+
+    def test_batch_matches_scalar(self):
+        self.check_equivalent()
+        assert list(routing.vm_for_hashes([], 5)) == []
+        assert list(routing.vm_for_hashes([b"\x01", b"\x02\x03"], 5)) == [1, 0]
+
+    def test_batch_matches_scalar_without_numpy(self):
+        with mock.patch.object(routing, "numpy", None):
+            self.check_equivalent()
@@ -0,0 +1,41 @@
+import pickle
+import unittest
+from dataclasses import dataclass
+
+from factom_core.utils.slots import FieldAccess, slotted
+
+
+@slotted
+@dataclass
+class Example:
+    LENGTH = 4
+
+    a: int
+    b: bytes = None
+
+
+@slotted
+@dataclass
+class Record(FieldAccess):
+    value: int
+    address: bytes
+
+
+class TestSlotted(unittest.TestCase):
+    def test_slotted(self):
+        example = Example(1)
+        assert example.b is None and Example.LENGTH == 4
+        assert not hasattr(example, "__dict__")
+        assert example == Example(1, None)
+        assert pickle.loads(pickle.dumps(example)) == example
+        with self.assertRaises(AttributeError):
+            example.c = 2
+
+    def test_field_access(self):
+        record = Record(1, b"a")
+        assert not hasattr(record, "__dict__")
+        record["value"] += 1
+        assert (record["value"], record.get("address"), record.get("missing")) == (2, b"a", None)
+        assert list(record) == [2, b"a"]
+        with self.assertRaises(KeyError):
+            record["missing"] = 3
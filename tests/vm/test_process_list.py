@@ -0,0 +1,82 @@
+import hashlib
+import unittest
+
+import factom_core.primitives as primitives
+from factom_core.messages import Ack, MissingDataRequest
+from factom_core.vm import ProcessList
+
+
+def make_stream(count: int, vm_index: int = 0, height: int = 5):
+    """Build `count` messages and their acks for one VM, with a valid serial hash chain"""
+    pairs = []
+    serial_hash = None
+    for i in range(count):
+        msg = MissingDataRequest(timestamp=bytes(6), request_hash=hashlib.sha256(bytes([vm_index, i])).digest())
+        serial_hash = msg.hash if serial_hash is None else hashlib.sha256(serial_hash + msg.hash).digest()
+        ack = Ack(
+            vm_index=vm_index,
+            timestamp=bytes(6),
+            salt=bytes(8),
+            salt_number=0,
+            message_hash=msg.hash,
+            full_message_hash=msg.full_hash,
+            leader_chain_id=bytes(32),
+            height=height,
+            process_list_height=i,
+            minute=0,
+            serial_hash=serial_hash,
+            data_area=b"",
+            signature=primitives.FullSignature(bytes(32), bytes(64)),
+        )
+        pairs.append((ack, msg))
+    return pairs
+
+
+class TestProcessList(unittest.TestCase):
+    def test_in_order(self):
+        process_list = ProcessList(height=5, vm_count=1)
+        for ack, msg in make_stream(10):
+            assert process_list.add_message(msg) == []
+            assert process_list.add_ack(ack) == [(ack, msg)]
+        assert process_list.vms[0].height == 10
+        assert process_list.missing_message_requests(bytes(6), bytes(32)) == []
+
+    def test_out_of_order_and_gaps(self):
+        process_list = ProcessList(height=5, vm_count=2)
+        pairs = make_stream(6, vm_index=1)
+
+        # Acks ahead of their messages, and later heights ahead of earlier ones
+        for ack, msg in reversed(pairs[2:]):
+            process_list.add_ack(ack)
+        for ack, msg in pairs[3:]:
+            assert process_list.add_message(msg) == []
+        requests = process_list.missing_message_requests(bytes(6), bytes(32))
+        assert len(requests) == 1
+        assert requests[0].vm_index == 1
+        assert requests[0].process_list_heights == [0, 1, 2]
+
+        process_list.add_message(pairs[2][1])
+        process_list.add_ack(pairs[0][0])
+        process_list.add_message(pairs[0][1])
+        appended = process_list.add_message(pairs[1][1]) + process_list.add_ack(pairs[1][0])
+        assert appended == pairs[1:]
+        assert process_list.vms[1].height == 6
+
+    def test_bad_serial_hash(self):
+        process_list = ProcessList(height=5, vm_count=1)
+        pairs = make_stream(3)
+        pairs[1][0].serial_hash = bytes(32)
+        for ack, msg in pairs:
+            process_list.add_message(msg)
+            process_list.add_ack(ack)
+        vm = process_list.vms[0]
+        assert vm.height == 1
+        assert vm.rejected == 1
+        assert vm.missing_heights() == [1]
+
+    def test_wrong_height_ignored(self):
+        process_list = ProcessList(height=6, vm_count=1)
+        ack, msg = make_stream(1, height=5)[0]
+        process_list.add_message(msg)
+        assert process_list.add_ack(ack) == []
+        assert process_list.vms[0].height == 0
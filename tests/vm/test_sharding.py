@@ -0,0 +1,67 @@
+import unittest
+
+import factom_core.block_elements as block_elements
+from factom_core.blockchains import PendingBlock
+import factom_core.primitives as primitives
+from factom_core.messages import EntryCommit, EntryReveal, MissingDataRequest
+from factom_core.vm import ShardedExecutor
+
+
+def vm_for_hash(h: bytes) -> int:
+    return sum(h) % 3
+
+
+def make_reveal(chain_id: bytes, content: bytes) -> EntryReveal:
+    entry = block_elements.Entry(chain_id=chain_id, external_ids=[], content=content)
+    return EntryReveal(timestamp=bytes(6), entry=entry)
+
+
+def make_commit(entry_hash: bytes) -> EntryCommit:
+    commit = block_elements.EntryCommit(
+        timestamp=0, entry_hash=entry_hash, ec_spent=1, ec_public_key=bytes(32), signature=bytes(64)
+    )
+    return EntryCommit(commit=commit, signature=primitives.FullSignature(bytes(32), bytes(64)))
+
+
+class TestShardedExecutor(unittest.TestCase):
+    def test_end_of_minute_merges_all_vms(self):
+        chain_ids = [bytes([i]) * 32 for i in range(6)]
+        reveals = [make_reveal(chain_ids[i % 6], bytes([i])) for i in range(30)]
+        assert len({vm_for_hash(chain_id) for chain_id in chain_ids}) == 3
+
+        executor = ShardedExecutor(workers=3, batch_size=4)  # one VM each, routed as by vm_for_hash
+        executor.start()
+        try:
+            for reveal in reveals:
+                assert executor.submit(reveal.marshal())
+                assert executor.submit(make_commit(reveal.entry.entry_hash).marshal())
+            assert executor.submit(reveals[0].marshal())  # replayed
+            assert not executor.submit(MissingDataRequest(timestamp=bytes(6), request_hash=bytes(32)).marshal())
+
+            block = PendingBlock(previous=object())
+            block.current_minute = 3
+            results = executor.end_of_minute(block)
+
+            assert sum(executor.routed) == 61
+            assert executor.rejected == 1
+            assert all(len(r.failed) == 0 for r in results)
+            assert executor.processed == {EntryReveal.TYPE: 31, EntryCommit.TYPE: 30}
+            for chain_id in chain_ids:
+                expected = [r.entry.entry_hash for r in reveals if r.entry.chain_id == chain_id]
+                assert block.entry_blocks[chain_id].entry_hashes == {3: expected}
+
+            # Nothing carries over into the next minute
+            block.current_minute = 4
+            results = executor.end_of_minute(block)
+            assert all(len(r.entries) == 0 for r in results)
+        finally:
+            executor.stop()
+
+    def test_more_vms_than_workers(self):
+        chain_ids = [bytes([i]) + bytes(31) for i in range(6)]  # a chain for each of 6 VMs
+        executor = ShardedExecutor(workers=2, vm_count=lambda: 6)
+        for chain_id in chain_ids:
+            assert executor.submit(make_reveal(chain_id, b"").marshal())
+        assert executor.submit_batch([make_reveal(chain_id, b"").marshal() for chain_id in chain_ids]) == 6
+        assert executor.routed == [6, 6]  # VM i is executed by worker i % 2
+        assert [len(buffer) for buffer in executor._buffers] == [6, 6]